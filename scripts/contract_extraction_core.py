@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+统一提取核心：一次遍历、一次读取，同时产出API契约与代码定义两种结果
+
+extract-api-contracts.py（APIContractExtractor）和 extract-code-definitions.py（CodeExtractor）
+在Phase 0中通常先后运行，二者遍历同一目录、读取同一批文件。本模块负责共享的文件遍历，
+每个文件只读取和词法解析一次，解析结果同时供两个提取器使用；提取结果可写入缓存文件，供另一个脚本直接复用。
+
+发布包会把 scripts/ 下的文件平铺复制到 .specify/scripts，因此本模块保持为单个可直接
+导入的文件，两个提取脚本通过 `from contract_extraction_core import ...` 使用。
+
+Usage:
+    python3 scripts/contract_extraction_core.py --source <source_path> \\
+        --api-output api-contracts.md --code-output code-definitions.md
+    python3 scripts/contract_extraction_core.py --source <source_path> --cache .specify/cache/extraction.json
+    python3 scripts/extract-api-contracts.py --source <source_path> --cache .specify/cache/extraction.json
+    python3 scripts/extract-code-definitions.py --source <source_path> --output defs.md --cache .specify/cache/extraction.json
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import sys
+from fnmatch import translate
+from pathlib import Path
+from typing import Dict, Any, Optional, Iterator, Sequence
+
+
+class SourceWalker:
+    """惰性源文件遍历器（目录和文件名按字典序）
+    
+    匹配exclude的目录整体剪枝不再进入；exclude既可匹配名称，也可匹配相对于
+    source_path的路径（如 src/generated/*）。max_depth限制进入的子目录层数，
+    0表示只处理source_path下的文件。
+    """
+    
+    # 遍历时整体跳过的依赖/构建产物目录
+    DEFAULT_EXCLUDE = ('node_modules', 'bower_components', 'dist', 'build', 'out', 'coverage',
+                       '.git', '.angular', '.next', '.nuxt', '.cache')
+    
+    def __init__(self, source_path: Path, include: Sequence[str],
+                 exclude: Optional[Sequence[str]] = None, max_depth: Optional[int] = None):
+        self.source_path = Path(source_path)
+        self.include = tuple(include)
+        self.exclude = tuple(exclude) if exclude is not None else self.DEFAULT_EXCLUDE
+        self.max_depth = max_depth
+        
+        # glob模式合并为单个正则，每个路径只匹配一次
+        self._include_pattern = self._compile_globs(self.include)
+        self._exclude_pattern = self._compile_globs(self.exclude)
+    
+    def __iter__(self) -> Iterator[Path]:
+        for root, dirnames, filenames in os.walk(self.source_path):
+            relative_root = os.path.relpath(root, self.source_path)
+            if relative_root == '.':
+                relative_root, depth = '', 0
+            else:
+                relative_root = relative_root.replace(os.sep, '/')
+                depth = relative_root.count('/') + 1
+            
+            if self.max_depth is not None and depth >= self.max_depth:
+                dirnames[:] = []
+            else:
+                dirnames[:] = sorted(d for d in dirnames
+                                     if not self._is_excluded(d, relative_root))
+            
+            for filename in sorted(filenames):
+                if not self.accepts(filename):
+                    continue
+                if self._is_excluded(filename, relative_root):
+                    continue
+                yield Path(root) / filename
+    
+    def accepts(self, filename: str) -> bool:
+        """文件名是否匹配include模式"""
+        return self._include_pattern is not None and self._include_pattern.match(filename) is not None
+    
+    def fingerprint(self) -> str:
+        """遍历选项及所有匹配文件的相对路径、大小和修改时间的摘要，用于判断缓存是否失效"""
+        digest = hashlib.sha1()
+        digest.update(json.dumps([self.include, self.exclude, self.max_depth]).encode('utf-8'))
+        
+        prefix_length = len(str(self.source_path)) + 1
+        for file_path in self:
+            path = str(file_path)
+            stat = os.stat(path)
+            digest.update(f"{path[prefix_length:]}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode('utf-8'))
+        
+        return digest.hexdigest()
+    
+    def _is_excluded(self, name: str, relative_root: str) -> bool:
+        """名称或相对路径（relative_root为所在目录，'/'分隔）匹配任一exclude模式"""
+        if self._exclude_pattern is None:
+            return False
+        if self._exclude_pattern.match(name):
+            return True
+        return relative_root != '' and self._exclude_pattern.match(f"{relative_root}/{name}") is not None
+    
+    @staticmethod
+    def _compile_globs(patterns: Sequence[str]) -> Optional['re.Pattern']:
+        """将glob模式列表编译为一个正则，空列表返回None"""
+        if not patterns:
+            return None
+        return re.compile('|'.join(translate(pattern) for pattern in patterns))
+
+
+_SCRIPTS_DIR = Path(__file__).resolve().parent
+_loaded_scripts: Dict[str, Any] = {}
+
+
+def load_sibling_script(filename: str):
+    """按文件名加载同目录下的提取脚本（脚本名含连字符，无法直接import）
+    
+    若该脚本正作为 __main__ 运行，直接复用，不重复加载。
+    """
+    if filename in _loaded_scripts:
+        return _loaded_scripts[filename]
+    
+    script_path = _SCRIPTS_DIR / filename
+    main_module = sys.modules.get('__main__')
+    main_file = getattr(main_module, '__file__', None)
+    
+    if main_file and Path(main_file).resolve() == script_path:
+        module = main_module
+    else:
+        module_name = '_' + script_path.stem.replace('-', '_')
+        spec = importlib.util.spec_from_file_location(module_name, script_path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    
+    _loaded_scripts[filename] = module
+    return module
+
+
+class ExtractionCore:
+    """统一提取核心：一次遍历源码树，同时运行API契约提取和代码定义提取
+    
+    run() 返回 {'api_contracts': ..., 'code_definitions': ...}，两部分分别与
+    extract-api-contracts.py --json 和 extract-code-definitions.py --format json 的输出结构一致。
+    """
+    
+    CACHE_VERSION = 3
+    
+    def __init__(self, source_path: Path, exclude: Optional[Sequence[str]] = None,
+                 max_depth: Optional[int] = None, file_time_budget: Optional[float] = None):
+        self.source_path = Path(source_path)
+        self.exclude = exclude
+        self.max_depth = max_depth
+        self.file_time_budget = file_time_budget
+    
+    def run(self) -> Dict[str, Any]:
+        """遍历一次源码树，每个文件只读取和解析一次
+        
+        API契约提取的词法分析结果（FileContext）直接交给代码定义提取，
+        后者的接口和端点记录取自其中，只额外匹配React组件。
+        """
+        api_module = load_sibling_script('extract-api-contracts.py')
+        code_module = load_sibling_script('extract-code-definitions.py')
+        
+        api_extractor = api_module.APIContractExtractor(self.source_path, exclude=self.exclude,
+                                                        max_depth=self.max_depth)
+        code_options = {}
+        if self.file_time_budget is not None:
+            code_options['file_time_budget'] = self.file_time_budget
+        code_extractor = code_module.CodeExtractor(self.source_path, exclude=self.exclude,
+                                                   max_depth=self.max_depth, **code_options)
+        
+        walker = self.walker(api_extractor.walker.include + code_extractor.walker.include)
+        
+        print(f"🔍 统一提取: {self.source_path}")
+        
+        total_files = api_files = 0
+        for file_path in walker:
+            try:
+                content = file_path.read_text(encoding='utf-8')
+            except Exception as e:
+                print(f"⚠️ 读取文件 {file_path} 时出错: {e}")
+                continue
+            
+            total_files += 1
+            parsed = None
+            if api_extractor.walker.accepts(file_path.name):
+                api_files += 1
+                parsed = api_extractor.process_file(file_path, content)
+                if parsed is None:
+                    # 解析出错（已报告），代码定义提取同样跳过该文件
+                    continue
+            if code_extractor.walker.accepts(file_path.name):
+                code_extractor.process_file(file_path, content, parsed)
+        
+        print(f"📄 处理了 {total_files} 个源文件")
+        
+        return {
+            'api_contracts': api_extractor.build_result(api_files),
+            'code_definitions': code_extractor.to_dict()
+        }
+    
+    def walker(self, include: Sequence[str]) -> SourceWalker:
+        """按本核心的exclude/max_depth选项创建遍历器（include去重保序）"""
+        return SourceWalker(self.source_path, tuple(dict.fromkeys(include)), self.exclude, self.max_depth)
+    
+    def load_or_run(self, cache_path: Optional[Path]) -> Dict[str, Any]:
+        """缓存有效时直接返回缓存结果，否则提取并写入缓存
+        
+        缓存以源码树指纹（文件路径、大小、修改时间及遍历选项）校验，
+        指纹只需stat文件，不读取文件内容。
+        """
+        if cache_path is None:
+            return self.run()
+        
+        api_module = load_sibling_script('extract-api-contracts.py')
+        code_module = load_sibling_script('extract-code-definitions.py')
+        fingerprint = self.walker(api_module.APIContractExtractor.DEFAULT_INCLUDE +
+                                  code_module.CodeExtractor.DEFAULT_INCLUDE).fingerprint()
+        
+        # 未指定时按代码定义提取的默认预算计入缓存键，两个脚本写入的缓存可互相复用
+        if self.file_time_budget is None:
+            self.file_time_budget = code_module.CodeExtractor.DEFAULT_FILE_TIME_BUDGET
+        
+        cached = self._read_cache(cache_path)
+        if (cached is not None and cached.get('version') == self.CACHE_VERSION
+                and cached.get('source_path') == str(self.source_path)
+                and cached.get('fingerprint') == fingerprint
+                and cached.get('file_time_budget') == self.file_time_budget):
+            print(f"✅ 使用提取缓存: {cache_path}")
+            return cached['results']
+        
+        results = self.run()
+        self._write_cache(cache_path, {
+            'version': self.CACHE_VERSION,
+            'source_path': str(self.source_path),
+            'fingerprint': fingerprint,
+            'file_time_budget': self.file_time_budget,
+            'results': results
+        })
+        print(f"✅ 提取缓存已保存: {cache_path}")
+        return results
+    
+    @staticmethod
+    def _read_cache(cache_path: Path) -> Optional[Dict[str, Any]]:
+        """读取缓存文件，不存在或损坏时返回None"""
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def _write_cache(cache_path: Path, payload: Dict[str, Any]):
+        """先写临时文件再原子替换，避免并发读取到半写入的缓存"""
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            # json.dumps无缩进时走C编码器，比逐块写出的json.dump快数倍
+            f.write(json.dumps(payload, ensure_ascii=False))
+        os.replace(temp_path, cache_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract API contracts and code definitions in a single pass')
+    parser.add_argument('--source', required=True, help='Source code path')
+    parser.add_argument('--cache', help='Reuse/save the combined extraction result in this JSON file')
+    parser.add_argument('--api-output', help='Write the API contract markdown report to this file')
+    parser.add_argument('--api-mode', choices=['combined', 'data-models', 'apis', 'backend-apis', 'frontend-apis'],
+                        default='combined', help='API contract report mode')
+    parser.add_argument('--api-json', help='Save API contract JSON data to this file')
+    parser.add_argument('--code-output', help='Write the code definitions to this file')
+    parser.add_argument('--code-format', choices=['json', 'markdown'], default='markdown',
+                        help='Code definitions output format')
+    parser.add_argument('--exclude', action='append', metavar='GLOB',
+                        help='Directory or file name/relative path to skip (repeatable, added to the default '
+                             'node_modules/build output exclusions)')
+    parser.add_argument('--max-depth', type=int, help='Maximum directory depth to descend below --source')
+    
+    args = parser.parse_args()
+    
+    source_path = Path(args.source)
+    if not source_path.exists():
+        print(f"❌ 源路径不存在: {source_path}")
+        return 1
+    
+    if not (args.cache or args.api_output or args.api_json or args.code_output):
+        parser.error('nothing to do: give --api-output, --api-json, --code-output and/or --cache')
+    
+    exclude = list(SourceWalker.DEFAULT_EXCLUDE) + (args.exclude or [])
+    core = ExtractionCore(source_path, exclude=exclude, max_depth=args.max_depth)
+    results = core.load_or_run(Path(args.cache) if args.cache else None)
+    
+    if args.api_output:
+        api_module = load_sibling_script('extract-api-contracts.py')
+        Path(args.api_output).write_text(api_module.render_report(results['api_contracts'], args.api_mode),
+                                         encoding='utf-8')
+        print(f"✅ API契约报告已保存: {args.api_output}")
+    
+    if args.api_json:
+        with open(args.api_json, 'w', encoding='utf-8') as f:
+            json.dump(results['api_contracts'], f, ensure_ascii=False, indent=2)
+        print(f"✅ API契约JSON已保存: {args.api_json}")
+    
+    if args.code_output:
+        code_module = load_sibling_script('extract-code-definitions.py')
+        code_module.write_output(results['code_definitions'], Path(args.code_output), args.code_format)
+        print(f"✅ 代码定义已保存: {args.code_output}")
+    
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
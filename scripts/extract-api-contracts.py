@@ -9,6 +9,11 @@ Usage:
     python3 scripts/extract-api-contracts.py --source <source_path> [--output <output_file>]
     python3 scripts/extract-api-contracts.py --source /path/to/angular/project --output api-contracts.md
     python3 scripts/extract-api-contracts.py --source /path/to/angular/project  # defaults to api-contracts.md
+    python3 scripts/extract-api-contracts.py --source /path/to/angular/project --ndjson contracts.ndjson
+    python3 scripts/extract-api-contracts.py --from-ndjson contracts.ndjson --mode data-models --output data-models.md
+    python3 scripts/extract-api-contracts.py --source /path/to/react/project --diff angular-contracts.json
+    python3 scripts/extract-api-contracts.py --source react-contracts.json --diff angular-contracts.json
+    python3 scripts/extract-api-contracts.py --source /path/to/angular/project --cache .specify/cache/extraction.json
 
 Requirements:
     - Python 3.8+
@@ -17,13 +22,17 @@ Requirements:
 
 import argparse
 import json
+import os
 import re
+import string
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Set, FrozenSet, Tuple, Iterator
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from collections import defaultdict, Counter
 
+from contract_extraction_core import ExtractionCore, SourceWalker
+
 
 @dataclass
 class APIEndpoint:
@@ -72,225 +81,1372 @@ class ComponentProps:
     line_number: int = 0
 
 
+@dataclass
+class ContractChange:
+    """两个契约快照之间的差异条目"""
+    category: str  # "endpoint", "interface", "property", "input", "output"
+    change: str    # "added", "removed", "changed"
+    key: str
+    detail: str = ""
+    breaking: bool = False
+
+
+# 类型成员修饰符（接口/类型字面量）
+_MEMBER_MODIFIERS = frozenset({'readonly'})
+
+# 装饰器修饰的类成员前可能出现的修饰符
+_CLASS_MEMBER_MODIFIERS = frozenset({
+    'public', 'private', 'protected', 'readonly', 'static', 'override', 'declare', 'set', 'get'
+})
+
+# 类型表达式跨行时的续行运算符
+_TYPE_CONTINUATION_TOKENS = frozenset({'|', '&', ':', '=>', '?', '.', '?.', 'extends', 'keyof', 'typeof'})
+
+_CLOSING_BRACKETS = {'{': '}', '(': ')', '[': ']', '<': '>'}
+
+# 服务/仓库对象名后缀
+_SERVICE_NAME_SUFFIXES = ('Service', 'Repository', 'Api')
+
+
+class TypeScriptLexer:
+    """线性时间的TypeScript/JavaScript词法分析器
+    
+    整个文件只向前扫描一次：主扫描正则同时匹配大括号、字符串、模板字符串（含嵌套的
+    ${...}表达式）、注释、正则字面量和触发词（interface/type/class、import/export from、
+    fetch/request、服务对象名、.get等HTTP调用、@Component/@Input/@Output），
+    字符串和注释中的触发词随字符串/注释一起被跳过，保证嵌套深度准确。
+    遇到触发词时切换为窗口扫描，直到该声明或调用结束：常见形态的窗口由各类型的
+    范围正则一次匹配出结束位置，再整体切分为token；含模板字符串、正则字面量、
+    未配对括号等的窗口退回逐token扫描。与提取无关的代码不会逐token进入Python。
+    
+    输出的token为 (kind, value, start, end) 元组，kind取值为
+    ident/string/template/regex/number/punct；字符串和模板字符串的value不含引号。
+    窗口之外不含触发词的最内层 {...} 整体跳过，不输出其大括号。
+    """
+    
+    # 分组序号与 _token_kinds 对应：注释和其他字符不输出
+    _token_pattern = re.compile(r'''
+        \s*
+        (?:
+            (?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))
+          | (?P<ident>[A-Za-z_$][\w$]*)
+          | (?P<punct>=>|\?\.|[{}()\[\];,:?.=<>@|&!/*])
+          | (?P<string>'(?:\\.|[^'\\\n])*'?|"(?:\\.|[^"\\\n])*"?)
+          | (?P<number>\d[\w.]*)
+          | (?P<template>`)
+          | (?P<other>[\s\S])
+        )
+    ''', re.VERBOSE)
+    _token_kinds = (None, 'comment', 'ident', 'punct', 'string', 'number', 'template', 'other')
+    
+    # 窗口范围内按 (前导空白, token) 整体切分，位置由长度累加得到，类型由首字符决定：
+    # 范围内的'/'只出现在注释中，注释和其他字符不输出
+    _window_token_pattern = re.compile(r'''(\s*+)(//[^\n]*|/\*[\s\S]*?(?:\*/|\Z)|[A-Za-z_$][\w$]*|=>|\?\.'''
+                                       r'''|[{}()\[\];,:?.=<>@|&!/*]|'(?:\\.|[^'\\\n])*'?|"(?:\\.|[^"\\\n])*"?|\d[\w.]*|[\s\S])''')
+    _window_token_kinds = {
+        **dict.fromkeys(string.ascii_letters + '_$', 'ident'),
+        **dict.fromkeys(string.digits, 'number'),
+        **dict.fromkeys('\'"', 'string'),
+        **dict.fromkeys('{}()[];,:?.=<>@|&!*', 'punct'),
+    }
+    
+    # 以服务名后缀结尾的标识符不在主扫描中跳过（其后紧跟非ASCII标识符字符时不是结尾）
+    _not_service = r"(?: (?<![eyi]) | (?<!Service)(?<!Repository)(?<!Api) | (?=[\w$]) )"
+    
+    # 调用的第一个参数token
+    _call_argument = r"""[A-Za-z_$][\w$]*|\d[\w.]*|'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*"|=>|\?\.|[{}()\[\];,:?.=<>@|&!*]"""
+    
+    # 触发调用的HTTP方法名和装饰器名（\s*之后）
+    _http_method = r"\s*(?:get|post|put|delete|patch|head|options)\b"
+    _decorator_name = r"\s*(?:Component|Input|Output)\b"
+    
+    # 主扫描在正则内部跳过的单元：空白/标点、普通标识符、字符串、注释和不含嵌套的模板字符串。
+    # 字符类只用ASCII范围（可编译为位图），标识符按首字母分支（只有触发关键字的首字母需要向后检查）；
+    # 以 Service/Repository/Api 结尾的标识符不跳过，留给分组1的服务名分支
+    _skipped = r"""(?:
+            [^a-zA-Z0-9_$@.{}`'"/\x80-\U0010ffff]++ (?:%(identifier)s)?
+          | %(identifier)s
+          | \.(?!%(http)s)
+          | '(?:[^'\\\n]++|\\.)*+'? | "(?:[^"\\\n]++|\\.)*+"?
+          | //[^\n]*+ | /\*[\s\S]*?(?:\*/|\Z)
+          | `(?:[^\\`$]++|\\[\s\S]|\$(?!\{)|\$\{[^{}`'"/\\]*+\})*+`
+          | [$\x80-\U0010ffff]++
+          | (?<=[\w$]) [a-zA-Z0-9_]++ %(not_service)s
+          | @(?!%(decorator)s)
+        )""" % {
+        'identifier': r"""(?: i(?!(?:nterface|mport)(?![\w$])) | t(?!ype(?![\w$])) | c(?!lass(?![\w$]))
+                            | f(?!etch(?![\w$])) | r(?!equest(?![\w$])) | e(?!xport\s*[*{])
+                            | [abdghj-qsu-zA-Z0-9_] ) [a-zA-Z0-9_]*+""" + _not_service,
+        'not_service': _not_service,
+        'http': _http_method,
+        'decorator': _decorator_name,
+    }
+    
+    # 主扫描：跳过上述单元以及其中不含触发词的最内层 {...}（配对的大括号不影响嵌套深度），
+    # 分组1只输出其余大括号、模板字符串、'/'和触发词。服务名（其前有 $ 或非ASCII字符时由
+    # _identifier_start 向前补全）之后的 .method( 参数 一并匹配，无需另开窗口；
+    # 末尾的 \Z 避免文件尾部被反复重扫
+    _structure_pattern = re.compile(r"""
+        (?: %(skipped)s | \{ %(skipped)s*+ \} )*+
+        (
+            [{}`/]
+          | (?<![\w$]) (?: (?:interface|type|class|import|fetch|request) (?![\w$]) | export (?=\s*[*{]) )
+          | (?P<service>[a-zA-Z0-9_]++) (?:(?<=Service)|(?<=Repository)|(?<=Api)) (?![\w$])
+            (?: \s*(?:(?P<dot>\??\.)\s*(?P<method>[A-Za-z_$][\w$]*+)\s*)? (?P<paren>\()\s*(?P<argument>%(argument)s) )?
+          | \.(?=%(http)s)
+          | @%(decorator)s
+          | \Z
+        )
+    """ % {
+        'skipped': _skipped,
+        'argument': _call_argument,
+        'http': _http_method,
+        'decorator': _decorator_name,
+    }, re.VERBOSE)
+    
+    # 窗口范围正则：不含模板字符串、正则字面量和除号（'/'只允许出现在注释中），
+    # 字符串均已闭合；匹配不到时窗口退回逐token扫描
+    _literal = r"""(?:'(?:[^'\\\n]++|\\.)*+'|"(?:[^"\\\n]++|\\.)*+"|//[^\n]*+|(?>/\*[\s\S]*?\*/))"""
+    _body = r"""(?:[^{}'"`/]++|%s|\{(?:[^{}'"`/]++|%s|\{(?:[^{}'"`/]++|%s)*+\})*+\})*+""" % (_literal, _literal, _literal)
+    _window_patterns = {
+        # interface X<T> extends Y {...} / type X = ...; / 属性名type之后的 } 或 ;
+        'decl': re.compile(r"""(?:[^{};'"`/]++|%s)*+(?:;|(?P<close>\})|\{%s\})""" % (_literal, _body)),
+        'class': re.compile(r"""class(?:[^{};'"`/]++|//[^\n]*+|(?>/\*[\s\S]*?\*/))*+[{;]"""),
+        'module': re.compile(r"""(?:import|export)(?:[^{}'";`/]++|//[^\n]*+|(?>/\*[\s\S]*?\*/)"""
+                             r"""|\{(?:[^{}'";`/]++|//[^\n]*+|(?>/\*[\s\S]*?\*/))*+\})*+"""
+                             r"""(?:'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*"|;)"""),
+        'decorator': re.compile(r'@\s*Component[\w$]*'),
+        'member': re.compile(r"""@\s*(?:Input|Output)(?:[^{};'"`/]++|%s)*+;""" % _literal),
+        # name(、name.method(、.method<T>( 之后再取一个token
+        'call': re.compile(r"""(?P<name>[\w$]+)?\s*(?:(?P<dot>\??\.)\s*(?P<method>[\w$]+)\s*)?"""
+                           r"""(?P<generic><(?:[^<>;{}()'"`/=]|<[^<>;{}()'"`/=]*>)*>\s*)?(?P<paren>\()\s*"""
+                           r"""(?P<argument>%s)""" % _call_argument),
+    }
+    # 去掉字符串和注释，用于统计窗口内的括号嵌套
+    _literal_pattern = re.compile(_literal)
+    
+    # 调用形态 name(、name<、name.method(、.method( ，不符合的调用类触发词无需逐token扫描
+    _call_shape_pattern = re.compile(r'(?:[\w$]+\s*)?(?:\??\.\s*[\w$]+\s*)?[(<]')
+    
+    _identifier_starts = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_$')
+    
+    _template_chunk_pattern = re.compile(r'(?:[^\\`$]++|\\[\s\S]|\$(?!\{))*+')
+    _regex_literal_pattern = re.compile(r'/(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\n\[])+/[A-Za-z]*')
+    
+    # 出现在这些关键字之后的 '/' 是正则字面量而不是除号
+    _regex_keywords = frozenset({
+        'return', 'typeof', 'case', 'in', 'of', 'new', 'delete', 'void',
+        'throw', 'yield', 'await', 'instanceof', 'else', 'do'
+    })
+    
+    def tokenize(self, content: str, windows: Optional[FrozenSet[str]] = None) -> List[Tuple[str, str, int, int]]:
+        """将源代码切分为token列表
+        
+        windows限定打开的窗口类型（decl/class/module/decorator/member/call，默认全部），
+        其余触发词与普通代码一样跳过，不输出token。
+        """
+        tokens: List[Tuple[str, str, int, int]] = []
+        self._scan(content, 0, tokens, False, windows)
+        return tokens
+    
+    def _scan(self, content: str, pos: int, tokens: list, expression: bool,
+              windows: Optional[FrozenSet[str]] = None) -> int:
+        """扫描代码并把token追加到tokens
+        
+        expression为True时处于模板字符串的${...}表达式中（只跟踪大括号，不打开窗口），
+        遇到与之匹配的 '}' 时返回其后的位置；否则扫描到文件结束。
+        """
+        depth = 0
+        length = len(content)
+        append = tokens.append
+        
+        while pos < length:
+            for match in self._structure_pattern.finditer(content, pos):
+                # 分组1位于匹配末尾
+                item = match[1]
+                end = match.end()
+                if item == '{':
+                    depth += 1
+                    append(('punct', item, end - 1, end))
+                    continue
+                if item == '}':
+                    if depth == 0 and expression:
+                        return end
+                    depth -= 1
+                    append(('punct', item, end - 1, end))
+                    continue
+                if not item:
+                    return length
+                
+                start = end - len(item)
+                if item == '`':
+                    end = self._scan_template(content, end)
+                elif item == '/':
+                    if not self._regex_allowed(content, start):
+                        continue
+                    regex_match = self._regex_literal_pattern.match(content, start)
+                    if not regex_match:
+                        continue
+                    end = regex_match.end()
+                else:
+                    service_start, service_end = match.span('service')
+                    if service_start >= 0:
+                        # 服务名：不打开调用窗口时只跳过；前面还有 $ 或非ASCII字符时补全为整个标识符
+                        start = service_start
+                        if expression or (windows is not None and 'call' not in windows):
+                            start = -1
+                        elif start == pos or content[start - 1] == '$' or content[start - 1] >= '\x80':
+                            start = self._identifier_start(content, pos, start)
+                        if start < 0:
+                            if service_end == end:
+                                continue
+                            # 一并匹配的调用尾部可能含大括号：从服务名之后重新扫描
+                            end = service_end
+                        elif end > service_end and self._append_call_tokens(match, start, service_end, tokens):
+                            closing = content[end - 1]
+                            depth += (closing == '{') - (closing == '}')
+                            continue
+                        elif end == service_end and not self._call_shape_pattern.match(content, start):
+                            # 不是调用（如构造函数参数 dataService: DataService），不输出token
+                            continue
+                        else:
+                            end, depth = self._scan_window(content, start, content[start:service_end], depth, tokens)
+                    elif expression or (windows is not None and self._open_window(item, depth)[0] not in windows):
+                        continue
+                    else:
+                        # 触发词位于代码中：扫描到声明/调用结束
+                        end, depth = self._scan_window(content, start, item, depth, tokens)
+                
+                pos = end
+                break
+            else:
+                return length
+        
+        return length
+    
+    def _identifier_start(self, content: str, floor: int, pos: int) -> int:
+        """返回pos所在标识符的起点；本轮扫描从该标识符中间（floor之后）开始时返回-1"""
+        while pos > floor and (content[pos - 1].isalnum() or content[pos - 1] in '_$'):
+            pos -= 1
+        if pos > 0 and (content[pos - 1].isalnum() or content[pos - 1] in '_$'):
+            return -1
+        return pos
+    
+    def _scan_window(self, content: str, pos: int, trigger: str, depth: int,
+                     tokens: list) -> Tuple[int, int]:
+        """从触发词处扫描一个窗口，返回 (窗口结束位置, 大括号深度)"""
+        window = self._open_window(trigger, depth)
+        window_kind = window[0]
+        
+        extent = self._window_patterns[window_kind].match(content, pos)
+        if extent is None:
+            if window_kind == 'call' and not self._call_shape_pattern.match(content, pos):
+                return pos + len(trigger), depth
+        elif (window_kind == 'call' and extent.start('generic') < 0
+              and self._append_call_tokens(extent, *extent.span('name'), tokens)):
+            closing = content[extent.end() - 1]
+            return extent.end(), depth + (closing == '{') - (closing == '}')
+        else:
+            end = extent.end()
+            kinds = self._window_token_kinds
+            window_tokens = []
+            append = window_tokens.append
+            token_end = pos
+            for space, value in self._window_token_pattern.findall(content, pos, end):
+                start = token_end + len(space)
+                token_end = start + len(value)
+                kind = kinds.get(value[0])
+                if kind == 'string':
+                    # 范围内的字符串均已闭合，直接去掉引号
+                    append((kind, value[1:-1], start, token_end))
+                elif kind is not None:
+                    append((kind, value, start, token_end))
+            
+            if window[4] < 0 or len(window_tokens) <= window[4]:
+                closing = content[end - 1]
+                if window_kind == 'decl':
+                    if extent.start('close') >= 0:
+                        depth -= 1
+                    elif self._bracket_balance(content, pos, end) > 0:
+                        # 未配对的 ( [ < 之后的 } 或 ; 不结束声明
+                        return self._scan_window_tokens(content, pos, window, depth, tokens)
+                elif closing == '{':
+                    depth += 1
+                elif closing == '}':
+                    depth -= 1
+                
+                tokens.extend(window_tokens)
+                return end, depth
+        
+        return self._scan_window_tokens(content, pos, window, depth, tokens)
+    
+    def _append_call_tokens(self, match: re.Match, name_start: int, name_end: int, tokens: list) -> bool:
+        """按调用正则的分组直接追加 name . method ( 参数 的token
+        
+        name_start为-1表示没有调用对象名；名称不以ASCII标识符字符开头（需按token正则切分）时不追加，返回False。
+        """
+        content = match.string
+        starts = self._identifier_starts
+        if name_start >= 0 and content[name_start] not in starts:
+            return False
+        dot, method, argument = match.group('dot', 'method', 'argument')
+        if method is not None and method[0] not in starts:
+            return False
+        
+        append = tokens.append
+        if name_start >= 0:
+            append(('ident', content[name_start:name_end], name_start, name_end))
+        if dot is not None:
+            start = match.start('dot')
+            append(('punct', dot, start, start + len(dot)))
+            start = match.start('method')
+            append(('ident', method, start, start + len(method)))
+        start = match.start('paren')
+        append(('punct', '(', start, start + 1))
+        
+        # 参数是两个正则的最后一个分组，类型由首字符决定（非ASCII数字也是数字）
+        end = match.end()
+        kind = self._window_token_kinds.get(argument[0], 'number')
+        append((kind, argument[1:-1] if kind == 'string' else argument, end - len(argument), end))
+        return True
+    
+    def _scan_window_tokens(self, content: str, pos: int, window: list, depth: int,
+                            tokens: list) -> Tuple[int, int]:
+        """逐token扫描窗口（含模板字符串、正则字面量等范围正则不处理的情形）"""
+        append = tokens.append
+        
+        while True:
+            for match in self._token_pattern.finditer(content, pos):
+                kind = match.lastgroup
+                start, end = match.span(kind)
+                
+                if kind == 'ident' or kind == 'number':
+                    value = content[start:end]
+                elif kind == 'punct':
+                    value = content[start:end]
+                    if value == '{':
+                        depth += 1
+                    elif value == '}':
+                        depth -= 1
+                    elif value == '/' and self._regex_allowed(content, start):
+                        regex_match = self._regex_literal_pattern.match(content, start)
+                        if regex_match:
+                            kind, value, end = 'regex', regex_match.group(), regex_match.end()
+                elif kind == 'string':
+                    value = content[start + 1:end - 1 if end - start > 1 and content[end - 1] == content[start] else end]
+                elif kind == 'template':
+                    end = self._scan_template(content, end)
+                    value = content[start + 1:end - 1 if end - start > 1 and content[end - 1] == '`' else end]
+                else:
+                    continue
+                
+                append((kind, value, start, end))
+                
+                if self._window_closed(window, kind, value, depth):
+                    return end, depth
+                if end != match.end():
+                    # 正则字面量/模板字符串越过了本次匹配的结尾，从其后继续
+                    pos = end
+                    break
+            else:
+                return len(content), depth
+    
+    def _bracket_balance(self, content: str, pos: int, end: int) -> int:
+        """窗口内 ( [ < 与 ) ] > 的数量差（不计字符串、注释和 => 中的 >）"""
+        text = content[pos:end]
+        if '"' in text or "'" in text or '/' in text:
+            text = self._literal_pattern.sub('', text)
+        return (text.count('(') + text.count('[') + text.count('<')
+                - text.count(')') - text.count(']') - text.count('>') + text.count('=>'))
+    
+    def _open_window(self, trigger: str, depth: int) -> list:
+        """根据触发词创建逐token扫描窗口: [类型, 进入时深度, 括号嵌套, 状态, 剩余token数]"""
+        if trigger == 'interface' or trigger == 'type':
+            return ['decl', depth, 0, None, -1]
+        if trigger == 'class':
+            return ['class', depth, 0, None, 64]
+        if trigger == 'import' or trigger == 'export':
+            return ['module', depth, 0, None, 256]
+        if trigger[0] == '@':
+            if trigger.endswith('Component'):
+                return ['decorator', depth, 0, None, 2]
+            return ['member', depth, 0, None, -1]
+        # 成员调用 .get( / fetch( / request( / xxxService.method(
+        return ['call', depth, 0, False, 32]
+    
+    def _window_closed(self, window: list, kind: str, value: str, depth: int) -> bool:
+        """处理窗口内的一个token，返回窗口是否在该token处结束"""
+        window_kind = window[0]
+        
+        if window[4] > 0:
+            window[4] -= 1
+            if window[4] == 0:
+                return True
+        
+        if window_kind == 'call':
+            # 调用的 '(' 之后再取一个token（路径参数）即结束；
+            # 泛型参数之外出现 , : ; = ) 说明不是调用（如构造函数参数 dataService: DataService）
+            if window[3]:
+                return True
+            if value == '(':
+                window[3] = True
+            elif value == '<':
+                window[2] += 1
+            elif value == '>':
+                window[2] -= 1
+            elif value in (',', ':', ';', '=', ')', '{', '}'):
+                return window[2] <= 0
+            return False
+        
+        if window_kind == 'class':
+            return value == '{' or value == ';'
+        
+        if window_kind == 'module':
+            # import ... from 'path' / export * from 'path' 以模块路径字符串结束
+            return kind == 'string' or value == ';'
+        
+        if window_kind == 'decl':
+            if value in ('(', '[', '<'):
+                window[2] += 1
+            elif value in (')', ']', '>'):
+                window[2] -= 1
+            elif value == '}':
+                return depth < window[1] or (depth == window[1] and window[2] <= 0)
+            elif value == ';':
+                return depth == window[1] and window[2] <= 0
+            return False
+        
+        if window_kind == 'member':
+            previous = window[3]
+            window[3] = value
+            if value == '}':
+                return depth < window[1]
+            if value == ';':
+                return depth == window[1]
+            # setter/方法体开始
+            return value == '{' and previous == ')' and depth == window[1] + 1
+        
+        return False
+    
+    def _scan_template(self, content: str, pos: int) -> int:
+        """跳过模板字符串主体，返回结束反引号之后的位置"""
+        length = len(content)
+        
+        while True:
+            pos = self._template_chunk_pattern.match(content, pos).end()
+            if pos >= length:
+                return length
+            if content[pos] == '`':
+                return pos + 1
+            # ${ 表达式，可嵌套大括号和模板字符串（其中的token不输出）
+            pos = self._scan(content, pos + 2, [], True)
+    
+    def _regex_allowed(self, content: str, pos: int) -> bool:
+        """根据 '/' 之前的字符判断其是否开始一个正则字面量"""
+        k = pos - 1
+        while k >= 0 and content[k] in ' \t\r\n':
+            k -= 1
+        if k < 0:
+            return True
+        
+        char = content[k]
+        if char in ')]}\'"`':
+            return False
+        if char.isalnum() or char in '_$':
+            begin = k
+            while begin > 0 and (content[begin - 1].isalnum() or content[begin - 1] in '_$'):
+                begin -= 1
+            return content[begin:k + 1] in self._regex_keywords
+        return True
+
+
+# 不视为自定义数据模型的内置/工具类型
+_BUILTIN_TYPE_NAMES = frozenset({
+    'string', 'number', 'boolean', 'bigint', 'symbol', 'any', 'unknown', 'void', 'never',
+    'null', 'undefined', 'object', 'true', 'false', 'keyof', 'typeof', 'readonly', 'infer',
+    'extends', 'in', 'is', 'Object', 'String', 'Number', 'Boolean', 'Function', 'Symbol',
+    'Array', 'ReadonlyArray', 'Promise', 'Observable', 'Subject', 'BehaviorSubject', 'EventEmitter',
+    'Record', 'Partial', 'Required', 'Readonly', 'Pick', 'Omit', 'Exclude', 'Extract',
+    'NonNullable', 'ReturnType', 'Parameters', 'InstanceType', 'Map', 'Set', 'WeakMap', 'WeakSet',
+    'Date', 'RegExp', 'Error', 'File', 'Blob', 'FormData', 'Event'
+})
+
+
+class SymbolIndex:
+    """跨文件类型符号索引
+    
+    提取过程中登记每个模块的接口定义、import别名和 export ... from 重导出，
+    按 (模块, 名称) 记忆化解析类型引用，并展开继承链得到扁平化模型。
+    模块以去掉扩展名的规范化文件路径标识，相对导入无需访问文件系统即可解析。
+    """
+    
+    _module_suffixes = ('.d.ts', '.ts', '.tsx', '.js', '.jsx')
+    
+    # 类型表达式中的类型名（跳过字符串字面量类型和对象类型中的成员名）
+    _type_reference_pattern = re.compile(r'''
+        '(?:\\.|[^'\\])*' | "(?:\\.|[^"\\])*" | `[^`]*`
+      | (?P<name>[A-Za-z_$][\w$]*(?:\.[A-Za-z_$][\w$]*)*)(?P<member>\s*\??:)?
+    ''', re.VERBOSE)
+    
+    def __init__(self):
+        # 模块 -> 名称 -> 定义
+        self.definitions: Dict[str, Dict[str, InterfaceDefinition]] = defaultdict(dict)
+        # 名称 -> [(模块, 定义)]，导入无法解析时按名称回退
+        self.by_name: Dict[str, List[Tuple[str, InterfaceDefinition]]] = defaultdict(list)
+        # 模块 -> 本地名 -> (模块路径, 导入名)；导入名 'default' / '*' 表示默认导入/命名空间导入
+        self.imports: Dict[str, Dict[str, Tuple[str, str]]] = defaultdict(dict)
+        # 模块 -> [(模块路径, 导入名, 导出名)]；export * from 的导入名和导出名均为 '*'
+        self.reexports: Dict[str, List[Tuple[str, str, str]]] = defaultdict(list)
+        self.modules: set = set()
+        
+        self._symbol_cache: Dict[Tuple[str, str, str], Optional[Tuple[str, InterfaceDefinition]]] = {}
+        self._model_cache: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+        self._resolving: set = set()
+    
+    @classmethod
+    def module_key(cls, file_path: str) -> str:
+        """返回文件对应的模块标识（去掉扩展名的规范化路径）"""
+        for suffix in cls._module_suffixes:
+            if file_path.endswith(suffix):
+                file_path = file_path[:-len(suffix)]
+                break
+        return os.path.normpath(file_path)
+    
+    def add_definition(self, file_path: str, definition: InterfaceDefinition):
+        """登记接口/类型定义"""
+        module = self.module_key(file_path)
+        self.modules.add(module)
+        self.definitions[module][definition.name] = definition
+        self.by_name[definition.name].append((module, definition))
+        self._invalidate()
+    
+    def add_import(self, file_path: str, local_name: str, specifier: str, imported_name: str):
+        """登记 import { imported as local } from 'specifier'"""
+        module = self.module_key(file_path)
+        self.modules.add(module)
+        self.imports[module][local_name] = (specifier, imported_name)
+        self._invalidate()
+    
+    def add_reexport(self, file_path: str, specifier: str, imported_name: str, exported_name: str):
+        """登记 export { imported as exported } from 'specifier' 或 export * from 'specifier'"""
+        module = self.module_key(file_path)
+        self.modules.add(module)
+        self.reexports[module].append((specifier, imported_name, exported_name))
+        self._invalidate()
+    
+    def _invalidate(self):
+        if self._symbol_cache or self._model_cache:
+            self._symbol_cache.clear()
+            self._model_cache.clear()
+    
+    def resolve(self, name: str, module: str) -> Optional[Tuple[str, InterfaceDefinition]]:
+        """解析模块中可见的类型名，返回 (定义所在模块, 定义)"""
+        key = ('local', module, name)
+        if key in self._symbol_cache:
+            return self._symbol_cache[key]
+        
+        # 先占位，循环导入时返回None
+        self._symbol_cache[key] = None
+        result = self._resolve_local(name, module)
+        self._symbol_cache[key] = result
+        return result
+    
+    def _resolve_local(self, name: str, module: str) -> Optional[Tuple[str, InterfaceDefinition]]:
+        head, _, member = name.partition('.')
+        imports = self.imports.get(module, {})
+        
+        if member:
+            # ns.Type：命名空间导入
+            target = imports.get(head)
+            if target is not None and target[1] == '*':
+                target_module = self._resolve_specifier(module, target[0])
+                if target_module is not None:
+                    return self._resolve_export(member, target_module)
+            return None
+        
+        definition = self.definitions.get(module, {}).get(name)
+        if definition is not None:
+            return module, definition
+        
+        target = imports.get(name)
+        if target is not None:
+            specifier, imported = target
+            target_module = self._resolve_specifier(module, specifier)
+            if target_module is not None:
+                result = self._resolve_export(imported, target_module)
+                if result is not None:
+                    return result
+            if imported not in ('default', '*'):
+                name = imported
+        
+        # 非相对路径（路径别名、第三方包）或未收录的模块：按名称回退
+        candidates = self.by_name.get(name)
+        return candidates[-1] if candidates else None
+    
+    def _resolve_export(self, name: str, module: str) -> Optional[Tuple[str, InterfaceDefinition]]:
+        """解析模块导出的名称，沿 export ... from 重导出（如index.ts聚合导出）查找"""
+        key = ('export', module, name)
+        if key in self._symbol_cache:
+            return self._symbol_cache[key]
+        
+        self._symbol_cache[key] = None
+        result = None
+        
+        definition = self.definitions.get(module, {}).get(name)
+        if definition is not None:
+            result = module, definition
+        else:
+            for specifier, imported, exported in self.reexports.get(module, ()):
+                if exported != name and exported != '*':
+                    continue
+                target_module = self._resolve_specifier(module, specifier)
+                if target_module is None:
+                    continue
+                result = self._resolve_export(name if imported == '*' else imported, target_module)
+                if result is not None:
+                    break
+        
+        self._symbol_cache[key] = result
+        return result
+    
+    def _resolve_specifier(self, module: str, specifier: str) -> Optional[str]:
+        """将相对导入路径解析为已登记的模块标识"""
+        if not specifier.startswith('.'):
+            return None
+        
+        target = self.module_key(os.path.join(os.path.dirname(module), specifier))
+        if target in self.modules:
+            return target
+        index = os.path.join(target, 'index')
+        if index in self.modules:
+            return index
+        return None
+    
+    def type_references(self, type_text: str) -> List[str]:
+        """返回类型表达式中引用的自定义类型名（去重，保持出现顺序）"""
+        names: List[str] = []
+        for match in self._type_reference_pattern.finditer(type_text):
+            name = match.group('name')
+            if name and not match.group('member') and name not in _BUILTIN_TYPE_NAMES and name not in names:
+                names.append(name)
+        return names
+    
+    def flatten(self, module: str, definition: InterfaceDefinition) -> Optional[Dict[str, Any]]:
+        """展开继承链并解析属性引用的类型，返回扁平化模型
+        
+        结果按 (模块, 名称) 记忆化；继承链成环时返回None，由调用方标记为循环。
+        """
+        key = (module, definition.name)
+        if key in self._model_cache:
+            return self._model_cache[key]
+        if key in self._resolving:
+            return None
+        
+        self._resolving.add(key)
+        try:
+            model = self._flatten(module, definition)
+        finally:
+            self._resolving.discard(key)
+        
+        self._model_cache[key] = model
+        return model
+    
+    def _flatten(self, module: str, definition: InterfaceDefinition) -> Dict[str, Any]:
+        properties: Dict[str, Dict[str, Any]] = {}
+        extends_chain: List[str] = []
+        references: Dict[str, Dict[str, Any]] = {}
+        unresolved: List[str] = []
+        cyclic = False
+        
+        for base in definition.extends:
+            base_name = base.split('<', 1)[0].strip()
+            resolved = self.resolve(base_name, module)
+            if resolved is None:
+                if base_name not in unresolved:
+                    unresolved.append(base_name)
+                continue
+            
+            base_model = self.flatten(*resolved)
+            if base_model is None:
+                cyclic = True
+                continue
+            
+            extends_chain.append(base_model['name'])
+            extends_chain.extend(name for name in base_model['extends_chain'] if name not in extends_chain)
+            for prop in base_model['properties']:
+                properties.pop(prop['name'], None)
+                properties[prop['name']] = prop
+            references.update(base_model['references'])
+            unresolved.extend(name for name in base_model['unresolved'] if name not in unresolved)
+            cyclic = cyclic or base_model['cyclic']
+        
+        for prop in definition.properties:
+            entry = asdict(prop)
+            entry['declared_in'] = definition.name
+            # 子接口重新声明的属性覆盖父接口属性
+            properties.pop(prop.name, None)
+            properties[prop.name] = entry
+            
+            for type_name in self.type_references(prop.type):
+                if type_name in references or type_name in unresolved:
+                    continue
+                resolved = self.resolve(type_name, module)
+                if resolved is not None:
+                    target = resolved[1]
+                    references[type_name] = {'source_file': target.source_file, 'line_number': target.line_number}
+                elif len(type_name) > 1:
+                    # 单字母名称通常是泛型参数
+                    unresolved.append(type_name)
+        
+        return {
+            'name': definition.name,
+            'source_file': definition.source_file,
+            'line_number': definition.line_number,
+            'extends_chain': extends_chain,
+            'properties': list(properties.values()),
+            'references': references,
+            'unresolved': unresolved,
+            'cyclic': cyclic
+        }
+
+
 class APIContractExtractor:
     """API契约提取器"""
     
-    def __init__(self, source_path: Path):
+    # 默认提取的文件（默认跳过的目录见 SourceWalker.DEFAULT_EXCLUDE）
+    DEFAULT_INCLUDE = ('*.ts', '*.tsx', '*.js', '*.jsx')
+    
+    def __init__(self, source_path: Path, include: Optional[List[str]] = None,
+                 exclude: Optional[List[str]] = None, max_depth: Optional[int] = None):
         self.source_path = source_path
+        self.walker = SourceWalker(source_path, include or self.DEFAULT_INCLUDE, exclude, max_depth)
         self.api_endpoints: List[APIEndpoint] = []
         self.interfaces: Dict[str, InterfaceDefinition] = {}
         self.component_props: Dict[str, ComponentProps] = {}
         
-        # TypeScript解析模式
-        self.interface_pattern = re.compile(
-            r'(?:export\s+)?(?:interface|type)\s+(\w+)(?:\s+extends\s+([^{]+))?\s*\{([^}]*)\}',
-            re.MULTILINE | re.DOTALL
-        )
+        # 端点索引: (path, api_type) -> APIEndpoint，避免逐个线性查找
+        self._endpoint_index: Dict[Tuple[str, str], APIEndpoint] = {}
         
-        # 属性解析模式
-        self.property_pattern = re.compile(
-            r'(\w+)(\?)?:\s*([^;=\n]+)(?:\s*=\s*([^;\n]+))?',
-            re.MULTILINE
-        )
+        # 流式输出时记录当前文件新增/更新的对象，None表示未启用
+        self._pending_records: Optional[Dict[int, Tuple[str, Any]]] = None
+        
+        # 词法分析器：接口、类型、端点和装饰器均基于同一token流提取
+        self.lexer = TypeScriptLexer()
+        
+        # 跨文件类型符号索引：提取时登记定义和导入，报告时解析扁平化模型
+        self.symbol_index = SymbolIndex()
         
         # HTTP方法模式
         self.http_methods = ['get', 'post', 'put', 'delete', 'patch', 'head', 'options']
+        self._http_method_calls = [(f'.{method}(', method.upper()) for method in self.http_methods]
+        self._http_method_names = frozenset(self.http_methods)
+        # token流中需要处理的标识符（另有以服务名后缀结尾的标识符）
+        self._keyword_idents = frozenset(('import', 'export', 'interface', 'type', 'class', 'fetch', 'request'))
+        # parse_file只需要的词法窗口：类型声明和调用
+        self._parse_windows = frozenset(('decl', 'call'))
         
-        # 后端API调用模式 (真实HTTP请求)
-        self.backend_api_patterns = [
-            r'\.(?:' + '|'.join(self.http_methods) + r')\([\'"`]([^\'"`]+)[\'"`]',
-            r'request\([\'"`]([^\'"`]+)[\'"`]',
-            r'fetch\([\'"`]([^\'"`]+)[\'"`]'
-        ]
-        
-        # 前端服务/仓库模式
-        self.frontend_service_patterns = [
-            r'([A-Z][a-zA-Z]*Service)\.',
-            r'([A-Z][a-zA-Z]*Repository)\.',
-            r'([A-Z][a-zA-Z]*Api)\.',
-            r'([a-zA-Z]*Service)\.',
-            r'([a-zA-Z]*Repository)\.'
-        ]
-        
-        # API路径模式
-        self.api_path_patterns = [
-            r'/api/[a-zA-Z0-9/_-]*',  # 标准API路径
-            r'/[a-zA-Z0-9/_-]*',       # 其他路径
-            r'http[s]?://[^\s\'"`]+'   # 完整URL
-        ]
+        # API路径模式（re.match语义：任一模式匹配路径开头即可）
+        self.api_path_pattern = re.compile(
+            r'/api/[a-zA-Z0-9/_-]*'   # 标准API路径
+            r'|/[a-zA-Z0-9/_-]*'      # 其他路径
+            r'|http[s]?://[^\s\'"`]+'  # 完整URL
+        )
     
     def extract_all(self) -> Dict[str, Any]:
         """提取所有API契约"""
         print(f"🔍 正在提取API契约: {self.source_path}")
         
-        # 查找所有TypeScript/JavaScript文件
-        ts_files = list(self.source_path.rglob("*.ts")) + \
-                   list(self.source_path.rglob("*.tsx")) + \
-                   list(self.source_path.rglob("*.js")) + \
-                   list(self.source_path.rglob("*.jsx"))
+        ts_files = self._find_source_files()
         
         print(f"📄 找到 {len(ts_files)} 个源文件")
         
         for file_path in ts_files:
             self._extract_from_file(file_path)
         
+        return self.build_result(len(ts_files))
+    
+    def build_result(self, total_files: int) -> Dict[str, Any]:
+        """已提取结果的JSON结构（即 --json 的输出）"""
         return {
             'api_endpoints': [asdict(ep) for ep in self.api_endpoints],
             'interfaces': {name: asdict(iface) for name, iface in self.interfaces.items()},
+            'flattened_models': self.build_models(),
             'component_props': {name: asdict(props) for name, props in self.component_props.items()},
             'metadata': {
                 'source_path': str(self.source_path),
                 'extraction_date': datetime.now().isoformat(),
-                'total_files': len(ts_files),
+                'total_files': total_files,
                 'total_endpoints': len(self.api_endpoints),
                 'total_interfaces': len(self.interfaces),
                 'total_components': len(self.component_props)
             }
         }
     
+    def iter_records(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """逐文件提取并产出流式记录 (record_type, data)
+        
+        每个文件处理完毕后立即产出该文件新增或更新的端点、接口和组件属性，
+        后出现的同键记录覆盖先前记录（与extract_all的去重/合并语义一致）。
+        扁平化模型依赖全部文件的符号索引，在所有文件处理完毕后产出。
+        """
+        print(f"🔍 正在提取API契约: {self.source_path}")
+        
+        ts_files = self._find_source_files()
+        
+        print(f"📄 找到 {len(ts_files)} 个源文件")
+        
+        yield 'metadata', {
+            'source_path': str(self.source_path),
+            'extraction_date': datetime.now().isoformat(),
+            'total_files': len(ts_files)
+        }
+        
+        self._pending_records = {}
+        try:
+            for file_path in ts_files:
+                self._extract_from_file(file_path)
+                
+                for record_type, record in self._pending_records.values():
+                    yield record_type, asdict(record)
+                self._pending_records.clear()
+        finally:
+            self._pending_records = None
+        
+        for model in self.build_models().values():
+            yield 'model', model
+        
+        yield 'metadata', {
+            'total_endpoints': len(self.api_endpoints),
+            'total_interfaces': len(self.interfaces),
+            'total_components': len(self.component_props)
+        }
+    
+    def build_models(self) -> Dict[str, Dict[str, Any]]:
+        """解析所有接口的继承链和引用类型，返回扁平化模型（按接口名）"""
+        models: Dict[str, Dict[str, Any]] = {}
+        
+        for name, interface in self.interfaces.items():
+            module = SymbolIndex.module_key(interface.source_file)
+            model = self.symbol_index.flatten(module, interface)
+            # 自身位于继承环上时flatten返回None
+            models[name] = model if model is not None else {
+                'name': name,
+                'source_file': interface.source_file,
+                'line_number': interface.line_number,
+                'extends_chain': [],
+                'properties': [dict(asdict(prop), declared_in=name) for prop in interface.properties],
+                'references': {},
+                'unresolved': [],
+                'cyclic': True
+            }
+        
+        return models
+    
+    def _find_source_files(self) -> List[Path]:
+        """查找所有TypeScript/JavaScript文件（跳过node_modules等依赖/构建目录）"""
+        return list(self.walker)
+    
+    def _emit(self, record_type: str, record: Any):
+        """登记流式输出记录（同一文件内同一对象只输出一次）"""
+        if self._pending_records is not None:
+            self._pending_records[id(record)] = (record_type, record)
+    
     def _extract_from_file(self, file_path: Path):
         """从单个文件提取信息"""
         try:
             content = file_path.read_text(encoding='utf-8')
-            lines = content.split('\n')
+        except Exception as e:
+            print(f"⚠️ 处理文件 {file_path} 时出错: {e}")
+            return
+        
+        self.process_file(file_path, content)
+    
+    def process_file(self, file_path: Path, content: str) -> Optional['FileContext']:
+        """提取单个文件（内容由调用方读取，统一提取核心据此与代码定义提取共享同一次读取）
+        
+        返回的FileContext带有本文件的类型声明和HTTP调用位置，代码定义提取直接复用，
+        不再重新解析；处理出错时返回None。
+        """
+        try:
+            ctx = FileContext(content, str(file_path))
             
-            # 提取接口定义
-            self._extract_interfaces(content, str(file_path), lines)
+            # 一次词法扫描，接口、端点和组件属性均基于同一token流提取
+            self._extract_from_tokens(ctx, self.lexer.tokenize(ctx.content))
+            return ctx
+        
+        except Exception as e:
+            print(f"⚠️ 处理文件 {file_path} 时出错: {e}")
+            return None
+    
+    def parse_file(self, file_path: Path, content: str) -> Optional['FileContext']:
+        """只解析单个文件的类型声明和HTTP调用，不登记到本提取器的结果中
+        
+        供代码定义提取单独运行时逐文件调用：只打开声明和调用窗口，
+        端点、接口、组件属性和符号索引均不累积；处理出错时返回None。
+        """
+        try:
+            ctx = FileContext(content, str(file_path))
+            self._extract_from_tokens(ctx, self.lexer.tokenize(content, self._parse_windows), register=False)
+            return ctx
+        
+        except Exception as e:
+            print(f"⚠️ 处理文件 {file_path} 时出错: {e}")
+            return None
+    
+    def _extract_from_tokens(self, ctx: 'FileContext', tokens: List[Tuple[str, str, int, int]],
+                             register: bool = True):
+        """遍历token流，提取接口/类型定义、API端点和Angular组件属性
+        
+        register为False时只把类型声明和HTTP调用记录到ctx。
+        """
+        count = len(tokens)
+        depth = 0
+        
+        # @Component装饰器位置 -> 等待class关键字 -> 等待类体 '{' -> 解析类体
+        pending_decorator: Optional[int] = None
+        pending_class: Optional[Tuple[str, int]] = None
+        component: Optional[Dict[str, Any]] = None
+        keyword_idents = self._keyword_idents
+        
+        i = 0
+        while i < count:
+            kind, value, start, end = tokens[i]
             
-            # 提取API端点
-            self._extract_api_endpoints(content, str(file_path), lines)
+            if kind == 'punct':
+                if value == '{':
+                    depth += 1
+                    if pending_class is not None:
+                        component = {
+                            'name': pending_class[0],
+                            'start': pending_class[1],
+                            'depth': depth,
+                            'inputs': [],
+                            'outputs': []
+                        }
+                        pending_class = None
+                elif value == '}':
+                    if component is not None and depth == component['depth']:
+                        if register:
+                            self._add_component(ctx, component)
+                        component = None
+                    depth -= 1
+                elif value == '@' and i + 1 < count:
+                    decorator = tokens[i + 1][1]
+                    if decorator == 'Component':
+                        pending_decorator = start
+                        i = self._skip_call_arguments(tokens, i + 2)
+                        continue
+                    if component is not None and depth == component['depth'] and decorator in ('Input', 'Output'):
+                        i = self._extract_decorated_member(ctx, tokens, i, component, decorator == 'Output')
+                        continue
+                elif (value == '.' or value == '?.') and i + 3 < count:
+                    # .get('/api/...') 或 .get<T>('/api/...') 等HTTP调用
+                    method = tokens[i + 1]
+                    if method[0] == 'ident' and method[1] in self._http_method_names:
+                        j = i + 2
+                        if tokens[j][1] == '<':
+                            j = self._find_closing(tokens, j) + 1
+                        if j + 1 < count and tokens[j][1] == '(' and tokens[j + 1][0] in ('string', 'template'):
+                            ctx.http_calls.append((method[1].upper(), tokens[j + 1][1], start))
+                            if register:
+                                self._add_backend_endpoint(ctx, tokens[j + 1][1], method[1].upper(), start)
             
-            # 提取组件属性
-            self._extract_component_props(content, str(file_path), lines)
+            elif kind == 'ident' and (value in keyword_idents or value.endswith(_SERVICE_NAME_SUFFIXES)):
+                if (value == 'import' or value == 'export') and depth == 0:
+                    i = self._extract_module_reference(ctx, tokens, i, register)
+                    continue
+                if value == 'interface' or value == 'type':
+                    next_index = self._extract_type_declaration(ctx, tokens, i, register)
+                    if next_index is not None:
+                        i = next_index
+                        continue
+                elif value == 'class':
+                    if pending_decorator is not None and i + 1 < count and tokens[i + 1][0] == 'ident':
+                        pending_class = (tokens[i + 1][1], pending_decorator)
+                        pending_decorator = None
+                elif value == 'fetch' or value == 'request':
+                    if i + 2 < count and tokens[i + 1][1] == '(' and tokens[i + 2][0] in ('string', 'template'):
+                        http_method = self._infer_http_method(ctx, start)
+                        if value == 'fetch':
+                            ctx.http_calls.append((http_method or "GET", tokens[i + 2][1], start))
+                        if register:
+                            self._add_backend_endpoint(ctx, tokens[i + 2][1], http_method, start)
+                elif (register and value.endswith(_SERVICE_NAME_SUFFIXES) and i + 3 < count
+                        and tokens[i + 1][1] in ('.', '?.') and tokens[i + 2][0] == 'ident'
+                        and tokens[i + 3][1] == '(' and self._is_service_name(value)):
+                    self._add_frontend_endpoint(ctx, f"{value}.{tokens[i + 2][1]}", start)
             
-        except Exception as e:
-            print(f"⚠️ 处理文件 {file_path} 时出错: {e}")
+            i += 1
+        
+        if component is not None and register:
+            self._add_component(ctx, component)
+    
+    def _extract_type_declaration(self, ctx: 'FileContext', tokens: List[Tuple[str, str, int, int]],
+                                  i: int, register: bool = True) -> Optional[int]:
+        """解析 interface X {...} 或 type X = {...}，返回声明之后的token下标
+        
+        不是对象形式的声明（如联合类型别名或属性名 type）返回None；
+        register为False时只记录到ctx.declarations。
+        """
+        count = len(tokens)
+        keyword = tokens[i][1]
+        
+        if i > 0 and tokens[i - 1][1] in ('.', '?.'):
+            return None
+        if i + 2 >= count or tokens[i + 1][0] != 'ident':
+            return None
+        
+        name = tokens[i + 1][1]
+        j = i + 2
+        
+        # 泛型参数
+        if tokens[j][1] == '<':
+            j = self._find_closing(tokens, j) + 1
+        
+        extends: List[str] = []
+        
+        if keyword == 'interface':
+            if j < count and tokens[j][1] == 'extends':
+                j, extends = self._parse_type_list(ctx, tokens, j + 1, ',', '{')
+        else:
+            if j >= count or tokens[j][1] != '=':
+                return None
+            # type X = Base & { ... } 视为继承Base
+            j, extends = self._parse_type_list(ctx, tokens, j + 1, '&', '{')
+        
+        if j >= count or tokens[j][1] != '{':
+            return None
+        
+        close = self._find_closing(tokens, j)
+        start_token = tokens[i - 1] if i > 0 and tokens[i - 1][1] == 'export' else tokens[i]
+        
+        interface = InterfaceDefinition(
+            name=name,
+            properties=self._parse_members(ctx, tokens, j, close),
+            extends=extends,
+            source_file=ctx.file_path,
+            line_number=ctx.line_number(start_token[2])
+        )
+        
+        ctx.declarations.append((keyword, start_token[2], tokens[close][3], interface))
+        if register:
+            self.interfaces[name] = interface
+            self.symbol_index.add_definition(ctx.file_path, interface)
+            self._emit('interface', interface)
+        
+        return close + 1
+    
+    def _extract_module_reference(self, ctx: 'FileContext', tokens: List[Tuple[str, str, int, int]],
+                                  i: int, register: bool = True) -> int:
+        """解析 import ... from 'x' 或 export {...}/* from 'x'，登记到符号索引，返回其后的token下标
+        
+        register为False时只解析、不登记。
+        """
+        count = len(tokens)
+        reexport = tokens[i][1] == 'export'
+        names: List[Tuple[str, str]] = []  # (导入名, 本地名/导出名)
+        j = i + 1
+        
+        if j + 1 < count and tokens[j][1] == 'type' and tokens[j + 1][1] in ('{', '*'):
+            j += 1
+        
+        # 默认导入 import X from / import X, {...} from
+        if not reexport and j < count and tokens[j][0] == 'ident' and tokens[j][1] != 'from':
+            names.append(('default', tokens[j][1]))
+            j += 1
+            if j < count and tokens[j][1] == ',':
+                j += 1
+        
+        if j < count and tokens[j][1] == '*':
+            if j + 2 < count and tokens[j + 1][1] == 'as' and tokens[j + 2][0] == 'ident':
+                names.append(('*', tokens[j + 2][1]))
+                j += 3
+            else:
+                names.append(('*', '*'))
+                j += 1
+        elif j < count and tokens[j][1] == '{':
+            close = self._find_closing(tokens, j)
+            k = j + 1
+            while k < close:
+                if tokens[k][0] == 'ident':
+                    # import { type X } 中的type修饰符
+                    if tokens[k][1] == 'type' and k + 1 < close and tokens[k + 1][0] == 'ident' and tokens[k + 1][1] != 'as':
+                        k += 1
+                    imported = local = tokens[k][1]
+                    if k + 2 < close and tokens[k + 1][1] == 'as':
+                        local = tokens[k + 2][1]
+                        k += 2
+                    names.append((imported, local))
+                k += 1
+            j = close + 1
+        
+        if not (j + 1 < count and tokens[j][1] == 'from' and tokens[j + 1][0] == 'string'):
+            return max(j, i + 1)
+        
+        specifier = tokens[j + 1][1]
+        if not register:
+            return j + 2
+        for imported, local in names:
+            if reexport:
+                self.symbol_index.add_reexport(ctx.file_path, specifier, imported, local)
+            else:
+                self.symbol_index.add_import(ctx.file_path, local, specifier, imported)
+        
+        return j + 2
     
-    def _extract_interfaces(self, content: str, file_path: str, lines: List[str]):
-        """提取TypeScript接口定义"""
-        matches = self.interface_pattern.finditer(content)
+    def _parse_type_list(self, ctx: 'FileContext', tokens: List[Tuple[str, str, int, int]], j: int,
+                         separator: str, terminator: str) -> Tuple[int, List[str]]:
+        """解析以separator分隔、遇到terminator结束的类型引用列表"""
+        count = len(tokens)
+        types: List[str] = []
         
-        for match in matches:
-            interface_name = match.group(1)
-            extends_str = match.group(2)
-            properties_body = match.group(3)
+        while j < count and tokens[j][1] != terminator:
+            end = j
+            while end < count and tokens[end][1] not in (separator, terminator, ';'):
+                if tokens[end][1] in ('<', '(', '['):
+                    end = self._find_closing(tokens, end)
+                end += 1
             
-            # 计算行号
-            line_number = content[:match.start()].count('\n') + 1
+            if end == j or end >= count or tokens[end][1] == ';':
+                return end, types
+            types.append(ctx.text(tokens, j, end))
+            j = end + 1 if tokens[end][1] == separator else end
+        
+        return j, types
+    
+    def _parse_members(self, ctx: 'FileContext', tokens: List[Tuple[str, str, int, int]],
+                       open_index: int, close_index: int) -> List[InterfaceProperty]:
+        """解析 { ... } 中的顶层成员，嵌套对象类型作为成员类型整体保留"""
+        properties: List[InterfaceProperty] = []
+        j = open_index + 1
+        
+        while j < close_index:
+            kind, value, start, end = tokens[j]
             
-            # 解析继承
-            extends = []
-            if extends_str:
-                extends = [ext.strip() for ext in extends_str.split(',')]
+            if kind == 'punct' and value in (';', ','):
+                j += 1
+                continue
             
-            # 解析属性
-            properties = []
-            for prop_match in self.property_pattern.finditer(properties_body):
-                prop_name = prop_match.group(1)
-                optional = prop_match.group(2) == '?'
-                prop_type = prop_match.group(3).strip()
-                default_value = prop_match.group(4).strip() if prop_match.group(4) else ""
-                
-                properties.append(InterfaceProperty(
-                    name=prop_name,
-                    type=prop_type,
-                    optional=optional,
-                    default_value=default_value
-                ))
+            if (kind == 'ident' and value in _MEMBER_MODIFIERS and j + 1 < close_index
+                    and (tokens[j + 1][0] in ('ident', 'string') or tokens[j + 1][1] == '[')):
+                j += 1
+                continue
             
-            # 创建接口定义
-            interface = InterfaceDefinition(
-                name=interface_name,
-                properties=properties,
-                extends=extends,
-                source_file=file_path,
-                line_number=line_number
-            )
+            if kind in ('ident', 'string', 'number'):
+                name = value
+                j += 1
+            elif value == '[':
+                # 索引签名 [key: string]: T
+                bracket_close = self._find_closing(tokens, j)
+                name = ctx.text(tokens, j, bracket_close + 1)
+                j = bracket_close + 1
+            else:
+                j = max(self._type_end(ctx, tokens, j + 1, close_index), j + 1)
+                continue
+            
+            optional = False
+            if j < close_index and tokens[j][1] == '?':
+                optional = True
+                j += 1
             
-            self.interfaces[interface_name] = interface
+            if j < close_index and tokens[j][1] == ':':
+                type_end = self._type_end(ctx, tokens, j + 1, close_index)
+                prop_type = ctx.text(tokens, j + 1, type_end)
+            elif j < close_index and tokens[j][1] in ('(', '<'):
+                # 方法签名
+                type_end = self._type_end(ctx, tokens, j, close_index)
+                prop_type = ctx.text(tokens, j, type_end)
+            else:
+                continue
+            j = type_end
+            
+            default_value = ""
+            if j < close_index and tokens[j][1] == '=':
+                default_end = self._type_end(ctx, tokens, j + 1, close_index, stop_at_assign=False)
+                default_value = ctx.text(tokens, j + 1, default_end)
+                j = default_end
+            
+            properties.append(InterfaceProperty(
+                name=name,
+                type=prop_type,
+                optional=optional,
+                default_value=default_value
+            ))
+        
+        return properties
     
-    def _extract_api_endpoints(self, content: str, file_path: str, lines: List[str]):
-        """提取API端点调用"""
+    def _type_end(self, ctx: 'FileContext', tokens: List[Tuple[str, str, int, int]], j: int, limit: int,
+                  stop_at_assign: bool = True) -> int:
+        """返回从j开始的类型表达式之后的token下标
         
-        # 1. 提取后端API (真实HTTP请求)
-        for pattern in self.backend_api_patterns:
-            matches = re.finditer(pattern, content)
+        在顶层遇到 ; , = 、未配对的闭括号或换行（且前后都不是续行运算符）时结束。
+        """
+        depth = 0
+        begin = j
+        
+        while j < limit:
+            kind, value, start, end = tokens[j]
             
-            for match in matches:
-                api_path = match.group(1) if len(match.groups()) > 0 else match.group(0)
-                
-                # 跳过相对路径和非API路径
-                if not self._is_api_path(api_path):
-                    continue
-                
-                # 尝试推断HTTP方法
-                method = self._infer_http_method(content, match.start(), lines)
-                
-                # 计算行号
-                line_number = content[:match.start()].count('\n') + 1
-                
-                # 检查是否已存在相同端点
-                existing = None
-                for ep in self.api_endpoints:
-                    if ep.path == api_path and ep.api_type == "backend":
-                        existing = ep
-                        break
-                
-                if existing:
-                    # 更新现有端点的HTTP方法
-                    if method and method not in existing.method:
-                        existing.method += f",{method}"
-                else:
-                    # 创建后端API端点
-                    endpoint = APIEndpoint(
-                        method=method or "unknown",
-                        path=api_path,
-                        source_file=file_path,
-                        line_number=line_number,
-                        api_type="backend",
-                        category="http"
-                    )
-                    self.api_endpoints.append(endpoint)
-        
-        # 2. 提取前端服务/仓库调用
-        for pattern in self.frontend_service_patterns:
-            matches = re.finditer(pattern, content)
+            if (depth == 0 and j > begin and value not in _TYPE_CONTINUATION_TOKENS
+                    and tokens[j - 1][1] not in _TYPE_CONTINUATION_TOKENS
+                    and ctx.content.find('\n', tokens[j - 1][3], start) != -1):
+                return j
             
-            for match in matches:
-                service_name = match.group(1)
-                
-                # 提取服务方法调用
-                service_method_pattern = rf'{service_name}\.(\w+)\('
-                method_matches = re.finditer(service_method_pattern, content)
-                
-                for method_match in method_matches:
-                    method_name = method_match.group(1)
-                    
-                    # 构造前端API路径
-                    api_path = f"{service_name}.{method_name}"
-                    
-                    # 计算行号
-                    line_number = content[:method_match.start()].count('\n') + 1
-                    
-                    # 检查是否已存在相同端点
-                    existing = None
-                    for ep in self.api_endpoints:
-                        if ep.path == api_path and ep.api_type == "frontend":
-                            existing = ep
-                            break
-                    
-                    if not existing:
-                        # 创建前端API端点
-                        endpoint = APIEndpoint(
-                            method="FRONTEND",
-                            path=api_path,
-                            description=f"Frontend service method call",
-                            source_file=file_path,
-                            line_number=line_number,
-                            api_type="frontend",
-                            category="service"
-                        )
-                        self.api_endpoints.append(endpoint)
+            if kind == 'punct':
+                if value in ('(', '[', '{', '<'):
+                    depth += 1
+                elif value in (')', ']', '}', '>'):
+                    if depth == 0:
+                        return j
+                    depth -= 1
+                elif depth == 0 and (value == ';' or value == ',' or (value == '=' and stop_at_assign)):
+                    return j
+            
+            j += 1
+        
+        return limit
+    
+    def _find_closing(self, tokens: List[Tuple[str, str, int, int]], j: int) -> int:
+        """返回与tokens[j]处开括号配对的闭括号下标（找不到时返回最后一个token）"""
+        opener = tokens[j][1]
+        closer = _CLOSING_BRACKETS[opener]
+        depth = 0
+        
+        for k in range(j, len(tokens)):
+            value = tokens[k][1]
+            if value == opener and tokens[k][0] == 'punct':
+                depth += 1
+            elif value == closer and tokens[k][0] == 'punct':
+                depth -= 1
+                if depth == 0:
+                    return k
+        
+        return len(tokens) - 1
+    
+    def _skip_call_arguments(self, tokens: List[Tuple[str, str, int, int]], j: int) -> int:
+        """跳过装饰器调用参数 (...)，返回其后的token下标"""
+        if j < len(tokens) and tokens[j][1] == '(':
+            return self._find_closing(tokens, j) + 1
+        return j
+    
+    def _extract_decorated_member(self, ctx: 'FileContext', tokens: List[Tuple[str, str, int, int]],
+                                  i: int, component: Dict[str, Any], is_output: bool) -> int:
+        """解析 @Input()/@Output() 修饰的类成员，返回成员名/类型之后的token下标"""
+        count = len(tokens)
+        j = self._skip_call_arguments(tokens, i + 2)
+        
+        while (j + 1 < count and tokens[j][0] == 'ident' and tokens[j + 1][0] == 'ident'
+               and tokens[j][1] in _CLASS_MEMBER_MODIFIERS):
+            j += 1
+        
+        if j >= count or tokens[j][0] != 'ident':
+            return j
+        
+        prop_name = tokens[j][1]
+        j += 1
+        if j < count and tokens[j][1] in ('!', '?'):
+            j += 1
+        
+        prop_type = ""
+        if j < count and tokens[j][1] == ':':
+            type_end = self._type_end(ctx, tokens, j + 1, count)
+            prop_type = ctx.text(tokens, j + 1, type_end)
+            j = type_end
+        elif j < count and tokens[j][1] == '(':
+            # setter: @Input() set value(v: T)
+            paren_close = self._find_closing(tokens, j)
+            if j + 2 < paren_close and tokens[j + 2][1] == ':':
+                prop_type = ctx.text(tokens, j + 3, self._type_end(ctx, tokens, j + 3, paren_close))
+            j = paren_close + 1
+        
+        if is_output:
+            if not prop_type and j + 2 < count and tokens[j][1] == '=' and tokens[j + 1][1] == 'new':
+                # = new EventEmitter<T>()
+                type_end = j + 3
+                if type_end < count and tokens[type_end][1] == '<':
+                    type_end = self._find_closing(tokens, type_end) + 1
+                    prop_type = ctx.text(tokens, j + 2, type_end)
+            component['outputs'].append(InterfaceProperty(
+                name=prop_name,
+                type=prop_type or "EventEmitter<any>",
+                optional=True
+            ))
+        else:
+            component['inputs'].append(InterfaceProperty(
+                name=prop_name,
+                type=prop_type or ctx.property_type(prop_name, component['start']),
+                optional=True  # Angular Input默认可选
+            ))
+        
+        return j
+    
+    def _add_component(self, ctx: 'FileContext', component: Dict[str, Any]):
+        """登记解析完成的组件属性"""
+        if not component['inputs'] and not component['outputs']:
+            return
+        
+        props = ComponentProps(
+            component_name=component['name'],
+            inputs=component['inputs'],
+            outputs=component['outputs'],
+            source_file=ctx.file_path,
+            line_number=ctx.line_number(component['start'])
+        )
+        
+        self.component_props[component['name']] = props
+        self._emit('component', props)
+    
+    def _add_backend_endpoint(self, ctx: 'FileContext', api_path: str, method: str, pos: int):
+        """登记后端API端点（同一路径合并HTTP方法）"""
+        # 跳过相对路径和非API路径
+        if not self._is_api_path(api_path):
+            return
+        
+        # 检查是否已存在相同端点
+        existing = self._endpoint_index.get((api_path, "backend"))
+        
+        if existing:
+            # 更新现有端点的HTTP方法
+            if method and method not in existing.method:
+                existing.method += f",{method}"
+                self._emit('endpoint', existing)
+        else:
+            # 创建后端API端点
+            self._add_endpoint(APIEndpoint(
+                method=method or "unknown",
+                path=api_path,
+                source_file=ctx.file_path,
+                line_number=ctx.line_number(pos),
+                api_type="backend",
+                category="http"
+            ))
+    
+    def _add_frontend_endpoint(self, ctx: 'FileContext', api_path: str, pos: int):
+        """登记前端服务/仓库方法调用"""
+        if (api_path, "frontend") in self._endpoint_index:
+            return
+        
+        self._add_endpoint(APIEndpoint(
+            method="FRONTEND",
+            path=api_path,
+            description=f"Frontend service method call",
+            source_file=ctx.file_path,
+            line_number=ctx.line_number(pos),
+            api_type="frontend",
+            category="service"
+        ))
+    
+    def _add_endpoint(self, endpoint: APIEndpoint):
+        """登记新端点"""
+        self.api_endpoints.append(endpoint)
+        self._endpoint_index[(endpoint.path, endpoint.api_type)] = endpoint
+        self._emit('endpoint', endpoint)
+    
+    def _is_service_name(self, name: str) -> bool:
+        """判断标识符是否为服务/仓库对象名"""
+        if name.endswith('Service') or name.endswith('Repository'):
+            return True
+        return name.endswith('Api') and name[0].isupper()
     
     def _is_api_path(self, path: str) -> bool:
         """判断是否为API路径"""
@@ -298,14 +1454,12 @@ class APIContractExtractor:
             return False
         
         # 检查是否匹配API路径模式
-        for pattern in self.api_path_patterns:
-            if re.match(pattern, path):
-                return True
-        
-        return False
+        return self.api_path_pattern.match(path) is not None
     
-    def _infer_http_method(self, content: str, pos: int, lines: List[str]) -> str:
+    def _infer_http_method(self, ctx: 'FileContext', pos: int) -> str:
         """推断HTTP方法"""
+        content = ctx.content
+        
         # 查找附近的HTTP方法调用
         line_start = content.rfind('\n', 0, pos)
         line_end = content.find('\n', pos)
@@ -315,87 +1469,361 @@ class APIContractExtractor:
         if line_end == -1:
             line_end = len(content)
         
-        current_line = content[line_start:line_end]
-        
-        # 检查是否包含HTTP方法
-        for method in self.http_methods:
-            if f'.{method}(' in current_line:
-                return method.upper()
+        # 检查当前行是否包含HTTP方法
+        for call, method in self._http_method_calls:
+            if content.find(call, line_start, line_end) != -1:
+                return method
         
         return ""
+
+
+class FileContext:
+    """单文件提取上下文
     
-    def _extract_component_props(self, content: str, file_path: str, lines: List[str]):
-        """提取组件属性定义"""
-        # 查找@Component或类似的装饰器
-        component_pattern = re.compile(
-            r'@Component\s*\(\s*\{[^}]*selector\s*:\s*[\'"`]([^\'"`]+)[\'"`][^}]*\}',
-            re.MULTILINE | re.DOTALL
-        )
-        
-        # 查找@Input和@Output装饰器
-        input_pattern = re.compile(r'@Input\(\)\s*(\w+)')
-        output_pattern = re.compile(r'@Output\(\)\s*(\w+)')
+    持有文件内容并从上次查询的位置增量统计行号，
+    避免每次匹配都从文件开头计数换行或为每个属性编译新模式。
+    提取过程中同时记录本文件的类型声明 (关键字, 起止位置, 定义) 和
+    HTTP方法/fetch调用 (方法, URL, 位置)，包括未通过API路径过滤和端点去重的调用。
+    """
+    
+    __slots__ = ('content', 'file_path', 'declarations', 'http_calls', '_line_pos', '_line')
+    
+    _type_annotation_pattern = re.compile(r'\s*:\s*([^;\n]+)')
+    
+    def __init__(self, content: str, file_path: str):
+        self.content = content
+        self.file_path = file_path
+        self.declarations: List[Tuple[str, int, int, InterfaceDefinition]] = []
+        self.http_calls: List[Tuple[str, str, int]] = []
+        # 上次查询的位置和行号：提取大体按位置顺序查询，只统计两次位置之间的换行
+        self._line_pos = 0
+        self._line = 1
+    
+    def line_number(self, pos: int) -> int:
+        """获取指定位置的行号（1开始）"""
+        if pos >= self._line_pos:
+            self._line += self.content.count('\n', self._line_pos, pos)
+        else:
+            self._line -= self.content.count('\n', pos, self._line_pos)
+        self._line_pos = pos
+        return self._line
+    
+    def property_type(self, prop_name: str, start: int = 0) -> str:
+        """查找start之后首个 `prop_name: type` 定义的类型"""
+        content = self.content
+        pos = content.find(prop_name, start)
         
-        component_matches = component_pattern.finditer(content)
+        while pos != -1:
+            match = self._type_annotation_pattern.match(content, pos + len(prop_name))
+            if match:
+                return match.group(1).strip()
+            pos = content.find(prop_name, pos + 1)
         
-        for comp_match in component_matches:
-            selector = comp_match.group(1)
-            
-            # 查找组件类名
-            class_match = re.search(r'export\s+class\s+(\w+)', content[comp_match.end():])
-            if not class_match:
+        return "any"
+    
+    def text(self, tokens: List[Tuple[str, str, int, int]], begin: int, end: int) -> str:
+        """返回tokens[begin:end]覆盖的源代码文本（空白折叠为单个空格）"""
+        if end <= begin:
+            return ""
+        return ' '.join(self.content[tokens[begin][2]:tokens[end - 1][3]].split())
+
+
+def write_ndjson(records: Iterator[Tuple[str, Dict[str, Any]]], output_path: Path) -> int:
+    """将流式记录逐行写入NDJSON文件，返回写入的记录数"""
+    count = 0
+    with open(output_path, 'w', encoding='utf-8') as f:
+        for record_type, data in records:
+            f.write(json.dumps({'type': record_type, 'data': data}, ensure_ascii=False))
+            f.write('\n')
+            count += 1
+    return count
+
+
+def iter_ndjson_records(ndjson_path: Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """逐行读取NDJSON记录 (record_type, data)"""
+    with open(ndjson_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
                 continue
-                
-            component_name = class_match.group(1)
-            
-            # 提取Input和Output属性
-            inputs = []
-            outputs = []
-            
-            # 在整个文件中查找该组件的Input/Output
-            component_section = content[comp_match.start():]
-            
-            for input_match in input_pattern.finditer(component_section):
-                prop_name = input_match.group(1)
-                # 尝试找到属性类型
-                prop_type = self._find_property_type(component_section, prop_name)
-                inputs.append(InterfaceProperty(
-                    name=prop_name,
-                    type=prop_type,
-                    optional=True  # Angular Input默认可选
-                ))
-            
-            for output_match in output_pattern.finditer(component_section):
-                prop_name = output_match.group(1)
-                # Output通常是EventEmitter
-                outputs.append(InterfaceProperty(
-                    name=prop_name,
-                    type="EventEmitter<any>",
-                    optional=True
-                ))
-            
-            if inputs or outputs:
-                line_number = content[:comp_match.start()].count('\n') + 1
-                props = ComponentProps(
-                    component_name=component_name,
-                    inputs=inputs,
-                    outputs=outputs,
-                    source_file=file_path,
-                    line_number=line_number
-                )
-                
-                self.component_props[component_name] = props
+            record = json.loads(line)
+            yield record['type'], record['data']
+
+
+def load_ndjson_contracts(ndjson_path: Path) -> Dict[str, Any]:
+    """从NDJSON流重建报告生成器所需的数据结构
+    
+    逐条折叠记录，同键记录后者覆盖前者，不会一次性载入整个文件。
+    """
+    endpoints: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    interfaces: Dict[str, Dict[str, Any]] = {}
+    flattened_models: Dict[str, Dict[str, Any]] = {}
+    component_props: Dict[str, Dict[str, Any]] = {}
+    metadata: Dict[str, Any] = {}
+    
+    for record_type, data in iter_ndjson_records(ndjson_path):
+        if record_type == 'endpoint':
+            endpoints[(data['path'], data['api_type'])] = data
+        elif record_type == 'interface':
+            interfaces[data['name']] = data
+        elif record_type == 'model':
+            flattened_models[data['name']] = data
+        elif record_type == 'component':
+            component_props[data['component_name']] = data
+        elif record_type == 'metadata':
+            metadata.update(data)
+    
+    metadata.setdefault('source_path', '')
+    metadata.setdefault('extraction_date', '')
+    metadata.setdefault('total_files', 0)
+    metadata['total_endpoints'] = len(endpoints)
+    metadata['total_interfaces'] = len(interfaces)
+    metadata['total_components'] = len(component_props)
+    
+    return {
+        'api_endpoints': list(endpoints.values()),
+        'interfaces': interfaces,
+        'flattened_models': flattened_models,
+        'component_props': component_props,
+        'metadata': metadata
+    }
+
+
+def load_contract_snapshot(snapshot_path: Path) -> Dict[str, Any]:
+    """加载契约快照（--json 保存的JSON或 --ndjson 保存的NDJSON）"""
+    if snapshot_path.suffix == '.ndjson':
+        return load_ndjson_contracts(snapshot_path)
+    
+    with open(snapshot_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+_template_expression_pattern = re.compile(r'\$\{[^}]*\}')
+
+
+def _index_contracts(data: Dict[str, Any]) -> Dict[str, Dict[Any, Any]]:
+    """把快照构建为按键散列的索引，每类契约只遍历一次
+    
+    端点按 (api_type, 路径) 索引，路径中的模板表达式 ${...} 归一化，
+    变量改名不视为差异；接口优先使用扁平化模型的属性，属性在继承层级间
+    移动不视为差异。
+    """
+    endpoints = {}
+    for endpoint in data.get('api_endpoints', []):
+        path = _template_expression_pattern.sub('${}', endpoint['path'])
+        endpoints[(endpoint['api_type'], path)] = endpoint
+    
+    models = data.get('flattened_models') or {}
+    interfaces = {}
+    for name, interface in data.get('interfaces', {}).items():
+        properties = models[name]['properties'] if name in models else interface['properties']
+        interfaces[name] = {prop['name']: prop for prop in properties}
     
-    def _find_property_type(self, content: str, prop_name: str) -> str:
-        """查找属性类型"""
-        # 查找属性定义
-        prop_pattern = re.compile(f'{prop_name}\\s*:\\s*([^;\\n]+)')
-        match = prop_pattern.search(content)
+    components = {}
+    for name, props in data.get('component_props', {}).items():
+        components[name] = {
+            'input': {prop['name']: prop for prop in props['inputs']},
+            'output': {prop['name']: prop for prop in props['outputs']}
+        }
+    
+    return {'endpoints': endpoints, 'interfaces': interfaces, 'components': components}
+
+
+def diff_contracts(old_data: Dict[str, Any], new_data: Dict[str, Any]) -> List[ContractChange]:
+    """比较两个契约快照，返回新增/删除/变更条目
+    
+    两侧各构建一次散列索引，之后只做键集合运算和逐键比较，总耗时与契约数量成线性。
+    删除端点、接口、属性或组件输入输出，移除端点方法，以及类型、可选性变化均视为破坏性变更；
+    新增端点、端点方法、接口、组件输入输出和可选属性不是破坏性变更，新增必填属性是。
+    """
+    old_index = _index_contracts(old_data)
+    new_index = _index_contracts(new_data)
+    changes: List[ContractChange] = []
+    
+    # 端点
+    old_endpoints, new_endpoints = old_index['endpoints'], new_index['endpoints']
+    for key, endpoint in old_endpoints.items():
+        label = f"{endpoint['method']} {endpoint['path']} ({key[0]})"
+        current = new_endpoints.get(key)
+        if current is None:
+            changes.append(ContractChange('endpoint', 'removed', label, breaking=True))
+        else:
+            # 方法按集合比较（同一处理函数的方法只是顺序变化不算变更）；移除方法是破坏性变更，新增方法不是
+            old_methods = _method_set(endpoint['method'])
+            new_methods = _method_set(current['method'])
+            removed_methods = sorted(old_methods - new_methods)
+            added_methods = sorted(new_methods - old_methods)
+            if removed_methods:
+                changes.append(ContractChange('endpoint', 'changed', label,
+                                              f"移除方法 {','.join(removed_methods)}", breaking=True))
+            if added_methods:
+                changes.append(ContractChange('endpoint', 'changed', label,
+                                              f"新增方法 {','.join(added_methods)}"))
+    for key, endpoint in new_endpoints.items():
+        if key not in old_endpoints:
+            changes.append(ContractChange('endpoint', 'added', f"{endpoint['method']} {endpoint['path']} ({key[0]})"))
+    
+    # 接口属性
+    old_interfaces, new_interfaces = old_index['interfaces'], new_index['interfaces']
+    for name, old_props in old_interfaces.items():
+        new_props = new_interfaces.get(name)
+        if new_props is None:
+            changes.append(ContractChange('interface', 'removed', name, breaking=True))
+            continue
+        changes.extend(_diff_properties('property', name, old_props, new_props, check_optional=True))
+    for name in new_interfaces:
+        if name not in old_interfaces:
+            changes.append(ContractChange('interface', 'added', name))
+    
+    # 组件输入输出
+    old_components, new_components = old_index['components'], new_index['components']
+    for name, old_component in old_components.items():
+        new_component = new_components.get(name)
+        if new_component is None:
+            for direction in ('input', 'output'):
+                for prop_name in old_component[direction]:
+                    changes.append(ContractChange(direction, 'removed', f"{name}.{prop_name}", breaking=True))
+            continue
+        for direction in ('input', 'output'):
+            changes.extend(_diff_properties(direction, name, old_component[direction], new_component[direction],
+                                            check_optional=False))
+    for name, new_component in new_components.items():
+        if name in old_components:
+            continue
+        for direction in ('input', 'output'):
+            for prop_name in new_component[direction]:
+                changes.append(ContractChange(direction, 'added', f"{name}.{prop_name}"))
+    
+    return changes
+
+
+def _method_set(method: str) -> Set[str]:
+    """端点方法字符串（如 "GET,POST"）转为方法集合"""
+    return {m.strip().upper() for m in method.split(',') if m.strip()}
+
+
+def _diff_properties(category: str, owner: str, old_props: Dict[str, Dict[str, Any]],
+                     new_props: Dict[str, Dict[str, Any]], check_optional: bool) -> List[ContractChange]:
+    """比较同一接口/组件的属性表"""
+    changes: List[ContractChange] = []
+    
+    for prop_name, old_prop in old_props.items():
+        key = f"{owner}.{prop_name}"
+        new_prop = new_props.get(prop_name)
+        if new_prop is None:
+            changes.append(ContractChange(category, 'removed', key, old_prop['type'], breaking=True))
+            continue
+        
+        details = []
+        if old_prop['type'] != new_prop['type']:
+            details.append(f"类型 {old_prop['type']} → {new_prop['type']}")
+        if check_optional and old_prop['optional'] != new_prop['optional']:
+            details.append("可选 → 必填" if old_prop['optional'] else "必填 → 可选")
+        if details:
+            changes.append(ContractChange(category, 'changed', key, '; '.join(details), breaking=True))
+    
+    for prop_name, new_prop in new_props.items():
+        if prop_name in old_props:
+            continue
+        required = check_optional and not new_prop['optional']
+        changes.append(ContractChange(category, 'added', f"{owner}.{prop_name}", new_prop['type'], breaking=required))
+    
+    return changes
+
+
+def generate_diff_report(changes: List[ContractChange], old_metadata: Dict[str, Any],
+                         new_metadata: Dict[str, Any]) -> str:
+    """生成契约快照差异报告"""
+    breaking = [change for change in changes if change.breaking]
+    counts = Counter((change.category, change.change) for change in changes)
+    
+    report = f"""# API契约差异报告
+
+**原快照**: {old_metadata.get('source_path', '')} ({old_metadata.get('extraction_date', '')})  
+**新快照**: {new_metadata.get('source_path', '')} ({new_metadata.get('extraction_date', '')})  
+**差异总数**: {len(changes)}  
+**破坏性变更**: {len(breaking)}
+
+---
+
+## 1. 差异概览
+
+| 类别 | 新增 | 删除 | 变更 |
+|------|------|------|------|
+"""
+    
+    category_names = {
+        'endpoint': 'API端点',
+        'interface': '接口',
+        'property': '接口属性',
+        'input': '组件Input',
+        'output': '组件Output'
+    }
+    for category, category_name in category_names.items():
+        report += (f"| {category_name} | {counts[(category, 'added')]} | "
+                   f"{counts[(category, 'removed')]} | {counts[(category, 'changed')]} |\n")
+    
+    change_names = {'added': '新增', 'removed': '删除', 'changed': '变更'}
+    
+    report += "\n---\n\n## 2. 破坏性变更\n\n"
+    if breaking:
+        report += "| 类别 | 变化 | 对象 | 说明 |\n"
+        report += "|------|------|------|------|\n"
+        for change in breaking:
+            report += (f"| {category_names[change.category]} | {change_names[change.change]} | "
+                       f"{change.key} | {change.detail or '-'} |\n")
+    else:
+        report += "✅ 未发现破坏性变更\n"
+    
+    compatible = [change for change in changes if not change.breaking]
+    report += "\n---\n\n## 3. 兼容性变更\n\n"
+    if compatible:
+        report += "| 类别 | 变化 | 对象 | 说明 |\n"
+        report += "|------|------|------|------|\n"
+        for change in compatible:
+            report += (f"| {category_names[change.category]} | {change_names[change.change]} | "
+                       f"{change.key} | {change.detail or '-'} |\n")
+    else:
+        report += "无\n"
+    
+    return report
+
+
+def generate_flattened_models_section(models: Dict[str, Dict[str, Any]]) -> str:
+    """生成扁平化数据模型章节内容（仅列出有继承或引用其他模型的接口）"""
+    report = ""
+    
+    for model_name, model in models.items():
+        if not (model['extends_chain'] or model['references'] or model['unresolved'] or model['cyclic']):
+            continue
         
-        if match:
-            return match.group(1).strip()
+        report += f"### {model_name}\n\n"
+        report += f"**源文件**: {Path(model['source_file']).name}:{model['line_number']}\n\n"
         
-        return "any"
+        if model['extends_chain']:
+            report += f"**继承链**: {' → '.join([model_name] + model['extends_chain'])}\n\n"
+        if model['cyclic']:
+            report += "**⚠️ 继承链存在循环**\n\n"
+        
+        report += "| 属性名 | 类型 | 可选 | 声明于 |\n"
+        report += "|--------|------|------|--------|\n"
+        
+        for prop in model['properties']:
+            optional_str = "是" if prop['optional'] else "否"
+            report += f"| {prop['name']} | {prop['type']} | {optional_str} | {prop['declared_in']} |\n"
+        
+        report += "\n"
+        
+        if model['references']:
+            references = ', '.join(
+                f"{type_name} ({Path(ref['source_file']).name}:{ref['line_number']})"
+                for type_name, ref in model['references'].items()
+            )
+            report += f"**引用类型**: {references}\n\n"
+        if model['unresolved']:
+            report += f"**未解析类型**: {', '.join(model['unresolved'])}\n\n"
+    
+    return report or "未发现继承或引用其他模型的接口。\n\n"
 
 
 def generate_data_models_report(extracted_data: Dict[str, Any]) -> str:
@@ -447,9 +1875,13 @@ def generate_data_models_report(extracted_data: Dict[str, Any]) -> str:
         
         report += "\n"
     
+    # 添加扁平化模型（继承链展开、引用类型解析）
+    report += "---\n\n## 3. 扁平化数据模型\n\n"
+    report += generate_flattened_models_section(extracted_data.get('flattened_models', {}))
+    
     # 添加组件属性
     if extracted_data['component_props']:
-        report += "---\n\n## 3. 组件属性契约\n\n"
+        report += "---\n\n## 4. 组件属性契约\n\n"
         
         for component_name, props in extracted_data['component_props'].items():
             if props['inputs'] or props['outputs']:
@@ -477,7 +1909,7 @@ def generate_data_models_report(extracted_data: Dict[str, Any]) -> str:
                     
                     report += "\n"
     
-    report += "---\n\n## 4. 重构合规性检查\n\n"
+    report += "---\n\n## 5. 重构合规性检查\n\n"
     report += "### ✅ 数据模型重构合规性要求\n\n"
     report += "- [ ] **接口完整性**: 所有TypeScript接口已提取，确保新前端数据结构完全匹配\n"
     report += "- [ ] **类型一致性**: 所有属性类型必须保持一致，严禁修改或自定义定义\n"
@@ -585,7 +2017,10 @@ def generate_markdown_report(extracted_data: Dict[str, Any]) -> str:
         
         report += "\n"
     
-    report += "---\n\n## 3. 组件属性 (Angular组件契约)\n\n"
+    report += "---\n\n## 3. 扁平化数据模型 (继承与引用解析)\n\n"
+    report += generate_flattened_models_section(extracted_data.get('flattened_models', {}))
+    
+    report += "---\n\n## 4. 组件属性 (Angular组件契约)\n\n"
     
     # 添加组件属性
     for component_name, props in extracted_data['component_props'].items():
@@ -614,7 +2049,7 @@ def generate_markdown_report(extracted_data: Dict[str, Any]) -> str:
                 
                 report += "\n"
     
-    report += "---\n\n## 4. 重构合规性检查\n\n"
+    report += "---\n\n## 5. 重构合规性检查\n\n"
     
     # 生成合规性检查清单
     report += "### ✅ 直接替换重构合规性要求\n\n"
@@ -762,56 +2197,142 @@ def generate_stats_table(stats: dict) -> str:
     return table
 
 
+def run_diff(old_snapshot: Path, extracted_data: Dict[str, Any], output_path: Path,
+             json_output: Optional[str]) -> int:
+    """比较快照并保存差异报告，有破坏性变更时返回2"""
+    old_data = load_contract_snapshot(old_snapshot)
+    changes = diff_contracts(old_data, extracted_data)
+    breaking = sum(1 for change in changes if change.breaking)
+    
+    output_path.write_text(
+        generate_diff_report(changes, old_data.get('metadata', {}), extracted_data.get('metadata', {})),
+        encoding='utf-8'
+    )
+    print(f"✅ 差异报告已保存: {output_path}")
+    
+    # --json 保存新快照，便于下次比较
+    if json_output:
+        with open(json_output, 'w', encoding='utf-8') as f:
+            json.dump(extracted_data, f, ensure_ascii=False, indent=2)
+        print(f"✅ JSON数据已保存: {json_output}")
+    
+    counts = Counter(change.change for change in changes)
+    print(f"\n📊 契约差异:")
+    print(f"   - 新增: {counts['added']}")
+    print(f"   - 删除: {counts['removed']}")
+    print(f"   - 变更: {counts['changed']}")
+    print(f"   - 破坏性变更: {breaking}")
+    
+    if breaking:
+        print(f"❌ 发现 {breaking} 个破坏性契约变更")
+        return 2
+    
+    print("✅ 未发现破坏性契约变更")
+    return 0
+
+
+def render_report(extracted_data: Dict[str, Any], mode: str = 'combined') -> str:
+    """按报告模式生成Markdown报告（extracted_data为 --json 结构，也可来自提取缓存）"""
+    if mode == 'data-models':
+        markdown_report = generate_data_models_report(extracted_data)
+        print(f"✅ 数据模型报告已生成")
+    elif mode == 'apis':
+        markdown_report = generate_apis_report(extracted_data)
+        print(f"✅ API契约报告已生成")
+    elif mode == 'backend-apis':
+        # 过滤出后端API
+        backend_apis = [APIEndpoint(**ep) for ep in extracted_data['api_endpoints'] if ep['api_type'] == 'backend']
+        stats = extracted_data['metadata']
+        markdown_report = generate_backend_apis_report(backend_apis, stats)
+        print(f"✅ Backend API报告已生成")
+    elif mode == 'frontend-apis':
+        # 过滤出前端API
+        frontend_apis = [APIEndpoint(**ep) for ep in extracted_data['api_endpoints'] if ep['api_type'] == 'frontend']
+        stats = extracted_data['metadata']
+        markdown_report = generate_frontend_apis_report(frontend_apis, stats)
+        print(f"✅ Frontend API报告已生成")
+    else:  # combined
+        markdown_report = generate_markdown_report(extracted_data)
+        print(f"✅ 综合API契约报告已生成")
+    
+    return markdown_report
+
+
 def main():
     parser = argparse.ArgumentParser(description='Extract API contracts from frontend codebase')
-    parser.add_argument('--source', required=True, help='Source code path')
+    parser.add_argument('--source', help='Source code path')
     parser.add_argument('--output', help='Output markdown file path (default: api-contracts.md)')
     parser.add_argument('--json', help='Also save JSON data to this file')
+    parser.add_argument('--ndjson', help='Stream extracted records to this NDJSON file as files are processed')
+    parser.add_argument('--from-ndjson', help='Build the report from a previously streamed NDJSON file instead of scanning --source')
+    parser.add_argument('--diff', metavar='OLD_SNAPSHOT',
+                       help='Compare against a previous JSON/NDJSON contract snapshot and write a diff report; '
+                            'exits with code 2 when breaking changes are found')
+    parser.add_argument('--cache', help='Reuse/save the combined extraction result shared with '
+                                        'extract-code-definitions.py in this JSON file (single pass over the tree)')
     parser.add_argument('--mode', choices=['combined', 'data-models', 'apis', 'backend-apis', 'frontend-apis'], default='combined',
                        help='Extraction mode: combined, data-models-only, apis-only, backend-apis-only, or frontend-apis-only')
     
     args = parser.parse_args()
     
-    source_path = Path(args.source)
+    if not args.source and not args.from_ndjson:
+        parser.error('--source is required unless --from-ndjson is given')
+    
+    if args.cache and args.ndjson:
+        parser.error('--cache cannot be combined with --ndjson')
     
     # Default output file name is api-contracts.md for consistency
     if args.output:
         output_path = Path(args.output)
+    elif args.diff:
+        output_path = Path('api-contracts-diff.md')
     else:
         output_path = Path('api-contracts.md')
     
-    if not source_path.exists():
-        print(f"❌ 源路径不存在: {source_path}")
+    if args.diff and not Path(args.diff).exists():
+        print(f"❌ 对比快照不存在: {args.diff}")
         return 1
     
-    # 创建提取器
-    extractor = APIContractExtractor(source_path)
+    if args.source and Path(args.source).is_file() and Path(args.source).suffix in ('.json', '.ndjson'):
+        # --source 指向已保存的快照（用于比较两个快照）
+        extracted_data = load_contract_snapshot(Path(args.source))
+        print(f"✅ 已加载契约快照: {args.source}")
+    elif args.from_ndjson:
+        ndjson_path = Path(args.from_ndjson)
+        if not ndjson_path.exists():
+            print(f"❌ NDJSON文件不存在: {ndjson_path}")
+            return 1
+        
+        extracted_data = load_ndjson_contracts(ndjson_path)
+        print(f"✅ 已从NDJSON加载契约数据: {ndjson_path}")
+    else:
+        source_path = Path(args.source)
+        
+        if not source_path.exists():
+            print(f"❌ 源路径不存在: {source_path}")
+            return 1
+        
+        if args.cache:
+            # 统一提取核心：与代码定义提取共享一次遍历，结果缓存供另一脚本复用
+            extracted_data = ExtractionCore(source_path).load_or_run(Path(args.cache))['api_contracts']
+        elif args.ndjson:
+            # 流式输出，报告数据由NDJSON流重建
+            extractor = APIContractExtractor(source_path)
+            ndjson_path = Path(args.ndjson)
+            record_count = write_ndjson(extractor.iter_records(), ndjson_path)
+            del extractor
+            print(f"✅ NDJSON数据已保存: {ndjson_path} ({record_count} 条记录)")
+            extracted_data = load_ndjson_contracts(ndjson_path)
+        else:
+            # 创建提取器并提取数据
+            extractor = APIContractExtractor(source_path)
+            extracted_data = extractor.extract_all()
     
-    # 提取数据
-    extracted_data = extractor.extract_all()
+    if args.diff:
+        return run_diff(Path(args.diff), extracted_data, output_path, args.json)
     
     # 根据模式生成报告
-    if args.mode == 'data-models':
-        markdown_report = generate_data_models_report(extracted_data)
-        print(f"✅ 数据模型报告已生成")
-    elif args.mode == 'apis':
-        markdown_report = generate_apis_report(extracted_data)
-        print(f"✅ API契约报告已生成")
-    elif args.mode == 'backend-apis':
-        # 过滤出后端API
-        backend_apis = [ep for ep in extractor.api_endpoints if ep.api_type == 'backend']
-        stats = extracted_data['metadata']
-        markdown_report = generate_backend_apis_report(backend_apis, stats)
-        print(f"✅ Backend API报告已生成")
-    elif args.mode == 'frontend-apis':
-        # 过滤出前端API
-        frontend_apis = [ep for ep in extractor.api_endpoints if ep.api_type == 'frontend']
-        stats = extracted_data['metadata']
-        markdown_report = generate_frontend_apis_report(frontend_apis, stats)
-        print(f"✅ Frontend API报告已生成")
-    else:  # combined
-        markdown_report = generate_markdown_report(extracted_data)
-        print(f"✅ 综合API契约报告已生成")
+    markdown_report = render_report(extracted_data, args.mode)
     
     # 保存报告
     output_path.write_text(markdown_report, encoding='utf-8')
@@ -6,11 +6,14 @@
 
 import re
 import json
+import time
 import argparse
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple, Iterator, Sequence
 from dataclasses import dataclass
 
+from contract_extraction_core import ExtractionCore, SourceWalker, load_sibling_script
+
 @dataclass
 class InterfaceDefinition:
     name: str
@@ -20,153 +23,225 @@ class InterfaceDefinition:
     properties: List[Dict[str, str]]
 
 class CodeExtractor:
-    """代码提取器 - 强制从源代码提取接口和数据模型"""
+    """代码提取器 - 强制从源代码提取接口和数据模型
+    
+    接口定义和HTTP调用取自 extract-api-contracts.py 的词法分析结果（FileContext），
+    嵌套对象类型、泛型和继承的接口完整保留；统一提取核心中两者共用同一次解析。
+    """
+    
+    # 组件模式限定在单个声明头部内匹配（不跨越 = ; { } ( ），且只向后看固定长度，
+    # 避免 .*? 配合 DOTALL 从每个 const 扫描到文件末尾造成的二次复杂度
+    component_patterns = [
+        re.compile(r'(?:const|let|function)\s+(\w+)\b[^=;{}()]{0,200}?\b(?:React\.)?(?:FC|FunctionComponent)\b'),
+        re.compile(r'class\s+(\w+)\b[^{};]{0,300}?\bextends\s+(?:React\.)?(Component|PureComponent)\b')
+    ]
+    # 接口声明之前的export修饰符（计入接口定义文本）
+    export_prefix_pattern = re.compile(r'\bexport\s+$')
+    # 词法分析只识别小写的 .get( 等成员调用和 fetch( ；其余写法（大小写不同、不带对象的 get('/x')）
+    # 仍按原正则补充，但只在标识符边界处匹配（不计入 target( 之类的词尾）；
+    # 开头的 (?=[gpdf]) 让其余位置不必检查后向断言
+    http_call_pattern = re.compile(r'(?=[gpdf])(?<![\w$])(?P<name>get|post|put|delete|patch|fetch)'
+                                   r'\s*\(\s*[\'"`](?P<url>[^\'"`]+)[\'"`]', re.IGNORECASE)
+    # HTTP方法名之前的成员访问 . 或 ?.
+    member_prefix_pattern = re.compile(r'\.\s*$')
+    
+    # 单个文件的默认提取时间预算（秒）
+    DEFAULT_FILE_TIME_BUDGET = 5.0
+    
+    # 默认提取的文件（默认跳过的目录见 SourceWalker.DEFAULT_EXCLUDE）
+    DEFAULT_INCLUDE = ('*.ts', '*.js')
     
-    def __init__(self, source_path: Path):
+    def __init__(self, source_path: Path, file_time_budget: float = DEFAULT_FILE_TIME_BUDGET,
+                 include: Optional[Sequence[str]] = None, exclude: Optional[Sequence[str]] = None,
+                 max_depth: Optional[int] = None):
         self.source_path = source_path
-        self.ts_files = list(source_path.rglob("*.ts"))
-        self.js_files = list(source_path.rglob("*.js"))
+        self.file_time_budget = file_time_budget
+        self.walker = SourceWalker(source_path, include or self.DEFAULT_INCLUDE, exclude, max_depth)
         
-    def extract_all_interfaces(self) -> Dict[str, InterfaceDefinition]:
-        """提取所有TypeScript接口定义"""
-        interfaces = {}
+        # 逐文件累积的提取结果
+        self._interfaces: Dict[str, InterfaceDefinition] = {}
+        self._endpoints: List[Dict[str, Any]] = []
+        self._components: Dict[str, Any] = {}
+        
+        # 单遍提取结果缓存，extract_*方法共用
+        self._results = None
+        
+        # 单独运行时解析文件的API契约提取器（首次使用时创建）
+        self._parser = None
+    
+    def extract_all(self) -> Tuple[Dict[str, InterfaceDefinition], List[Dict[str, Any]], Dict[str, Any]]:
+        """单遍提取：每个文件只读取一次，同时产出接口、API端点和组件"""
+        if self._results is not None:
+            return self._results
         
-        for file_path in self.ts_files:
+        for file_path in self.iter_source_files():
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     content = f.read()
-                
-                # 提取接口定义
-                interface_pattern = r'(export\s+)?interface\s+(\w+)\s*\{([^}]*)\}'
-                matches = re.finditer(interface_pattern, content, re.MULTILINE | re.DOTALL)
-                
-                for match in matches:
-                    interface_name = match.group(2)
-                    interface_body = match.group(3)
-                    
-                    # 解析属性
-                    properties = self._parse_properties(interface_body)
-                    
-                    interfaces[interface_name] = InterfaceDefinition(
-                        name=interface_name,
-                        file_path=str(file_path),
-                        line_number=self._get_line_number(content, match.start()),
-                        definition=match.group(0),
-                        properties=properties
-                    )
-                    
             except Exception as e:
                 print(f"Warning: Failed to parse {file_path}: {e}")
-                
-        return interfaces
+                continue
+            
+            self.process_file(file_path, content)
+        
+        self._results = (self._interfaces, self._endpoints, self._components)
+        return self._results
+    
+    def process_file(self, file_path: Path, content: str, parsed: Optional[Any] = None):
+        """提取单个文件（内容由调用方读取，统一提取核心据此与API契约提取共享同一次读取）
+        
+        parsed为API契约提取对同一内容的解析结果（FileContext），统一提取核心传入后不再重复解析。
+        时间预算在各阶段之间以及端点、组件的逐个匹配中检查，超出时跳过该文件其余的匹配和阶段
+        （词法解析本身不会被中断）。
+        """
+        try:
+            if parsed is None and self._parser is None:
+                # 首次解析前加载API契约提取脚本，加载时间不计入文件的时间预算
+                self._parser = load_sibling_script('extract-api-contracts.py').APIContractExtractor(self.source_path)
+            
+            deadline = time.perf_counter() + self.file_time_budget
+            if parsed is None:
+                parsed = self._parse(file_path, content)
+                if parsed is None:
+                    return
+            
+            # 本文件的接口属性（接口名 -> 属性列表），组件Props直接复用
+            local_interfaces = self._extract_interfaces(parsed, file_path,
+                                                        self._interfaces if file_path.suffix in ('.ts', '.tsx') else None)
+            if self._over_budget(file_path, deadline, "endpoints, components"):
+                return
+            if not self._extract_endpoints(parsed, file_path, self._endpoints, deadline):
+                return
+            self._extract_components(parsed, file_path, local_interfaces, self._components, deadline)
+            
+        except Exception as e:
+            print(f"Warning: Failed to parse {file_path}: {e}")
+    
+    def _parse(self, file_path: Path, content: str) -> Optional[Any]:
+        """单独运行时用API契约提取器的词法分析解析文件，返回FileContext（出错时为None）
+        
+        parse_file只产出本文件的类型声明和HTTP调用，不在解析器中累积端点、接口和符号索引。
+        """
+        return self._parser.parse_file(file_path, content)
+    
+    def iter_source_files(self) -> Iterator[Path]:
+        """惰性遍历待提取的源文件（include/exclude/max_depth见 SourceWalker）"""
+        return iter(self.walker)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """已提取结果的JSON结构（即 --format json 的输出），单独使用时先调用extract_all()"""
+        return {
+            "interfaces": {name: {
+                "file_path": iface.file_path,
+                "line_number": iface.line_number,
+                "definition": iface.definition,
+                "properties": iface.properties
+            } for name, iface in self._interfaces.items()},
+            "endpoints": self._endpoints,
+            "components": self._components
+        }
+    
+    def _over_budget(self, file_path: Path, deadline: float, skipped: Optional[str] = None) -> bool:
+        """单个文件超出时间预算时给出警告，由调用方跳过该文件剩余的提取阶段"""
+        if time.perf_counter() <= deadline:
+            return False
+        message = f"Warning: {file_path} exceeded the {self.file_time_budget:g}s extraction budget"
+        if skipped:
+            message += f" (skipped: {skipped})"
+        print(message)
+        return True
+    
+    def extract_all_interfaces(self) -> Dict[str, InterfaceDefinition]:
+        """提取所有TypeScript接口定义"""
+        return self.extract_all()[0]
     
     def extract_api_endpoints(self) -> List[Dict[str, Any]]:
         """提取API端点定义"""
-        endpoints = []
-        
-        for file_path in self.ts_files + self.js_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # 提取HTTP方法调用
-                http_patterns = [
-                    r'(get|post|put|delete|patch)\s*\(\s*[\'"`]([^\'"`]+)[\'"`]',
-                    r'\.(get|post|put|delete|patch)\s*\(\s*[\'"`]([^\'"`]+)[\'"`]',
-                    r'fetch\s*\(\s*[\'"`]([^\'"`]+)[\'"`]'
-                ]
-                
-                for pattern in http_patterns:
-                    matches = re.finditer(pattern, content, re.IGNORECASE)
-                    for match in matches:
-                        if len(match.groups()) == 2:
-                            method, url = match.groups()
-                        else:
-                            url = match.group(1)
-                            method = "GET"
-                        
-                        endpoints.append({
-                            "method": method.upper(),
-                            "url": url,
-                            "file_path": str(file_path),
-                            "line_number": self._get_line_number(content, match.start())
-                        })
-                        
-            except Exception as e:
-                print(f"Warning: Failed to parse {file_path}: {e}")
-                
-        return endpoints
+        return self.extract_all()[1]
     
     def extract_component_props(self) -> Dict[str, Any]:
         """提取React组件属性"""
-        components = {}
-        
-        for file_path in self.ts_files + self.js_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # 提取React组件
-                component_patterns = [
-                    r'(?:export\s+)?(?:const|function)\s+(\w+).*?(?:React\.)?(?:FC|FunctionComponent)',
-                    r'class\s+(\w+).*(?:extends\s+React\.)?(Component|PureComponent)'
-                ]
-                
-                for pattern in component_patterns:
-                    matches = re.finditer(pattern, content, re.MULTILINE | re.DOTALL)
-                    for match in matches:
-                        component_name = match.group(1)
-                        
-                        # 提取props接口
-                        props_pattern = r'interface\s+' + component_name + 'Props\s*\{([^}]*)\}'
-                        props_match = re.search(props_pattern, content, re.MULTILINE | re.DOTALL)
-                        
-                        props = []
-                        if props_match:
-                            props = self._parse_properties(props_match.group(1))
-                        
-                        components[component_name] = {
-                            "file_path": str(file_path),
-                            "line_number": self._get_line_number(content, match.start()),
-                            "props": props
-                        }
-                        
-            except Exception as e:
-                print(f"Warning: Failed to parse {file_path}: {e}")
-                
-        return components
+        return self.extract_all()[2]
     
-    def _parse_properties(self, interface_body: str) -> List[Dict[str, str]]:
-        """解析接口属性"""
-        properties = []
+    def _extract_interfaces(self, parsed: Any, file_path: Path,
+                            interfaces: Optional[Dict[str, InterfaceDefinition]]) -> Dict[str, List[Dict[str, str]]]:
+        """登记单个文件中的接口定义，返回本文件首次出现的各接口属性
         
-        # 移除注释
-        interface_body = re.sub(r'//.*$', '', interface_body, flags=re.MULTILINE)
-        interface_body = re.sub(r'/\*.*?\*/', '', interface_body, flags=re.DOTALL)
+        interfaces为None时（JavaScript文件）只收集接口属性，不登记接口定义。
+        """
+        local_interfaces: Dict[str, List[Dict[str, str]]] = {}
         
-        # 分割属性定义
-        lines = [line.strip() for line in interface_body.split('\n') if line.strip()]
+        for keyword, start, end, declaration in parsed.declarations:
+            if keyword != 'interface':
+                continue
+            
+            properties = [{"name": prop.name, "type": prop.type} for prop in declaration.properties]
+            local_interfaces.setdefault(declaration.name, properties)
+            
+            if interfaces is None:
+                continue
+            
+            export_match = self.export_prefix_pattern.search(parsed.content, max(0, start - 32), start)
+            if export_match:
+                start = export_match.start()
+            
+            interfaces[declaration.name] = InterfaceDefinition(
+                name=declaration.name,
+                file_path=str(file_path),
+                line_number=declaration.line_number,
+                definition=parsed.content[start:end],
+                properties=properties
+            )
         
-        for line in lines:
-            # 匹配属性定义
-            prop_pattern = r'(\w+)\s*:\s*([^;]+)'
-            prop_match = re.match(prop_pattern, line)
-            if prop_match:
-                prop_name = prop_match.group(1)
-                prop_type = prop_match.group(2).strip()
-                
-                properties.append({
-                    "name": prop_name,
-                    "type": prop_type
-                })
-                
-        return properties
+        return local_interfaces
     
-    def _get_line_number(self, content: str, position: int) -> int:
-        """获取指定位置在文本中的行号"""
-        return content[:position].count('\n') + 1
+    def _extract_endpoints(self, parsed: Any, file_path: Path, endpoints: List[Dict[str, Any]],
+                           deadline: float) -> bool:
+        """登记单个文件中的HTTP方法调用和fetch调用（按出现位置排序）
+        
+        补充匹配中超出时间预算时不登记本文件的端点，返回False。
+        """
+        calls = list(parsed.http_calls)
+        for match in self.http_call_pattern.finditer(parsed.content):
+            if self._over_budget(file_path, deadline, "endpoints, components"):
+                return False
+            name = match.group('name')
+            if name.islower() and (name == 'fetch' or self.member_prefix_pattern.search(
+                    parsed.content, max(0, match.start() - 32), match.start())):
+                # 已由词法分析识别
+                continue
+            method = "GET" if name.lower() == 'fetch' else name.upper()
+            calls.append((method, match.group('url'), match.start()))
+        if len(calls) > len(parsed.http_calls):
+            calls.sort(key=lambda call: call[2])
+        
+        for method, url, position in calls:
+            endpoints.append({
+                "method": method,
+                "url": url,
+                "file_path": str(file_path),
+                "line_number": parsed.line_number(position)
+            })
+        return True
+    
+    def _extract_components(self, parsed: Any, file_path: Path,
+                            local_interfaces: Dict[str, List[Dict[str, str]]], components: Dict[str, Any],
+                            deadline: float):
+        """提取单个文件中的React组件，Props取自同一文件的 <组件名>Props 接口（超出时间预算时停止）"""
+        for pattern in self.component_patterns:
+            for match in pattern.finditer(parsed.content):
+                if self._over_budget(file_path, deadline, "remaining components"):
+                    return
+                component_name = match.group(1)
+                
+                components[component_name] = {
+                    "file_path": str(file_path),
+                    "line_number": parsed.line_number(match.start()),
+                    "props": local_interfaces.get(component_name + 'Props', [])
+                }
     
-    def generate_interface_documentation(self, interfaces: Dict[str, InterfaceDefinition]) -> str:
+    @staticmethod
+    def generate_interface_documentation(interfaces: Dict[str, InterfaceDefinition]) -> str:
         """生成接口文档"""
         doc = "## Extracted Interfaces (MANDATORY - DO NOT MODIFY)\n\n"
         doc += "> 警告：以下接口定义从源代码自动提取，任何手动修改都将导致验证失败\n\n"
@@ -185,7 +260,8 @@ class CodeExtractor:
         
         return doc
     
-    def generate_api_documentation(self, endpoints: List[Dict[str, Any]]) -> str:
+    @staticmethod
+    def generate_api_documentation(endpoints: List[Dict[str, Any]]) -> str:
         """生成API文档"""
         doc = "## Extracted API Endpoints (MANDATORY - DO NOT MODIFY)\n\n"
         doc += "> 警告：以下API端点从源代码自动提取，任何手动修改都将导致验证失败\n\n"
@@ -206,63 +282,84 @@ class CodeExtractor:
         
         return doc
 
+def write_output(data: Dict[str, Any], output_path: Path, output_format: str):
+    """按指定格式写出提取结果（data为 CodeExtractor.to_dict() 的结构，也可来自提取缓存）"""
+    if output_format == 'json':
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        return
+    
+    interfaces = {name: InterfaceDefinition(name=name, **info) for name, info in data['interfaces'].items()}
+    components = data['components']
+    
+    # Markdown格式
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write("# Code Extraction Results\n\n")
+        f.write(CodeExtractor.generate_interface_documentation(interfaces))
+        f.write(CodeExtractor.generate_api_documentation(data['endpoints']))
+        
+        if components:
+            f.write("## Extracted Components\n\n")
+            for comp_name, comp_info in components.items():
+                f.write(f"### {comp_name} (Source: {comp_info['file_path']}:{comp_info['line_number']})\n")
+                if comp_info['props']:
+                    f.write("**Props:**\n")
+                    for prop in comp_info['props']:
+                        f.write(f"- `{prop['name']}`: {prop['type']}\n")
+                f.write("\n")
+
 def main():
     parser = argparse.ArgumentParser(description='Extract interfaces and APIs from source code')
     parser.add_argument('--source', required=True, help='Source code path')
     parser.add_argument('--output', required=True, help='Output file path')
     parser.add_argument('--format', choices=['json', 'markdown'], default='markdown', help='Output format')
+    parser.add_argument('--file-time-budget', type=float, default=CodeExtractor.DEFAULT_FILE_TIME_BUDGET,
+                        help='Per-file extraction time budget in seconds (slow files are reported and cut short)')
+    parser.add_argument('--include', action='append', metavar='GLOB',
+                        help='File name pattern to extract (repeatable, default: *.ts and *.js)')
+    parser.add_argument('--exclude', action='append', metavar='GLOB',
+                        help='Directory or file name/relative path to skip (repeatable, added to the default '
+                             'node_modules/build output exclusions)')
+    parser.add_argument('--no-default-excludes', action='store_true',
+                        help='Do not skip node_modules, dist, build and other default directories')
+    parser.add_argument('--max-depth', type=int, help='Maximum directory depth to descend below --source')
+    parser.add_argument('--cache', help='Reuse/save the combined extraction result shared with '
+                                        'extract-api-contracts.py in this JSON file (single pass over the tree)')
     
     args = parser.parse_args()
     
+    if args.cache and args.include:
+        parser.error('--include cannot be combined with --cache')
+    
     source_path = Path(args.source)
     if not source_path.exists():
         print(f"Error: Source path {source_path} does not exist")
         return 1
     
-    extractor = CodeExtractor(source_path)
+    exclude = [] if args.no_default_excludes else list(SourceWalker.DEFAULT_EXCLUDE)
+    exclude.extend(args.exclude or [])
     
-    # 提取所有内容
-    interfaces = extractor.extract_all_interfaces()
-    endpoints = extractor.extract_api_endpoints()
-    components = extractor.extract_component_props()
-    
-    if args.format == 'json':
-        output_data = {
-            "interfaces": {name: {
-                "file_path": iface.file_path,
-                "line_number": iface.line_number,
-                "definition": iface.definition,
-                "properties": iface.properties
-            } for name, iface in interfaces.items()},
-            "endpoints": endpoints,
-            "components": components
-        }
-        
-        with open(args.output, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+    if args.cache:
+        # 统一提取核心：与API契约提取共享一次遍历，结果缓存供另一脚本复用
+        core = ExtractionCore(source_path, exclude=exclude, max_depth=args.max_depth,
+                              file_time_budget=args.file_time_budget)
+        data = core.load_or_run(Path(args.cache))['code_definitions']
     else:
-        # Markdown格式
-        with open(args.output, 'w', encoding='utf-8') as f:
-            f.write("# Code Extraction Results\n\n")
-            f.write(extractor.generate_interface_documentation(interfaces))
-            f.write(extractor.generate_api_documentation(endpoints))
-            
-            if components:
-                f.write("## Extracted Components\n\n")
-                for comp_name, comp_info in components.items():
-                    f.write(f"### {comp_name} (Source: {comp_info['file_path']}:{comp_info['line_number']})\n")
-                    if comp_info['props']:
-                        f.write("**Props:**\n")
-                        for prop in comp_info['props']:
-                            f.write(f"- `{prop['name']}`: {prop['type']}\n")
-                    f.write("\n")
+        extractor = CodeExtractor(source_path, file_time_budget=args.file_time_budget,
+                                  include=args.include, exclude=exclude, max_depth=args.max_depth)
+        
+        # 单遍提取所有内容（每个文件只读取一次）
+        extractor.extract_all()
+        data = extractor.to_dict()
+    
+    write_output(data, Path(args.output), args.format)
     
     print(f"✅ Code extraction completed: {args.output}")
-    print(f"   Interfaces: {len(interfaces)}")
-    print(f"   API Endpoints: {len(endpoints)}")
-    print(f"   Components: {len(components)}")
+    print(f"   Interfaces: {len(data['interfaces'])}")
+    print(f"   API Endpoints: {len(data['endpoints'])}")
+    print(f"   Components: {len(data['components'])}")
     
     return 0
 
 if __name__ == "__main__":
-    exit(main())
\ No newline at end of file
+    exit(main())
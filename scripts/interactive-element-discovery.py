@@ -9,30 +9,46 @@ Usage:
     python3 scripts/interactive-element-discovery.py --source <source_path> [--output <output_file>]
     python3 scripts/interactive-element-discovery.py --source /path/to/angular/project --output interactive-elements.json
     python3 scripts/interactive-element-discovery.py --source /path/to/angular/project  # interactive mode
+    python3 scripts/interactive-element-discovery.py --source /path/to/angular/project --exclude 'src/generated/*'
+    python3 scripts/interactive-element-discovery.py --source /path/to/angular/project --output interactive-elements.json \
+        --jobs 0 --cache .specify/cache/interactive-elements-cache.json
 
 The script creates a structured inventory of interactive elements that AI can use
 to create comprehensive app flow documentation.
 """
 
 import argparse
+import hashlib
 import json
+import os
 import re
+import sys
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, TextIO, Tuple
+from dataclasses import dataclass, fields
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
+from contract_extraction_core import SourceWalker
 
-@dataclass
+
+@dataclass(slots=True)
+class FileContext:
+    """File-wide context shared by all elements found in one source file"""
+    file_path: str
+    event_handlers: List[str]
+    data_flow: List[str]
+
+
+@dataclass(slots=True)
 class InteractiveElement:
-    """Interactive element definition"""
+    """Interactive element definition (its id is its index in the discovery's element table)"""
     element_type: str  # "button", "menu", "link", "form", "dialog", "media_control", etc.
     element_name: str
     location: str  # "file_path:line_number"
     component_name: str
-    event_handlers: List[str]
-    data_flow: List[str]
+    context_id: int  # index into the discovery's file_contexts table
     user_action: str
     system_response: str
     importance: str  # "P0", "P1", "P2"
@@ -51,16 +67,108 @@ class ComponentFlow:
     external_dependencies: List[str]
 
 
+ELEMENT_FIELDS = tuple(f.name for f in fields(InteractiveElement))
+# Per-file analysis rows (cache entries, worker results) omit context_id, which is assigned on merge
+ELEMENT_ROW_FIELDS = tuple(name for name in ELEMENT_FIELDS if name != 'context_id')
+FILE_CONTEXT_FIELDS = tuple(f.name for f in fields(FileContext))
+
+
+class TemplateTagScanner:
+    """Streaming tokenizer pass over an HTML template
+    
+    One regex traversal yields every start tag (comments are skipped, quoted attribute
+    values may contain '>' or newlines), and each tag is classified from its name and
+    attributes, so tags spanning several lines are handled like single-line ones.
+    Events are (element_type, line_number, start_tag_text) in document order.
+    """
+    
+    TOKEN_PATTERN = re.compile(r'<!--.*?-->|<([a-zA-Z][^\s/>]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>', re.DOTALL)
+    ATTR_PATTERN = re.compile(r'([^\s/>"\'=]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+    
+    FORM_INPUT_TAGS = ('input', 'select', 'textarea')
+    MEDIA_TAGS = ('video', 'audio')
+    
+    @classmethod
+    def scan(cls, template_content: str) -> List[Tuple[str, int, str]]:
+        """Tokenize a template once and return its interactive tag events"""
+        events = []
+        line_number = 1
+        position = 0
+        
+        for token in cls.TOKEN_PATTERN.finditer(template_content):
+            tag = token.group(1)
+            if tag is None:
+                continue
+            
+            element_types = cls._classify(tag.lower(), token.group(2))
+            if element_types:
+                line_number += template_content.count('\n', position, token.start())
+                position = token.start()
+                tag_text = token.group()
+                for element_type in element_types:
+                    events.append((element_type, line_number, tag_text))
+        
+        return events
+    
+    @classmethod
+    def _classify(cls, tag: str, attr_text: str) -> List[str]:
+        """Element types of one start tag (attribute names are matched case-insensitively)"""
+        attr_names = []
+        classes = role = ''
+        for attr in cls.ATTR_PATTERN.finditer(attr_text):
+            name = attr.group(1).lower()
+            attr_names.append(name)
+            if name == 'class' or name == 'role':
+                value = (attr.group(2) or attr.group(3) or attr.group(4) or '').lower()
+                if name == 'class':
+                    classes = value
+                else:
+                    role = value
+        
+        # (click), [routerlink], mat-button, #ref ... plus the tag name and CSS classes
+        names = ' '.join([tag] + attr_names)
+        keywords = f"{names} {classes}"
+        
+        element_types = []
+        if 'button' in names or role == 'button':
+            element_types.append("button")
+        if tag == 'a' and ('routerlink' in names or '(click)' in names):
+            element_types.append("navigation_link")
+        if 'menu' in keywords or 'dropdown' in keywords:
+            element_types.append("menu_item")
+        if tag in cls.MEDIA_TAGS or 'media' in keywords or 'player' in keywords:
+            element_types.append("media_control")
+        if tag in cls.FORM_INPUT_TAGS:
+            element_types.append("form_input")
+        
+        return element_types
+
+
 class InteractiveElementDiscovery:
     """Interactive element discovery tool for refactoring analysis"""
     
-    def __init__(self, source_path: Path):
+    # Files analyzed (vendor/build directories are pruned, see SourceWalker.DEFAULT_EXCLUDE)
+    SOURCE_INCLUDE = ('*.ts', '*.js')
+    COMPONENT_SUFFIXES = ('.component.ts', '.component.js')
+    
+    # Bump when analysis rules change so cached per-file results are discarded
+    CACHE_VERSION = 1
+    # Upper bound of files per process-pool task
+    MAX_CHUNK_SIZE = 64
+    
+    def __init__(self, source_path: Path, exclude: Optional[List[str]] = None):
         self.source_path = source_path
         self.components = {}
-        self.interactive_elements = []
+        self.interactive_elements: List[InteractiveElement] = []
+        self.file_contexts: List[FileContext] = []
         self.patterns = self._load_patterns()
+        self.exclude = exclude
+        self.walker = SourceWalker(source_path, self.SOURCE_INCLUDE, exclude)
+        self.file_counts = {"component_files": 0, "other_files": 0}
+        # Parsed templateUrl files (resolved path -> tag events), shared by components using the same template
+        self._template_cache: Dict[Path, List[Tuple[str, int, str]]] = {}
     
-    def _load_patterns(self) -> Dict[str, re.Pattern]:
+    def _load_patterns(self) -> Dict[str, Any]:
         """Load detection patterns for different frameworks"""
         return {
             # Event handler patterns
@@ -83,25 +191,97 @@ class InteractiveElementDiscovery:
             'service_calls': re.compile(r'\.subscribe\(|\.toPromise\(\)|\.get\(|\.post\(|\.put\(|\.delete\('),
             'method_calls': re.compile(r'(\w+)\.\w+\('),
             'property_access': re.compile(r'(\w+)\.\w+'),
+            
+            # Event binding patterns (handler extraction)
+            'event_bindings': [
+                re.compile(r'\((click)\)\s*=\s*"([^"]*)"'),
+                re.compile(r'\@(click)\s*=\s*"([^"]*)"'),
+                re.compile(r'addEventListener\([\'"](click)[\'"]'),
+                re.compile(r'onClick\s*=\s*[\'"]([^\'"]*)[\'"]'),
+            ],
+            
+            # Service calls and data manipulations (data flow extraction)
+            'data_flow': [
+                re.compile(r'(\w+)\.subscribe\('),
+                re.compile(r'this\.(\w+)\s*='),
+                re.compile(r'(\w+)\.emit\('),
+                re.compile(r'(\w+)\.next\('),
+            ],
         }
     
-    def discover_interactive_elements(self) -> List[InteractiveElement]:
-        """Discover all interactive elements in the codebase"""
+    def discover_interactive_elements(self, jobs: int = 1, cache_path: Optional[Path] = None) -> List[InteractiveElement]:
+        """Discover all interactive elements in the codebase
+        
+        With cache_path, per-file results are reused while the hashes of the file and of its
+        resolved templateUrl are unchanged; only new or changed files are analyzed (on a
+        process pool when jobs > 1). The cache only skips analysis: the element and file-context
+        tables are always rebuilt in full from every file's analysis, in walk order.
+        """
         print(f"[Discovery] Analyzing interactive elements in {self.source_path}")
         
-        # Find all TypeScript/JavaScript component files
-        component_files = list(self.source_path.rglob("*.component.ts"))
-        component_files.extend(self.source_path.rglob("*.component.js"))
-        component_files.extend(self.source_path.rglob("*.ts"))
-        component_files.extend(self.source_path.rglob("*.js"))
-        
-        for file_path in component_files:
-            self._analyze_component_file(file_path)
+        cached_entries = self._load_cache(cache_path) if cache_path else {}
+        cache_entries = {}
+        analyses: List[Optional[list]] = []
+        pending = []  # (analysis index, file path, relative path, cache key)
+        
+        # One walk over TypeScript/JavaScript files; each file is analyzed exactly once
+        for file_path in self.walker:
+            if file_path.name.endswith(self.COMPONENT_SUFFIXES):
+                self.file_counts["component_files"] += 1
+            else:
+                self.file_counts["other_files"] += 1
+            
+            relative_path = file_path.relative_to(self.source_path).as_posix()
+            cache_key = self._file_cache_key(file_path) if cache_path else None
+            entry = cached_entries.get(relative_path)
+            if cache_key is not None and entry is not None and entry["key"] == cache_key:
+                analyses.append(entry["analysis"])
+                cache_entries[relative_path] = entry
+            else:
+                analyses.append(None)
+                pending.append((len(analyses) - 1, file_path, relative_path, cache_key))
+        
+        if cache_path:
+            print(f"[Discovery] Reusing {len(analyses) - len(pending)} cached files, analyzing {len(pending)}")
+        
+        changed = self._analyze_files([file_path for _, file_path, _, _ in pending], jobs)
+        for (index, _, relative_path, cache_key), analysis in zip(pending, changed):
+            analyses[index] = analysis
+            if cache_key is not None:
+                cache_entries[relative_path] = {"key": cache_key, "analysis": analysis}
+        
+        for analysis in analyses:
+            if analysis:
+                self._merge_analysis(analysis)
+        
+        if cache_path:
+            self._write_cache(cache_path, cache_entries)
         
         return self.interactive_elements
     
-    def _analyze_component_file(self, file_path: Path):
-        """Analyze a single component file for interactive elements"""
+    def _analyze_files(self, file_paths: List[Path], jobs: int) -> List[Optional[list]]:
+        """Analyze files in order, on a process pool when jobs > 1"""
+        if jobs <= 1 or len(file_paths) < 2:
+            return [self.analyze_file(file_path) for file_path in file_paths]
+        
+        chunk_size = max(1, min(self.MAX_CHUNK_SIZE, len(file_paths) // (jobs * 4)))
+        chunks = [[str(path) for path in file_paths[i:i + chunk_size]]
+                  for i in range(0, len(file_paths), chunk_size)]
+        
+        analyses = []
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(str(self.source_path), self.exclude)) as executor:
+            for chunk_analyses in executor.map(_analyze_files_chunk, chunks):
+                analyses.extend(chunk_analyses)
+        return analyses
+    
+    def analyze_file(self, file_path: Path) -> Optional[list]:
+        """Analyze a single component file for interactive elements
+        
+        Returns [file path, element rows (ELEMENT_ROW_FIELDS order), event handlers, data flow], or None
+        when the file has no elements or cannot be analyzed. The plain-list form is what the
+        cache stores and what pool workers send back.
+        """
         try:
             content = file_path.read_text(encoding='utf-8')
             lines = content.split('\n')
@@ -111,16 +291,61 @@ class InteractiveElementDiscovery:
             
             # Find all interactive elements
             elements = self._find_interactive_elements(content, lines, file_path, component_name)
+            if not elements:
+                return None
             
-            # Analyze event handlers
-            for element in elements:
-                element.event_handlers = self._extract_event_handlers(content, element.location)
-                element.data_flow = self._extract_data_flow(content, element.location)
-            
-            self.interactive_elements.extend(elements)
+            # Event handlers and data flow are file-wide: extract them once per file
+            rows = [[getattr(element, name) for name in ELEMENT_ROW_FIELDS] for element in elements]
+            return [str(file_path), rows, self._extract_event_handlers(content), self._extract_data_flow(content)]
             
         except Exception as e:
             print(f"[Warning] Could not analyze {file_path}: {e}")
+            return None
+    
+    def _merge_analysis(self, analysis: list):
+        """Append one file's analysis: a shared context record plus elements referencing it"""
+        file_path, rows, event_handlers, data_flow = analysis
+        context_id = len(self.file_contexts)
+        self.file_contexts.append(FileContext(
+            file_path=file_path,
+            event_handlers=event_handlers,
+            data_flow=data_flow
+        ))
+        for row in rows:
+            self.interactive_elements.append(InteractiveElement(context_id=context_id, **dict(zip(ELEMENT_ROW_FIELDS, row))))
+    
+    def _file_cache_key(self, file_path: Path) -> Optional[List[Optional[str]]]:
+        """[source hash, resolved template hash or None]; None when the file cannot be read"""
+        try:
+            source = file_path.read_bytes()
+            template_path = self._resolve_template_url(source.decode('utf-8'), file_path)
+            template_hash = hashlib.sha1(template_path.read_bytes()).hexdigest() if template_path else None
+        except (OSError, UnicodeDecodeError):
+            return None
+        return [hashlib.sha1(source).hexdigest(), template_hash]
+    
+    def _load_cache(self, cache_path: Path) -> Dict[str, Any]:
+        """Per-file cache entries keyed by path relative to the source root ({} when unusable)"""
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if cached.get('version') != self.CACHE_VERSION or cached.get('source_path') != str(self.source_path):
+            return {}
+        return cached.get('files', {})
+    
+    def _write_cache(self, cache_path: Path, entries: Dict[str, Any]):
+        """Write the cache to a temporary file and atomically replace the old one"""
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({
+                'version': self.CACHE_VERSION,
+                'source_path': str(self.source_path),
+                'files': entries
+            }, ensure_ascii=False))
+        os.replace(temp_path, cache_path)
     
     def _extract_component_name(self, content: str, filename: str) -> str:
         """Extract component name from file content or filename"""
@@ -135,80 +360,67 @@ class InteractiveElementDiscovery:
             return class_match.group(1)
         
         # Fallback to filename
-        return filename.replace('.component.ts', '').replace('.ts', '')
+        for suffix in self.COMPONENT_SUFFIXES + ('.ts', '.js'):
+            if filename.endswith(suffix):
+                return filename[:-len(suffix)]
+        return filename
     
     def _find_interactive_elements(self, content: str, lines: List[str], file_path: Path, component_name: str) -> List[InteractiveElement]:
         """Find interactive elements in component content"""
         elements = []
         
         # Template-based elements (check HTML template)
-        template_content = self._extract_template_content(content)
-        if template_content:
-            elements.extend(self._analyze_template_elements(template_content, lines, file_path, component_name))
+        template = self._extract_template_content(content, file_path)
+        if template:
+            template_path, line_offset, template_events = template
+            elements.extend(self._analyze_template_elements(template_events, template_path, line_offset, component_name))
         
         # Code-based elements (check TypeScript code)
         elements.extend(self._analyze_code_elements(content, lines, file_path, component_name))
         
         return elements
     
-    def _extract_template_content(self, content: str) -> str:
-        """Extract HTML template content from component"""
-        # Look for templateUrl
-        template_url_match = re.search(r'templateUrl\s*:\s*["\']([^"\']+)["\']', content)
-        if template_url_match:
-            template_path = self.source_path / template_url_match.group(1)
-            if template_path.exists():
-                return template_path.read_text(encoding='utf-8')
+    def _extract_template_content(self, content: str, file_path: Path) -> Optional[Tuple[Path, int, List[Tuple[str, int, str]]]]:
+        """Locate and tokenize the component template
         
-        # Look for inline template
-        template_match = re.search(r'template\s*:\s*["\']`([^`]+)`["\']', content)
+        Returns (path used in element locations, line offset within that file, tag events),
+        or None when the component has no template.
+        """
+        # Look for templateUrl
+        template_path = self._resolve_template_url(content, file_path)
+        if template_path:
+            cache_key = template_path.resolve()
+            events = self._template_cache.get(cache_key)
+            if events is None:
+                events = TemplateTagScanner.scan(template_path.read_text(encoding='utf-8'))
+                self._template_cache[cache_key] = events
+            return template_path, 0, events
+        
+        # Look for inline template (template: `...`)
+        template_match = re.search(r'template\s*:\s*["\']?`([^`]+)`', content)
         if template_match:
-            return template_match.group(1)
+            line_offset = content.count('\n', 0, template_match.start(1))
+            return file_path, line_offset, TemplateTagScanner.scan(template_match.group(1))
         
-        return ""
+        return None
     
-    def _analyze_template_elements(self, template_content: str, lines: List[str], file_path: Path, component_name: str) -> List[InteractiveElement]:
-        """Analyze HTML template for interactive elements"""
-        elements = []
-        
-        # Find all interactive elements in template
-        for i, line in enumerate(template_content.split('\n')):
-            # Buttons
-            if re.search(self.patterns['buttons'], line, re.IGNORECASE):
-                element = self._create_template_element(
-                    "button", line, f"{file_path}:{i+1}", component_name
-                )
-                elements.append(element)
-            
-            # Links with navigation
-            if re.search(r'<a[^>]*routerLink|<a[^>]*\(click\)', line, re.IGNORECASE):
-                element = self._create_template_element(
-                    "navigation_link", line, f"{file_path}:{i+1}", component_name
-                )
-                elements.append(element)
-            
-            # Menu items
-            if re.search(self.patterns['menus'], line, re.IGNORECASE):
-                element = self._create_template_element(
-                    "menu_item", line, f"{file_path}:{i+1}", component_name
-                )
-                elements.append(element)
-            
-            # Media controls
-            if re.search(self.patterns['media_elements'], line, re.IGNORECASE):
-                element = self._create_template_element(
-                    "media_control", line, f"{file_path}:{i+1}", component_name
-                )
-                elements.append(element)
-            
-            # Form inputs
-            if re.search(r'<input[^>]*|<select[^>]*|<textarea[^>]*', line, re.IGNORECASE):
-                element = self._create_template_element(
-                    "form_input", line, f"{file_path}:{i+1}", component_name
-                )
-                elements.append(element)
-        
-        return elements
+    def _resolve_template_url(self, content: str, file_path: Path) -> Optional[Path]:
+        """Existing templateUrl file, relative to the component's directory (source root as fallback)"""
+        template_url_match = re.search(r'templateUrl\s*:\s*["\']([^"\']+)["\']', content)
+        if template_url_match:
+            template_url = template_url_match.group(1)
+            for template_path in (Path(os.path.normpath(file_path.parent / template_url)), self.source_path / template_url):
+                if template_path.is_file():
+                    return template_path
+        return None
+    
+    def _analyze_template_elements(self, template_events: List[Tuple[str, int, str]], template_path: Path,
+                                   line_offset: int, component_name: str) -> List[InteractiveElement]:
+        """Create interactive elements from the template's tag events"""
+        return [
+            self._create_template_element(element_type, tag_text, f"{template_path}:{line_offset + line_number}", component_name)
+            for element_type, line_number, tag_text in template_events
+        ]
     
     def _analyze_code_elements(self, content: str, lines: List[str], file_path: Path, component_name: str) -> List[InteractiveElement]:
         """Analyze TypeScript code for interactive elements"""
@@ -249,8 +461,7 @@ class InteractiveElementDiscovery:
             element_name=element_name,
             location=location,
             component_name=component_name,
-            event_handlers=[],
-            data_flow=[],
+            context_id=-1,
             user_action=self._infer_user_action(element_type, line),
             system_response=self._infer_system_response(element_type, line),
             importance=self._assess_importance(element_type, line),
@@ -268,47 +479,31 @@ class InteractiveElementDiscovery:
             element_name=element_name,
             location=location,
             component_name=component_name,
-            event_handlers=[],
-            data_flow=[],
+            context_id=-1,
             user_action=self._infer_code_user_action(element_type, line),
             system_response=self._infer_code_system_response(element_type, line),
             importance=self._assess_code_importance(element_type, line),
             category=self._categorize_element(element_type)
         )
     
-    def _extract_event_handlers(self, content: str, location: str) -> List[str]:
-        """Extract event handlers for an element"""
+    def _extract_event_handlers(self, content: str) -> List[str]:
+        """Extract event handlers bound anywhere in a file"""
         handlers = []
         
         # Look for common event binding patterns
-        event_patterns = [
-            r'\((click)\)\s*=\s*"([^"]*)"',
-            r'\@(click)\s*=\s*"([^"]*)"',
-            r'addEventListener\([\'"](click)[\'"]',
-            r'onClick\s*=\s*[\'"]([^\'"]*)[\'"]',
-        ]
-        
-        for pattern in event_patterns:
-            matches = re.findall(pattern, content)
+        for pattern in self.patterns['event_bindings']:
+            matches = pattern.findall(content)
             handlers.extend([match[0] if isinstance(match, tuple) else match for match in matches])
         
         return handlers
     
-    def _extract_data_flow(self, content: str, location: str) -> List[str]:
-        """Extract data flow information"""
+    def _extract_data_flow(self, content: str) -> List[str]:
+        """Extract data flow information of a file"""
         data_flow = []
         
         # Look for service calls and data manipulations
-        flow_patterns = [
-            r'(\w+)\.subscribe\(',
-            r'this\.(\w+)\s*=',
-            r'(\w+)\.emit\(',
-            r'(\w+)\.next\(',
-        ]
-        
-        for pattern in flow_patterns:
-            matches = re.findall(pattern, content)
-            data_flow.extend(matches)
+        for pattern in self.patterns['data_flow']:
+            data_flow.extend(pattern.findall(content))
         
         return data_flow
     
@@ -412,6 +607,7 @@ class InteractiveElementDiscovery:
             "analysis_timestamp": datetime.now().isoformat(),
             "source_path": str(self.source_path),
             "total_interactive_elements": len(self.interactive_elements),
+            "files_analyzed": dict(self.file_counts),
             "elements_by_category": defaultdict(list),
             "elements_by_importance": defaultdict(list),
             "components_analysis": defaultdict(list),
@@ -419,16 +615,11 @@ class InteractiveElementDiscovery:
             "recommendations": []
         }
         
-        # Categorize elements (store as dicts for JSON serialization)
-        for element in self.interactive_elements:
-            try:
-                element_dict = asdict(element)
-                report["elements_by_category"][element.category].append(element_dict)
-                report["elements_by_importance"][element.importance].append(element_dict)
-                report["components_analysis"][element.component_name].append(element_dict)
-            except Exception as e:
-                print(f"[Warning] Could not serialize element for report: {e}")
-                continue
+        # Groupings hold element ids (indexes into interactive_elements), not element copies
+        for element_id, element in enumerate(self.interactive_elements):
+            report["elements_by_category"][element.category].append(element_id)
+            report["elements_by_importance"][element.importance].append(element_id)
+            report["components_analysis"][element.component_name].append(element_id)
         
         # Generate key findings
         report["key_findings"] = self._generate_key_findings()
@@ -436,6 +627,28 @@ class InteractiveElementDiscovery:
         
         return report
     
+    def write_json(self, report: Dict[str, Any], stream: TextIO):
+        """Stream the element table, file contexts and report as one JSON document
+        
+        Records are encoded and written one at a time, so the full document is never
+        built in memory.
+        """
+        def write_table(key: str, records: List[Any], record_fields: Tuple[str, ...]):
+            stream.write(f'  "{key}": [')
+            separator = '\n'
+            for record_id, record in enumerate(records):
+                row = {"id": record_id}
+                for name in record_fields:
+                    row[name] = getattr(record, name)
+                stream.write(separator + '    ' + json.dumps(row, ensure_ascii=False))
+                separator = ',\n'
+            stream.write('\n  ],\n' if records else '],\n')
+        
+        stream.write('{\n')
+        write_table("interactive_elements", self.interactive_elements, ELEMENT_FIELDS)
+        write_table("file_contexts", self.file_contexts, FILE_CONTEXT_FIELDS)
+        stream.write('  "analysis_report": ' + json.dumps(report, ensure_ascii=False) + '\n}\n')
+    
     def _generate_key_findings(self) -> List[str]:
         """Generate key findings from analysis"""
         findings = []
@@ -489,11 +702,29 @@ class InteractiveElementDiscovery:
         return recommendations
 
 
+# Discovery instance of a pool worker process (created once per process by _init_worker)
+_worker_discovery: Optional[InteractiveElementDiscovery] = None
+
+
+def _init_worker(source_path: str, exclude: Optional[List[str]]):
+    """Process-pool initializer"""
+    global _worker_discovery
+    _worker_discovery = InteractiveElementDiscovery(Path(source_path), exclude)
+
+
+def _analyze_files_chunk(file_paths: List[str]) -> List[Optional[list]]:
+    """Pool task: analyze a chunk of files, returning their plain-list analyses in order"""
+    return [_worker_discovery.analyze_file(Path(file_path)) for file_path in file_paths]
+
+
 def main():
     parser = argparse.ArgumentParser(description='Interactive Element Discovery for Refactoring')
     parser.add_argument('--source', required=True, help='Source code path to analyze')
     parser.add_argument('--output', help='Output file path (JSON format)')
     parser.add_argument('--format', choices=['json', 'report'], default='json', help='Output format')
+    parser.add_argument('--exclude', action='append', help='Extra directory/file glob to skip (repeatable; vendor and build directories are always skipped)')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Worker processes for analyzing files (0 = all CPU cores, default 1)')
+    parser.add_argument('--cache', help='Per-file result cache (JSON); unchanged components and templates are not re-analyzed')
     
     args = parser.parse_args()
     
@@ -503,8 +734,13 @@ def main():
         return 1
     
     # Run discovery
-    discovery = InteractiveElementDiscovery(source_path)
-    elements = discovery.discover_interactive_elements()
+    exclude = list(SourceWalker.DEFAULT_EXCLUDE) + (args.exclude or [])
+    if args.jobs < 0:
+        parser.error('--jobs must not be negative')
+    jobs = args.jobs or os.cpu_count() or 1
+    
+    discovery = InteractiveElementDiscovery(source_path, exclude)
+    elements = discovery.discover_interactive_elements(jobs, Path(args.cache) if args.cache else None)
     
     print(f"[Discovery] Found {len(elements)} interactive elements")
     
@@ -513,28 +749,12 @@ def main():
     
     # Output results
     if args.format == 'json':
-        # Filter out any non-InteractiveElement objects that might have been added
-        valid_elements = [element for element in elements if hasattr(element, 'element_type')]
-        # Manually convert to dict to handle any serialization issues
-        serialized_elements = []
-        for element in valid_elements:
-            try:
-                serialized_elements.append(asdict(element))
-            except Exception as e:
-                print(f"[Warning] Could not serialize element {element.element_name}: {e}")
-                continue
-        
-        output_data = {
-            "interactive_elements": serialized_elements,
-            "analysis_report": report
-        }
-        
         if args.output:
             with open(args.output, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
+                discovery.write_json(report, f)
             print(f"[Discovery] Results saved to {args.output}")
         else:
-            print(json.dumps(output_data, indent=2, ensure_ascii=False))
+            discovery.write_json(report, sys.stdout)
     else:
         # Human-readable report
         print("\n" + "="*60)
@@ -543,6 +763,7 @@ def main():
         print(f"分析时间: {report['analysis_timestamp']}")
         print(f"源代码路径: {report['source_path']}")
         print(f"交互元素总数: {report['total_interactive_elements']}")
+        print(f"分析文件数: 组件 {report['files_analyzed']['component_files']} 个，其他 {report['files_analyzed']['other_files']} 个")
         
         print("\n关键发现:")
         for finding in report['key_findings']:
@@ -6,40 +6,116 @@ Usage:
     python progressive_refactoring.py baseline --component ViewAppFile
     python progressive_refactoring.py compatibility --component ViewAppFile
     python progressive_refactoring.py component-replace --component ViewAppFile
-    python progressive_refactoring.py validate --component ViewAppFile
+    python progressive_refactoring.py parallel-validation --component ViewAppFile --original ../legacy-app
+    python progressive_refactoring.py status --component ViewAppFile
+    python progressive_refactoring.py batch --components "View*,FileService" --depends ViewAppFile=FileService --workers 4
+
+阶段状态保存在 <project>/.specify/state/progressive.json，已完成的阶段再次执行时直接跳过（--force 强制重新执行）。
+基线验证和并行验证只验证 --component 对应的文件（组件、模板、hooks、测试、兼容层），
+--whole-project 恢复整个项目验证。
+并行验证阶段同时分析 --original 指定的原实现和当前项目（重构实现），比较两侧的API调用、
+接口定义和规则结果，报告行为差异和两侧耗时。
+batch 在进程池中批量执行多个组件的阶段：同一组件的阶段按顺序执行，声明了依赖的组件
+要等被依赖组件完成同一阶段后才执行该阶段，每个阶段完成时立即输出进度。
+每个阶段完成时记录组件文件的检查点（.specify/checkpoints），rollback 把组件文件恢复到
+目标阶段的检查点，并删除之后新增的文件。
 """
 
 import sys
 import os
+import io
 import json
+import time
 import argparse
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import redirect_stdout
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set, Tuple
 
 # Add the src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from specify_cli.validation import RefactoringValidationSystem
+from specify_cli.validation import (
+    RefactoringValidationSystem,
+    ProgressiveState,
+    PROGRESSIVE_PHASES,
+    ComponentIndex,
+    ParallelValidator,
+    PhaseCheckpointStore
+)
 from specify_cli.commands.refactoring import console
 
 class ProgressiveRefactoringExecutor:
     """渐进式重构执行器"""
     
-    def __init__(self, project_path: str):
+    def __init__(self, project_path: str, force: bool = False, whole_project: bool = False,
+                 original_path: Optional[str] = None, jobs: int = 1):
         self.project_path = Path(project_path)
         self.current_phase = 0
-        self.phases = [
-            "baseline",
-            "compatibility", 
-            "component-replace",
-            "parallel-validation"
-        ]
+        self.phases = list(PROGRESSIVE_PHASES)
         self.phase_status = {}
+        self.force = force
+        self.component = None
+        
+        # 验证范围：默认只验证组件的文件集合（组件索引首次使用时构建）
+        self.whole_project = whole_project
+        self._component_index: Optional[ComponentIndex] = None
+        
+        # 并行验证：原实现路径和每侧的进程数
+        self.original_path = Path(original_path) if original_path else None
+        self.jobs = jobs
+        
+        # 持久化的阶段状态（跨调用保留）和阶段检查点
+        self.state = ProgressiveState(self.project_path)
+        self.checkpoints = PhaseCheckpointStore(self.project_path)
         
         # 初始化阶段状态
         for phase in self.phases:
             self.phase_status[phase] = "pending"
     
+    def load_component(self, component: str):
+        """从状态文件加载组件的阶段状态"""
+        self.component = component
+        self._apply_state(self.state.component(component))
+    
+    def _apply_state(self, entry: Dict[str, Any]):
+        self.current_phase = entry["current_phase"]
+        self.phase_status = {phase: entry["phases"][phase]["status"] for phase in self.phases}
+    
+    def _record_phase(self, component: str, phase: str, status: str, results: Optional[Dict[str, Any]] = None):
+        """持久化阶段结果（含验证结果摘要）并同步内存状态；阶段完成时记录组件文件的检查点"""
+        if status == "completed":
+            self._record_checkpoint(component, phase)
+        
+        digest = ProgressiveState.digest(results) if results is not None else None
+        self._apply_state(self.state.record_phase(component, phase, status, digest))
+    
+    def _component_files(self, component: str) -> List[Path]:
+        """组件在当前项目中的相关文件"""
+        if self._component_index is None:
+            self._component_index = ComponentIndex.build(self.project_path)
+        return self._component_index.files_for(component)
+    
+    def _validate_scope(self, component: str) -> Dict[str, Any]:
+        """按组件范围验证；组件未在索引中找到文件时退回整个项目验证"""
+        validation_system = RefactoringValidationSystem()
+        
+        if not self.whole_project:
+            component_files = self._component_files(component)
+            if component_files:
+                console.print(f"[cyan]📁 验证组件 {component} 的 {len(component_files)} 个相关文件[/cyan]")
+                return validation_system.validate_refactoring_project(self.project_path, files=component_files)
+            console.print(f"[yellow]⚠️ 未找到组件 {component} 的相关文件，验证整个项目[/yellow]")
+        
+        return validation_system.validate_refactoring_project(self.project_path)
+    
+    def _skip_completed(self, phase: str) -> bool:
+        """阶段已完成且未指定--force时跳过"""
+        if self.phase_status.get(phase) == "completed" and not self.force:
+            console.print(f"[green]⏭️ 阶段 {phase} 已完成，跳过（使用 --force 重新执行）[/green]")
+            return True
+        return False
+    
     def validate_phase_order(self, target_phase: str) -> bool:
         """验证阶段顺序"""
         try:
@@ -60,27 +136,24 @@ class ProgressiveRefactoringExecutor:
         """执行基线验证阶段"""
         console.print(f"[cyan]🔍 执行基线验证阶段: {component}[/cyan]")
         
+        if self._skip_completed("baseline"):
+            return True
+        
         if not self.validate_phase_order("baseline"):
             return False
         
-        # TODO: 实现基线验证逻辑
-        console.print("[yellow]⚠️ 基线验证功能开发中...[/yellow]")
-        
-        # 模拟验证
-        validation_system = RefactoringValidationSystem()
-        
         try:
-            results = validation_system.validate_refactoring_project(self.project_path)
+            results = self._validate_scope(component)
             
             if results['failed_validations'] > 0:
                 console.print(f"[red]❌ 基线验证失败: {results['failed_validations']} 个错误[/red]")
+                self._record_phase(component, "baseline", "failed", results)
                 return False
             
             console.print(f"[green]✅ 基线验证通过: {results['passed_validations']} 个验证通过[/green]")
             
             # 更新阶段状态
-            self.phase_status["baseline"] = "completed"
-            self.current_phase = 1
+            self._record_phase(component, "baseline", "completed", results)
             
             return True
             
@@ -92,6 +165,9 @@ class ProgressiveRefactoringExecutor:
         """执行兼容层创建阶段"""
         console.print(f"[cyan]🔧 执行兼容层创建阶段: {component}[/cyan]")
         
+        if self._skip_completed("compatibility"):
+            return True
+        
         if not self.validate_phase_order("compatibility"):
             return False
         
@@ -114,13 +190,13 @@ class ProgressiveRefactoringExecutor:
         
         if missing_files:
             console.print(f"[red]❌ 缺少兼容层文件: {missing_files}[/red]")
+            self._record_phase(component, "compatibility", "failed")
             return False
         
         console.print("[green]✅ 兼容层创建完成[/green]")
         
         # 更新阶段状态
-        self.phase_status["compatibility"] = "completed"
-        self.current_phase = 2
+        self._record_phase(component, "compatibility", "completed")
         
         return True
     
@@ -128,6 +204,9 @@ class ProgressiveRefactoringExecutor:
         """执行组件替换阶段"""
         console.print(f"[cyan]🔄 执行组件替换阶段: {component}[/cyan]")
         
+        if self._skip_completed("component-replace"):
+            return True
+        
         if not self.validate_phase_order("component-replace"):
             return False
         
@@ -150,13 +229,13 @@ class ProgressiveRefactoringExecutor:
         
         if missing_files:
             console.print(f"[red]❌ 缺少组件文件: {missing_files}[/red]")
+            self._record_phase(component, "component-replace", "failed")
             return False
         
         console.print("[green]✅ 组件替换完成[/green]")
         
         # 更新阶段状态
-        self.phase_status["component-replace"] = "completed"
-        self.current_phase = 3
+        self._record_phase(component, "component-replace", "completed")
         
         return True
     
@@ -164,6 +243,9 @@ class ProgressiveRefactoringExecutor:
         """执行并行验证阶段"""
         console.print(f"[cyan]🔍 执行并行验证阶段: {component}[/cyan]")
         
+        if self._skip_completed("parallel-validation"):
+            return True
+        
         if not self.validate_phase_order("parallel-validation"):
             return False
         
@@ -172,24 +254,45 @@ class ProgressiveRefactoringExecutor:
             console.print("[red]❌ 必须先完成组件替换阶段[/red]")
             return False
         
-        # TODO: 实现并行验证逻辑
-        console.print("[yellow]⚠️ 并行验证功能开发中...[/yellow]")
+        if self.original_path is None or not self.original_path.is_dir():
+            console.print("[red]❌ 并行验证需要用 --original 指定原实现的目录[/red]")
+            return False
         
-        # 执行完整验证
-        validation_system = RefactoringValidationSystem()
+        # 两侧的验证范围：组件的相关文件，任一侧未找到时两侧都验证整棵树
+        original_files = refactored_files = None
+        if not self.whole_project:
+            refactored_files = self._component_files(component)
+            original_files = ComponentIndex.build(self.original_path).files_for(component)
+            if not original_files or not refactored_files:
+                console.print(f"[yellow]⚠️ 未在两侧同时找到组件 {component} 的相关文件，验证整棵目录树[/yellow]")
+                original_files = refactored_files = None
         
         try:
-            results = validation_system.validate_refactoring_project(self.project_path)
+            report = ParallelValidator(jobs=self.jobs).validate(
+                self.original_path, self.project_path, original_files, refactored_files
+            )
             
-            if results['failed_validations'] > 0:
-                console.print(f"[red]❌ 并行验证失败: {results['failed_validations']} 个错误[/red]")
+            console.print(
+                f"[cyan]⏱️ 原实现 {report.original.files} 个文件 {report.original.seconds:.2f}s | "
+                f"重构实现 {report.refactored.files} 个文件 {report.refactored.seconds:.2f}s | "
+                f"总耗时 {report.wall_seconds:.2f}s，比较 {report.merge_seconds * 1000:.0f}ms[/cyan]"
+            )
+            for divergence in report.divergences:
+                color = {"error": "red", "warning": "yellow"}.get(divergence.severity, "green")
+                console.print(
+                    f"[{color}]  {divergence.kind} {divergence.change}: {divergence.item} ({divergence.file})[/{color}]"
+                )
+            
+            results = report.to_dict(include_timing=False)
+            if not report.passed:
+                console.print(f"[red]❌ 并行验证失败: {results['errors']} 处行为差异[/red]")
+                self._record_phase(component, "parallel-validation", "failed", results)
                 return False
             
-            console.print(f"[green]✅ 并行验证通过: {results['passed_validations']} 个验证通过[/green]")
+            console.print(f"[green]✅ 并行验证通过: 行为一致（{results['warnings']} 个警告）[/green]")
             
             # 更新阶段状态
-            self.phase_status["parallel-validation"] = "completed"
-            self.current_phase = 4
+            self._record_phase(component, "parallel-validation", "completed", results)
             
             return True
             
@@ -200,12 +303,43 @@ class ProgressiveRefactoringExecutor:
     def get_status(self) -> Dict[str, Any]:
         """获取当前状态"""
         return {
+            "component": self.component,
             "current_phase": self.current_phase,
             "phases": self.phases,
             "phase_status": self.phase_status,
-            "project_path": str(self.project_path)
+            "phase_details": self.state.component(self.component)["phases"] if self.component else {},
+            "project_path": str(self.project_path),
+            "state_file": str(self.state.state_path)
         }
     
+    def _record_checkpoint(self, component: str, phase: str):
+        """记录阶段检查点；失败（磁盘已满、文件不可读等）时只给出警告，阶段状态照常记录"""
+        try:
+            manifest = self.checkpoints.record(component, phase, self._component_files(component))
+        except OSError as e:
+            console.print(f"[yellow]⚠️ 记录检查点失败: {str(e)}[/yellow]")
+            console.print(f"[yellow]   回滚到阶段 {phase} 时将只回滚阶段状态，不恢复文件；处理后可用 --force 重新执行该阶段[/yellow]")
+            # 不保留可能是上次执行留下的旧检查点
+            try:
+                self.checkpoints.discard(component, [phase])
+            except OSError:
+                pass
+            return
+        
+        console.print(f"[cyan]📸 已记录检查点: {len(manifest['files'])} 个文件[/cyan]")
+    
+    def _restore_checkpoint(self, component: str, phase: str):
+        """把组件文件恢复到阶段的检查点（没有检查点时只回滚阶段状态）"""
+        if not self.checkpoints.has(component, phase):
+            console.print(f"[yellow]⚠️ 阶段 {phase} 没有检查点，只回滚阶段状态，文件保持不变[/yellow]")
+            return
+        
+        restored, removed = self.checkpoints.restore(component, phase, self._component_files(component))
+        self._component_index = None
+        console.print(f"[green]♻️ 已恢复 {len(restored)} 个文件，删除 {len(removed)} 个检查点之后新增的文件[/green]")
+        for relative_path in removed:
+            console.print(f"    - {relative_path}")
+    
     def rollback_phase(self, phase: str) -> bool:
         """回滚到指定阶段"""
         try:
@@ -215,11 +349,15 @@ class ProgressiveRefactoringExecutor:
                 console.print(f"[red]❌ 无法回滚到当前或未来阶段: {phase}[/red]")
                 return False
             
-            # 重置后续阶段状态
-            for i in range(phase_index + 1, len(self.phases)):
-                self.phase_status[self.phases[i]] = "pending"
-            
-            self.current_phase = phase_index
+            # 恢复组件文件并重置后续阶段状态
+            if self.component:
+                self._restore_checkpoint(self.component, phase)
+                self._apply_state(self.state.rollback(self.component, phase))
+                self.checkpoints.discard(self.component, self.phases[phase_index + 1:])
+            else:
+                for i in range(phase_index + 1, len(self.phases)):
+                    self.phase_status[self.phases[i]] = "pending"
+                self.current_phase = phase_index
             
             console.print(f"[green]✅ 已回滚到阶段: {phase}[/green]")
             return True
@@ -227,18 +365,261 @@ class ProgressiveRefactoringExecutor:
         except ValueError:
             console.print(f"[red]❌ 无效的阶段: {phase}[/red]")
             return False
+        except OSError as e:
+            console.print(f"[red]❌ 恢复检查点失败: {str(e)}[/red]")
+            return False
+
+class BatchScheduler:
+    """批量执行调度器：按阶段顺序和组件依赖调度 (组件, 阶段) 任务
+    
+    任务 (C, P) 依赖 (C, P的前一阶段)，以及C声明依赖的、同在本批次中的每个组件D的 (D, P)。
+    任务失败时，所有直接或间接依赖它的任务标记为阻塞，不再执行。
+    """
+    
+    def __init__(self, components: List[str], phases: List[str], dependencies: Dict[str, List[str]]):
+        self.tasks: List[Tuple[str, str]] = [(component, phase) for component in components for phase in phases]
+        self.position = {task: position for position, task in enumerate(self.tasks)}
+        self.waiting_on: Dict[Tuple[str, str], Set[Tuple[str, str]]] = {task: set() for task in self.tasks}
+        self.dependents: Dict[Tuple[str, str], List[Tuple[str, str]]] = {task: [] for task in self.tasks}
+        self.blocked: Dict[Tuple[str, str], str] = {}
+        
+        batch = set(components)
+        for component in components:
+            in_batch = [dependency for dependency in dependencies.get(component, []) if dependency in batch]
+            for phase_index, phase in enumerate(phases):
+                task = (component, phase)
+                prerequisites = [(component, phases[phase_index - 1])] if phase_index > 0 else []
+                prerequisites += [(dependency, phase) for dependency in in_batch]
+                for prerequisite in prerequisites:
+                    self.waiting_on[task].add(prerequisite)
+                    self.dependents[prerequisite].append(task)
+        
+        self._check_cycles()
+    
+    def _check_cycles(self):
+        """拓扑排序检查依赖环"""
+        remaining = {task: len(waiting) for task, waiting in self.waiting_on.items()}
+        queue = [task for task, count in remaining.items() if count == 0]
+        while queue:
+            task = queue.pop()
+            for dependent in self.dependents[task]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    queue.append(dependent)
+        
+        cyclic = sorted({component for (component, _), count in remaining.items() if count > 0})
+        if cyclic:
+            raise ValueError(f"组件依赖存在环: {', '.join(cyclic)}")
+    
+    def ready(self) -> List[Tuple[str, str]]:
+        """初始可执行的任务"""
+        return [task for task in self.tasks if not self.waiting_on[task]]
+    
+    def block(self, task: Tuple[str, str], reason: str) -> List[Tuple[str, str]]:
+        """把任务及其所有下游任务标记为阻塞，返回新阻塞的任务"""
+        newly_blocked = []
+        stack = [(task, reason)]
+        while stack:
+            current, current_reason = stack.pop()
+            if current in self.blocked:
+                continue
+            self.blocked[current] = current_reason
+            newly_blocked.append(current)
+            stack.extend((dependent, f"{current[0]} {current[1]} 未完成") for dependent in self.dependents[current])
+        return sorted(newly_blocked, key=self.position.get)
+    
+    def complete(self, task: Tuple[str, str], success: bool) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+        """记录任务结果，返回 (新就绪的任务, 新阻塞的任务)"""
+        if not success:
+            reason = f"{task[0]} {task[1]} 未完成"
+            blocked = [t for dependent in self.dependents[task] for t in self.block(dependent, reason)]
+            return [], sorted(blocked, key=self.position.get)
+        
+        ready = []
+        for dependent in self.dependents[task]:
+            waiting = self.waiting_on[dependent]
+            waiting.discard(task)
+            if not waiting and dependent not in self.blocked:
+                ready.append(dependent)
+        return ready, []
+
+
+# 批量执行的工作进程执行器（由_init_batch_worker在每个工作进程中创建一次，组件索引在进程内复用）
+_batch_executor: Optional[ProgressiveRefactoringExecutor] = None
+
+def _init_batch_worker(executor_kwargs: Dict[str, Any]):
+    """进程池初始化：创建工作进程的执行器"""
+    global _batch_executor
+    _batch_executor = ProgressiveRefactoringExecutor(**executor_kwargs)
+
+def _run_batch_task(component: str, phase: str) -> Tuple[bool, float, str]:
+    """执行一个组件的一个阶段，返回 (是否成功, 耗时, 捕获的输出)"""
+    executor = _batch_executor
+    phase_handlers = {
+        "baseline": executor.execute_baseline,
+        "compatibility": executor.execute_compatibility,
+        "component-replace": executor.execute_component_replace,
+        "parallel-validation": executor.execute_parallel_validation
+    }
+    
+    start = time.perf_counter()
+    output = io.StringIO()
+    with redirect_stdout(output):
+        try:
+            executor.load_component(component)
+            success = phase_handlers[phase](component)
+        except Exception as e:
+            console.print(f"[red]❌ 执行异常: {str(e)}[/red]")
+            success = False
+    return success, time.perf_counter() - start, output.getvalue()
+
+def run_batch(components: List[str], dependencies: Dict[str, List[str]], phases: List[str],
+              executor_kwargs: Dict[str, Any], workers: int = 1) -> Dict[str, Dict[str, str]]:
+    """批量执行组件的阶段并逐条输出进度，返回 组件 -> 阶段 -> 结果(completed/failed/blocked)"""
+    scheduler = BatchScheduler(components, phases, dependencies)
+    outcomes: Dict[str, Dict[str, str]] = {component: {} for component in components}
+    total = len(scheduler.tasks)
+    finished = 0
+    
+    # 批次外的依赖组件必须已在状态文件中完成对应阶段
+    state = ProgressiveState(Path(executor_kwargs["project_path"]))
+    for component in components:
+        for dependency in dependencies.get(component, []):
+            if dependency in outcomes:
+                continue
+            dependency_phases = state.component(dependency)["phases"]
+            for phase in phases:
+                if dependency_phases[phase]["status"] != "completed":
+                    scheduler.block((component, phase), f"{dependency} {phase} 未完成")
+    
+    def report(task: Tuple[str, str], status: str, detail: str = "", output: str = ""):
+        nonlocal finished
+        finished += 1
+        component, phase = task
+        outcomes[component][phase] = status
+        icon, color = {"completed": ("✅", "green"), "failed": ("❌", "red"), "blocked": ("⏭️", "yellow")}[status]
+        console.print(f"[{color}][{finished}/{total}] {icon} {component} {phase}: {status}{detail}[/{color}]")
+        if status == "failed" and output.strip():
+            for line in output.rstrip().splitlines():
+                console.print(f"    {line}")
+    
+    def settle(task: Tuple[str, str], success: bool, seconds: float, output: str) -> List[Tuple[str, str]]:
+        report(task, "completed" if success else "failed", f" ({seconds:.2f}s)", output)
+        ready, blocked = scheduler.complete(task, success)
+        for blocked_task in blocked:
+            report(blocked_task, "blocked", f" ({scheduler.blocked[blocked_task]})")
+        return ready
+    
+    for task in sorted(scheduler.blocked, key=scheduler.position.get):
+        report(task, "blocked", f" ({scheduler.blocked[task]})")
+    queue = [task for task in scheduler.ready() if task not in scheduler.blocked]
+    
+    if workers <= 1:
+        _init_batch_worker(executor_kwargs)
+        while queue:
+            task = queue.pop(0)
+            queue.extend(settle(task, *_run_batch_task(*task)))
+        return outcomes
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker, initargs=(executor_kwargs,)) as pool:
+        pending = {pool.submit(_run_batch_task, *task): task for task in queue}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = pending.pop(future)
+                for ready_task in settle(task, *future.result()):
+                    pending[pool.submit(_run_batch_task, *ready_task)] = ready_task
+    
+    return outcomes
+
+def resolve_components(entries: List[str], project_path: Path) -> List[str]:
+    """解析组件列表：含通配符的条目按组件索引展开，保持首次出现的顺序并去重"""
+    index = None
+    components: List[str] = []
+    for entry in entries:
+        if any(ch in entry for ch in "*?["):
+            if index is None:
+                index = ComponentIndex.build(project_path)
+            matched = index.match(entry)
+            if not matched:
+                console.print(f"[yellow]⚠️ 没有组件匹配 {entry}[/yellow]")
+            components.extend(matched)
+        else:
+            components.append(entry)
+    return list(dict.fromkeys(components))
+
+def parse_dependencies(declarations: List[str]) -> Dict[str, List[str]]:
+    """解析依赖声明 COMPONENT=DEP1,DEP2"""
+    dependencies: Dict[str, List[str]] = {}
+    for declaration in declarations:
+        component, separator, targets = declaration.partition("=")
+        if not separator or not component.strip():
+            raise ValueError(f"无效的依赖声明: {declaration}（格式为 COMPONENT=DEP1,DEP2）")
+        dependencies.setdefault(component.strip(), []).extend(
+            target.strip() for target in targets.split(",") if target.strip()
+        )
+    return dependencies
 
 def main():
     parser = argparse.ArgumentParser(description="渐进式重构执行器")
-    parser.add_argument("phase", choices=["baseline", "compatibility", "component-replace", "parallel-validation", "status", "rollback"])
-    parser.add_argument("--component", required=True, help="组件名称")
+    parser.add_argument("phase", choices=["baseline", "compatibility", "component-replace", "parallel-validation", "status", "rollback", "batch"])
+    parser.add_argument("--component", help="组件名称（batch以外的命令必需）")
     parser.add_argument("--project", default=".", help="项目路径")
     parser.add_argument("--rollback-phase", help="回滚到的阶段（仅用于rollback命令）")
+    parser.add_argument("--force", action="store_true", help="重新执行已完成的阶段")
+    parser.add_argument("--whole-project", action="store_true", help="验证整个项目而不是组件的相关文件")
+    parser.add_argument("--original", help="原实现的目录（并行验证阶段与当前项目比较）")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="并行验证时每侧的进程数（0表示CPU核数）")
+    parser.add_argument("--components", help="batch: 逗号分隔的组件列表，可包含通配符（如 \"View*\"）")
+    parser.add_argument("--depends", action="append", default=[], help="batch: 组件依赖 COMPONENT=DEP1,DEP2（可重复）")
+    parser.add_argument("--until", choices=PROGRESSIVE_PHASES, default=PROGRESSIVE_PHASES[-1], help="batch: 执行到的最后阶段")
+    parser.add_argument("--workers", type=int, default=0, help="batch: 同时执行的组件阶段数（0表示CPU核数）")
     
     args = parser.parse_args()
     
-    # 初始化执行器
-    executor = ProgressiveRefactoringExecutor(args.project)
+    if args.phase == "batch":
+        if not args.components:
+            parser.error("batch 需要 --components")
+        try:
+            dependencies = parse_dependencies(args.depends)
+            components = resolve_components([c.strip() for c in args.components.split(",") if c.strip()], Path(args.project))
+            phases = PROGRESSIVE_PHASES[:PROGRESSIVE_PHASES.index(args.until) + 1]
+            workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+            console.print(f"[cyan]📦 批量执行 {len(components)} 个组件的阶段 {phases[0]} → {phases[-1]}（{workers} 个进程）[/cyan]")
+            outcomes = run_batch(components, dependencies, phases, {
+                "project_path": args.project,
+                "force": args.force,
+                "whole_project": args.whole_project,
+                "original_path": args.original,
+                "jobs": args.jobs
+            }, workers=workers)
+        except ValueError as e:
+            console.print(f"[red]❌ {e}[/red]")
+            sys.exit(1)
+        
+        incomplete = sorted(c for c, results in outcomes.items() if any(r != "completed" for r in results.values()))
+        console.print(f"[cyan]📊 完成 {len(outcomes) - len(incomplete)}/{len(outcomes)} 个组件[/cyan]")
+        if incomplete:
+            console.print(f"[red]❌ 未完成: {', '.join(incomplete)}[/red]")
+            sys.exit(1)
+        return
+    
+    if not args.component:
+        parser.error(f"{args.phase} 需要 --component")
+    
+    # 初始化执行器并加载组件的持久化状态
+    executor = ProgressiveRefactoringExecutor(
+        args.project,
+        force=args.force,
+        whole_project=args.whole_project,
+        original_path=args.original,
+        jobs=args.jobs
+    )
+    try:
+        executor.load_component(args.component)
+    except ValueError as e:
+        console.print(f"[red]❌ 无法读取阶段状态: {e}[/red]")
+        sys.exit(1)
     
     if args.phase == "status":
         status = executor.get_status()
@@ -6,6 +6,9 @@ Usage:
     python reality_check.py scan ./my-project
     python reality_check.py validate ./my-project --component ViewAppFile
     python reality_check.py report ./my-project --output report.md
+    python reality_check.py scan ./my-project --baseline reality-baseline.json --update-baseline
+    python reality_check.py scan ./my-project --baseline reality-baseline.json
+    python reality_check.py scan ./my-project --jobs 8
 """
 
 import sys
@@ -13,8 +16,9 @@ import os
 import re
 import json
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -22,6 +26,7 @@ from enum import Enum
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from specify_cli.commands.refactoring import console
+from specify_cli.validation.baseline import ViolationBaseline
 
 class RealityViolationType(Enum):
     """真实性违规类型"""
@@ -44,11 +49,24 @@ class RealityViolation:
 class RealityCheckpoint:
     """真实性检查点"""
     
-    def __init__(self):
+    # 支持的文件扩展名
+    SOURCE_EXTENSIONS = ('.tsx', '.ts', '.jsx', '.js', '.py')
+    
+    # 并行扫描时每个任务包含的最大文件数
+    MAX_CHUNK_SIZE = 256
+    
+    def __init__(self, baseline: Optional[ViolationBaseline] = None, jobs: int = 1):
         self.violations: List[RealityViolation] = []
         self.checks_passed = 0
         self.checks_failed = 0
         
+        # 违规基线：指纹在基线中的既有违规不再输出和计数
+        self.baseline = baseline
+        self.baseline_suppressed = 0
+        
+        # 并行进程数（<=1时在当前进程内顺序检查）
+        self.jobs = jobs
+        
         # 定义检查模式
         self.mock_patterns = [
             (r'mockData|fakeData|dummyData', RealityViolationType.MOCK_DATA),
@@ -86,116 +104,175 @@ class RealityCheckpoint:
             (r'try\s*\{', "real_logic"),
             (r'catch\s*\(', "real_logic"),
         ]
+        
+        # 违规检查模式预编译（按Mock、占位符的原有顺序，逐行匹配语义不变）
+        self._violation_checks = [(re.compile(pattern, re.IGNORECASE), violation_type)
+                                  for pattern, violation_type in self.mock_patterns + self.placeholder_patterns]
+        
+        # 整文件预扫描：所有违规模式合并为一个交替式，只有命中行才需要逐模式匹配
+        self._violation_scan = self._compile_scan(
+            [pattern for pattern, _ in self.mock_patterns + self.placeholder_patterns], single_line=True)
+        
+        # 集成标记：每类模式合并为一个交替式，search结果与逐个re.search后any()一致
+        self._integration_scans = [
+            ("files_with_real_api", self._compile_scan([p for p, _ in self.real_data_patterns])),
+            ("files_with_mock_data", self._compile_scan([p for p, _ in self.mock_patterns])),
+            ("files_with_business_logic", self._compile_scan([p for p, _ in self.business_logic_patterns])),
+            ("files_with_placeholders", self._compile_scan([p for p, _ in self.placeholder_patterns])),
+        ]
+    
+    @staticmethod
+    def _compile_scan(patterns: List[str], single_line: bool = False) -> 're.Pattern':
+        """把多个模式合并为整文件扫描用的交替式
+        
+        single_line时 \\s 限定为不跨行的空白，保证任何命中都落在单行之内；各分支开头的
+        字面字符汇总成前置字符集断言，使扫描能快速跳过不可能命中的位置（IGNORECASE下
+        交替式本身无法利用前缀优化）。
+        """
+        branches = [branch for pattern in patterns for branch in pattern.split('|')]
+        
+        guard = ''
+        for index in range(2):
+            chars = set()
+            for branch in branches:
+                # 只取字面字符，且其后不能跟可使其缺省的量词
+                if (len(branch) <= index or branch[index] in '\\.^$*+?{}[]()'
+                        or branch[index + 1:index + 2] in ('*', '?', '{')):
+                    break
+                chars.add(branch[index])
+            else:
+                guard += '[' + ''.join(sorted(re.escape(c) for c in chars)) + ']'
+                continue
+            break
+        
+        scan = '|'.join(f'(?:{pattern})' for pattern in patterns)
+        if single_line:
+            scan = scan.replace(r'\s', r'[^\S\n]')
+        if guard:
+            scan = f'(?={guard})(?:{scan})'
+        return re.compile(scan, re.IGNORECASE)
     
     def scan_file(self, file_path: Path) -> List[RealityViolation]:
-        """扫描单个文件"""
+        """扫描单个文件
+        
+        先用合并的预编译模式扫描整个文件定位命中行，只对命中行逐模式匹配并构建违规记录，
+        未命中的行不再执行逐行正则，结果与逐行检查完全一致。
+        """
+        return self._check_file(file_path, check_violations=True, check_integration=False)[0]
+    
+    def _check_file(self, file_path: Path, check_violations: bool,
+                    check_integration: bool) -> Tuple[List[RealityViolation], Optional[Dict[str, bool]]]:
+        """读取一次文件，同时得到违规记录和集成标记（读取失败时集成标记为None）"""
         violations = []
+        integration_flags = None
         
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 lines = f.readlines()
             
-            for line_number, line in enumerate(lines, 1):
-                violations.extend(self._check_line(line, line_number, file_path))
+            content = ''.join(lines)
+            
+            if check_violations:
+                for line_number in self._find_violation_lines(content):
+                    violations.extend(self._check_line(lines[line_number - 1], line_number, file_path))
+            
+            if check_integration:
+                integration_flags = {key: scan.search(content) is not None
+                                     for key, scan in self._integration_scans}
                 
         except Exception as e:
-            violations.append(RealityViolation(
-                file_path=str(file_path),
-                line_number=0,
-                violation_type=RealityViolationType.MISSING_INTEGRATION,
-                message=f"文件读取失败: {str(e)}",
-                code_snippet="",
-                severity="error"
-            ))
-        
-        return violations
-    
-    def _check_line(self, line: str, line_number: int, file_path: Path) -> List[RealityViolation]:
-        """检查单行代码"""
-        violations = []
-        
-        # 检查Mock数据模式
-        for pattern, violation_type in self.mock_patterns:
-            matches = re.finditer(pattern, line, re.IGNORECASE)
-            for match in matches:
+            if check_violations:
                 violations.append(RealityViolation(
                     file_path=str(file_path),
-                    line_number=line_number,
-                    violation_type=violation_type,
-                    message=f"检测到{violation_type.value}: {match.group()}",
-                    code_snippet=line.strip(),
+                    line_number=0,
+                    violation_type=RealityViolationType.MISSING_INTEGRATION,
+                    message=f"文件读取失败: {str(e)}",
+                    code_snippet="",
                     severity="error"
                 ))
         
-        # 检查占位符模式
-        for pattern, violation_type in self.placeholder_patterns:
-            matches = re.finditer(pattern, line, re.IGNORECASE)
-            for match in matches:
+        return violations, integration_flags
+    
+    def _find_violation_lines(self, content: str) -> List[int]:
+        """整文件扫描一次，返回含违规模式命中的行号（1开始，升序）"""
+        line_numbers = []
+        scan = self._violation_scan.search
+        line_number = 1
+        position = 0
+        
+        match = scan(content)
+        while match:
+            start = match.start()
+            line_number += content.count('\n', position, start)
+            line_numbers.append(line_number)
+            
+            # 同一行的其余命中由逐行检查处理，直接跳到下一行
+            position = content.find('\n', start)
+            if position < 0:
+                break
+            match = scan(content, position + 1)
+        
+        return line_numbers
+    
+    def _check_line(self, line: str, line_number: int, file_path: Path) -> List[RealityViolation]:
+        """检查单行代码（先Mock数据模式，后占位符模式）"""
+        violations = []
+        file_name = str(file_path)
+        code_snippet = None
+        
+        for pattern, violation_type in self._violation_checks:
+            for match in pattern.finditer(line):
+                if code_snippet is None:
+                    code_snippet = line.strip()
                 violations.append(RealityViolation(
-                    file_path=str(file_path),
+                    file_path=file_name,
                     line_number=line_number,
                     violation_type=violation_type,
                     message=f"检测到{violation_type.value}: {match.group()}",
-                    code_snippet=line.strip(),
+                    code_snippet=code_snippet,
                     severity="error"
                 ))
         
         return violations
     
-    def scan_project(self, project_path: Path) -> Dict[str, Any]:
-        """扫描整个项目"""
-        console.print(f"[cyan]🔍 扫描项目: {project_path}[/cyan]")
-        
-        # 支持的文件扩展名
-        extensions = {'.tsx', '.ts', '.jsx', '.js', '.py'}
+    def find_source_files(self, project_path: Path) -> List[Path]:
+        """一次遍历查找所有源文件（目录和文件名按字典序）"""
         source_files = []
         
-        for ext in extensions:
-            source_files.extend(project_path.rglob(f'*{ext}'))
-        
-        console.print(f"[cyan]📁 发现 {len(source_files)} 个源文件[/cyan]")
-        
-        # 扫描所有文件
-        all_violations = []
-        files_with_violations = set()
-        
-        for file_path in source_files:
-            file_violations = self.scan_file(file_path)
-            if file_violations:
-                all_violations.extend(file_violations)
-                files_with_violations.add(str(file_path))
-        
-        self.violations = all_violations
-        
-        # 统计结果
-        error_count = len([v for v in all_violations if v.severity == "error"])
-        warning_count = len([v for v in all_violations if v.severity == "warning"])
-        
-        self.checks_failed = len(files_with_violations)
-        self.checks_passed = len(source_files) - len(files_with_violations)
+        for root, dirnames, filenames in os.walk(project_path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.endswith(self.SOURCE_EXTENSIONS):
+                    source_files.append(Path(root) / filename)
         
-        return {
-            "total_files": len(source_files),
-            "files_with_violations": len(files_with_violations),
-            "total_violations": len(all_violations),
-            "error_count": error_count,
-            "warning_count": warning_count,
-            "checks_passed": self.checks_passed,
-            "checks_failed": self.checks_failed,
-            "violations": [self._violation_to_dict(v) for v in all_violations]
-        }
+        return source_files
+    
+    def scan_project(self, project_path: Path) -> Dict[str, Any]:
+        """扫描整个项目"""
+        return self.check_project(project_path, check_integration=False)[0]
     
     def validate_integration(self, project_path: Path) -> Dict[str, Any]:
         """验证集成真实性"""
-        console.print(f"[cyan]🔗 验证集成真实性: {project_path}[/cyan]")
+        return self.check_project(project_path, check_violations=False)[1]
+    
+    def check_project(self, project_path: Path, check_violations: bool = True,
+                      check_integration: bool = True) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """单遍检查项目：每个文件只读取一次，同时计算违规记录和集成标记
         
-        # 支持的文件扩展名
-        extensions = {'.tsx', '.ts', '.jsx', '.js', '.py'}
-        source_files = []
+        返回 (扫描结果, 集成统计)，未启用的一项为None。
+        """
+        if check_violations:
+            console.print(f"[cyan]🔍 扫描项目: {project_path}[/cyan]")
+        if check_integration:
+            console.print(f"[cyan]🔗 验证集成真实性: {project_path}[/cyan]")
+        
+        source_files = self.find_source_files(project_path)
         
-        for ext in extensions:
-            source_files.extend(project_path.rglob(f'*{ext}'))
+        if check_violations:
+            console.print(f"[cyan]📁 发现 {len(source_files)} 个源文件[/cyan]")
         
+        all_violations = []
+        files_with_violations = set()
         integration_stats = {
             "files_with_real_api": 0,
             "files_with_mock_data": 0,
@@ -204,40 +281,105 @@ class RealityCheckpoint:
             "integration_score": 0
         }
         
-        for file_path in source_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                has_real_api = any(re.search(pattern, content, re.IGNORECASE) 
-                                for pattern, _ in self.real_data_patterns)
-                has_mock_data = any(re.search(pattern, content, re.IGNORECASE) 
-                                for pattern, _ in self.mock_patterns)
-                has_business_logic = any(re.search(pattern, content, re.IGNORECASE) 
-                                       for pattern, _ in self.business_logic_patterns)
-                has_placeholders = any(re.search(pattern, content, re.IGNORECASE) 
-                                     for pattern, _ in self.placeholder_patterns)
-                
-                if has_real_api:
-                    integration_stats["files_with_real_api"] += 1
-                if has_mock_data:
-                    integration_stats["files_with_mock_data"] += 1
-                if has_business_logic:
-                    integration_stats["files_with_business_logic"] += 1
-                if has_placeholders:
-                    integration_stats["files_with_placeholders"] += 1
-                
-            except Exception:
-                continue
-        
-        # 计算集成得分
-        total_files = len(source_files)
-        if total_files > 0:
-            integration_stats["integration_score"] = int(
-                (integration_stats["files_with_real_api"] / total_files) * 100
-            )
+        self.baseline_suppressed = 0
         
-        return integration_stats
+        for file_path, file_violations, integration_flags in self._iter_file_results(
+                source_files, check_violations, check_integration):
+            
+            if file_violations and self.baseline is not None:
+                new_violations = [v for v in file_violations
+                                  if self.violation_fingerprint(v, project_path) not in self.baseline]
+                self.baseline_suppressed += len(file_violations) - len(new_violations)
+                file_violations = new_violations
+            
+            if file_violations:
+                all_violations.extend(file_violations)
+                files_with_violations.add(str(file_path))
+            
+            if integration_flags:
+                for key, flagged in integration_flags.items():
+                    if flagged:
+                        integration_stats[key] += 1
+        
+        scan_results = None
+        if check_violations:
+            self.violations = all_violations
+            
+            # 统计结果
+            error_count = len([v for v in all_violations if v.severity == "error"])
+            warning_count = len([v for v in all_violations if v.severity == "warning"])
+            
+            self.checks_failed = len(files_with_violations)
+            self.checks_passed = len(source_files) - len(files_with_violations)
+            
+            scan_results = {
+                "total_files": len(source_files),
+                "files_with_violations": len(files_with_violations),
+                "total_violations": len(all_violations),
+                "error_count": error_count,
+                "warning_count": warning_count,
+                "checks_passed": self.checks_passed,
+                "checks_failed": self.checks_failed,
+                "baseline_suppressed": self.baseline_suppressed,
+                "violations": [self._violation_to_dict(v) for v in all_violations]
+            }
+        
+        integration_results = None
+        if check_integration:
+            # 计算集成得分
+            total_files = len(source_files)
+            if total_files > 0:
+                integration_stats["integration_score"] = int(
+                    (integration_stats["files_with_real_api"] / total_files) * 100
+                )
+            integration_results = integration_stats
+        
+        return scan_results, integration_results
+    
+    def _iter_file_results(self, source_files: List[Path], check_violations: bool,
+                           check_integration: bool) -> Iterator[Tuple[Path, List[RealityViolation], Optional[Dict[str, bool]]]]:
+        """按source_files的顺序逐个产出 (文件, 违规记录, 集成标记)
+        
+        jobs>1时文件分块交给进程池，工作进程以紧凑元组回传结果，这里还原为违规记录；
+        executor.map保持提交顺序，合并结果与顺序检查一致（按路径排序）。
+        """
+        if self.jobs <= 1 or len(source_files) < 2:
+            for file_path in source_files:
+                yield (file_path,) + self._check_file(file_path, check_violations, check_integration)
+            return
+        
+        # 每个进程分到若干块，兼顾负载均衡与进程间通信开销
+        chunk_size = max(1, min(self.MAX_CHUNK_SIZE, len(source_files) // (self.jobs * 4)))
+        chunks = [source_files[i:i + chunk_size] for i in range(0, len(source_files), chunk_size)]
+        tasks = [([str(path) for path in chunk], check_violations, check_integration) for chunk in chunks]
+        integration_keys = [key for key, _ in self._integration_scans]
+        
+        with ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker) as executor:
+            for chunk, chunk_results in zip(chunks, executor.map(_check_file_chunk, tasks)):
+                for file_path, (packed_violations, packed_flags) in zip(chunk, chunk_results):
+                    file_name = str(file_path)
+                    violations = [
+                        RealityViolation(
+                            file_path=file_name,
+                            line_number=line_number,
+                            violation_type=RealityViolationType(violation_type),
+                            message=message,
+                            code_snippet=code_snippet,
+                            severity=severity
+                        )
+                        for line_number, violation_type, message, code_snippet, severity in packed_violations
+                    ]
+                    flags = None if packed_flags is None else dict(zip(integration_keys, packed_flags))
+                    yield file_path, violations, flags
+    
+    def violation_fingerprint(self, violation: RealityViolation, project_path: Path) -> str:
+        """违规指纹：规则（违规类型）、相对项目根目录的文件路径和规范化代码片段"""
+        relative_path = os.path.relpath(violation.file_path, project_path)
+        return ViolationBaseline.fingerprint(violation.violation_type.value, relative_path, violation.code_snippet)
+    
+    def build_baseline(self, project_path: Path) -> ViolationBaseline:
+        """以最近一次扫描的全部违规构建基线（需在未启用基线过滤时扫描）"""
+        return ViolationBaseline(self.violation_fingerprint(v, project_path) for v in self.violations)
     
     def generate_report(self, scan_results: Dict[str, Any], integration_results: Dict[str, Any]) -> str:
         """生成验证报告"""
@@ -251,6 +393,8 @@ class RealityCheckpoint:
         report_lines.append(f"- **违规总数**: {scan_results['total_violations']}")
         report_lines.append(f"- **错误数量**: {scan_results['error_count']}")
         report_lines.append(f"- **警告数量**: {scan_results['warning_count']}")
+        if scan_results.get('baseline_suppressed'):
+            report_lines.append(f"- **基线已忽略**: {scan_results['baseline_suppressed']}")
         report_lines.append(f"- **集成得分**: {integration_results['integration_score']}%\n")
         
         # 集成统计
@@ -321,6 +465,36 @@ class RealityCheckpoint:
             "severity": violation.severity
         }
 
+# 工作进程内的检查点实例（每个进程初始化一次，模式只编译一次）
+_worker_checkpoint: Optional[RealityCheckpoint] = None
+
+def _init_worker():
+    """进程池初始化：创建工作进程的检查点"""
+    global _worker_checkpoint
+    _worker_checkpoint = RealityCheckpoint()
+
+def _check_file_chunk(task: Tuple[List[str], bool, bool]) -> List[Tuple[List[tuple], Optional[tuple]]]:
+    """工作进程：检查一批文件
+    
+    每个文件返回 (违规元组列表, 集成标记元组)。违规元组为
+    (行号, 违规类型值, 消息, 代码片段, 严重级别)，不重复携带文件路径；
+    集成标记按_integration_scans的顺序排列，读取失败时为None。
+    """
+    file_paths, check_violations, check_integration = task
+    checkpoint = _worker_checkpoint
+    results = []
+    
+    for file_path in file_paths:
+        violations, flags = checkpoint._check_file(Path(file_path), check_violations, check_integration)
+        packed_violations = [
+            (v.line_number, v.violation_type.value, v.message, v.code_snippet, v.severity)
+            for v in violations
+        ]
+        packed_flags = None if flags is None else tuple(flags[key] for key, _ in checkpoint._integration_scans)
+        results.append((packed_violations, packed_flags))
+    
+    return results
+
 def main():
     parser = argparse.ArgumentParser(description="真实性验证检查点")
     parser.add_argument("command", choices=["scan", "validate", "report"], help="执行命令")
@@ -328,15 +502,41 @@ def main():
     parser.add_argument("--component", help="组件名称（用于validate命令）")
     parser.add_argument("--output", "-o", help="输出文件路径（用于report命令）")
     parser.add_argument("--fail-on-error", action="store_true", help="发现错误时退出")
+    parser.add_argument("--baseline", help="违规基线文件：只报告不在基线中的新违规")
+    parser.add_argument("--update-baseline", action="store_true", help="以当前全部违规刷新基线文件（需配合--baseline）")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="并行扫描的进程数（0表示使用全部CPU核心，默认1）")
     
     args = parser.parse_args()
     
+    if args.update_baseline and not args.baseline:
+        parser.error("--update-baseline 需要同时指定 --baseline")
+    if args.jobs < 0:
+        parser.error("--jobs 不能为负数")
+    jobs = args.jobs or os.cpu_count() or 1
+    
     project_path = Path(args.project_path)
     if not project_path.exists():
         console.print(f"[red]❌ 项目路径不存在: {project_path}[/red]")
         sys.exit(1)
     
-    checkpoint = RealityCheckpoint()
+    if args.update_baseline:
+        # 刷新基线：不过滤地扫描全部违规并写入指纹
+        checkpoint = RealityCheckpoint(jobs=jobs)
+        checkpoint.scan_project(project_path)
+        baseline = checkpoint.build_baseline(project_path)
+        baseline.save(Path(args.baseline))
+        console.print(f"[green]✅ 基线已更新: {args.baseline} ({len(baseline)} 条指纹, {len(checkpoint.violations)} 个违规)[/green]")
+        return
+    
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = ViolationBaseline.load(Path(args.baseline))
+        except (OSError, ValueError) as e:
+            console.print(f"[red]❌ 无法加载基线文件: {e}[/red]")
+            sys.exit(1)
+    
+    checkpoint = RealityCheckpoint(baseline=baseline, jobs=jobs)
     
     if args.command == "scan":
         # 扫描项目
@@ -348,6 +548,8 @@ def main():
         console.print(f"✅ 通过检查: {results['checks_passed']}")
         console.print(f"❌ 失败检查: {results['checks_failed']}")
         console.print(f"🚫 违规总数: {results['total_violations']}")
+        if baseline is not None:
+            console.print(f"🗂️ 基线已忽略: {results['baseline_suppressed']}")
         
         if results['violations']:
             console.print(f"\n[red]❌ 发现 {len(results['violations'])} 个违规[/red]")
@@ -378,9 +580,8 @@ def main():
                 sys.exit(1)
     
     elif args.command == "report":
-        # 生成完整报告
-        scan_results = checkpoint.scan_project(project_path)
-        integration_results = checkpoint.validate_integration(project_path)
+        # 生成完整报告（单遍检查，每个文件只读取一次）
+        scan_results, integration_results = checkpoint.check_project(project_path)
         
         report = checkpoint.generate_report(scan_results, integration_results)
         
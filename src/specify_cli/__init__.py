@@ -26,7 +26,6 @@ import os
 import subprocess
 import sys
 import zipfile
-import tempfile
 import shutil
 import json
 from pathlib import Path
@@ -34,6 +33,7 @@ from typing import Optional, Tuple
 
 import typer
 import httpx
+from platformdirs import user_cache_dir
 from rich.console import Console
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
@@ -432,7 +432,71 @@ def init_git_repo(project_path: Path, quiet: bool = False) -> bool:
         os.chdir(original_cwd)
 
 
-def download_template_from_github(ai_assistant: str, download_dir: Path, *, script_type: str = "sh", verbose: bool = True, show_progress: bool = True, client: httpx.Client = None, debug: bool = False, github_token: str = None, repo_owner: str = None, repo_name: str = None) -> Tuple[Path, dict]:
+def _template_cache_dir() -> Path:
+    """Return the cache root for release metadata and template archives (SPECIFY_CACHE_DIR overrides the platform default)."""
+    override = os.getenv("SPECIFY_CACHE_DIR")
+    return Path(override) if override else Path(user_cache_dir("specify-cli"))
+
+
+def _fetch_latest_release(client: httpx.Client, repo_owner: str, repo_name: str, github_token: str = None, *, offline: bool = False) -> Tuple[dict, str]:
+    """Return (release JSON, source) for the latest release.
+
+    The JSON is cached with its ETag and revalidated with If-None-Match, so an unchanged
+    release costs a 304 instead of a full response. source is "network", "not-modified"
+    or "offline" (cache only, no request).
+    """
+    cache_file = _template_cache_dir() / "releases" / repo_owner / repo_name / "latest.json"
+    cached = None
+    try:
+        cached = json.loads(cache_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        pass  # missing or unreadable cache entry: fetch from GitHub
+
+    if offline:
+        if cached is None:
+            raise RuntimeError(f"No cached release information for {repo_owner}/{repo_name}; run once without --offline")
+        return cached["release"], "offline"
+
+    api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
+    headers = _github_auth_headers(github_token)
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+
+    response = client.get(
+        api_url,
+        timeout=30,
+        follow_redirects=True,
+        headers=headers,
+    )
+    status = response.status_code
+    if status == 304 and cached:
+        return cached["release"], "not-modified"
+    if status != 200:
+        msg = f"GitHub API returned {status} for {api_url}"
+        raise RuntimeError(msg)
+    try:
+        release_data = response.json()
+    except ValueError as je:
+        raise RuntimeError(f"Failed to parse release JSON: {je}\nRaw (truncated 400): {response.text[:400]}")
+
+    # A cache that cannot be written only costs the next run a full request
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = cache_file.with_name(f".{cache_file.name}.{os.getpid()}.tmp")
+        temp_file.write_text(json.dumps({"etag": response.headers.get("ETag"), "release": release_data}), encoding="utf-8")
+        os.replace(temp_file, cache_file)
+    except OSError:
+        pass
+    return release_data, "network"
+
+
+def download_template_from_github(ai_assistant: str, download_dir: Path, *, script_type: str = "sh", verbose: bool = True, show_progress: bool = True, client: httpx.Client = None, debug: bool = False, github_token: str = None, repo_owner: str = None, repo_name: str = None, offline: bool = False) -> Tuple[Path, dict]:
+    """Resolve the template asset of the latest release and return (zip path, metadata).
+
+    Archives are kept in the user cache keyed by owner/repo/tag/asset name and reused when
+    present; download_dir is only used when the cache directory is not writable. With
+    offline=True both the release information and the archive must already be cached.
+    """
     # Use provided repository parameters, fall back to environment variables, then defaults
     if repo_owner is None:
         # Always check environment variables first
@@ -444,27 +508,15 @@ def download_template_from_github(ai_assistant: str, download_dir: Path, *, scri
     
     if verbose:
         console.print("[cyan]Fetching latest release information...[/cyan]")
-    api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases/latest"
     
     try:
-        response = client.get(
-            api_url,
-            timeout=30,
-            follow_redirects=True,
-            headers=_github_auth_headers(github_token),
-        )
-        status = response.status_code
-        if status != 200:
-            msg = f"GitHub API returned {status} for {api_url}"
-            raise RuntimeError(msg)
-        try:
-            release_data = response.json()
-        except ValueError as je:
-            raise RuntimeError(f"Failed to parse release JSON: {je}\nRaw (truncated 400): {response.text[:400]}")
+        release_data, release_source = _fetch_latest_release(client, repo_owner, repo_name, github_token, offline=offline)
     except Exception as e:
         console.print(f"[red]Error fetching release information[/red]")
         console.print(Panel(str(e), title="Fetch Error", border_style="red"))
         raise typer.Exit(1)
+    if verbose and release_source != "network":
+        console.print(f"[cyan]Using cached release information ({release_source})[/cyan]")
     
     # Find the template asset for the specified AI assistant
     assets = release_data.get("assets", [])
@@ -509,10 +561,37 @@ def download_template_from_github(ai_assistant: str, download_dir: Path, *, scri
         console.print(f"[cyan]Size:[/cyan] {file_size:,} bytes")
         console.print(f"[cyan]Release:[/cyan] {release_data['tag_name']}")
 
-    zip_path = download_dir / filename
+    # Archives are immutable per release tag, so a cached file of the expected size is reused as-is
+    archive_dir = _template_cache_dir() / "assets" / repo_owner / repo_name / release_data["tag_name"]
+    try:
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        cached = True
+    except OSError:
+        archive_dir = download_dir
+        cached = False
+    zip_path = archive_dir / filename
+    metadata = {
+        "filename": filename,
+        "size": file_size,
+        "release": release_data["tag_name"],
+        "asset_url": download_url,
+        "cached": cached,
+        "reused": cached and zip_path.is_file() and zip_path.stat().st_size == file_size,
+        "release_source": release_source
+    }
+    if metadata["reused"]:
+        if verbose:
+            console.print(f"[cyan]Using cached template:[/cyan] {zip_path}")
+        return zip_path, metadata
+    if offline:
+        console.print(f"[red]Template {filename} ({release_data['tag_name']}) is not cached[/red]; run once without --offline")
+        raise typer.Exit(1)
+    
     if verbose:
         console.print(f"[cyan]Downloading template...[/cyan]")
     
+    # Download next to the final path and rename, so an interrupted download never looks cached
+    temp_path = zip_path.with_name(f".{filename}.{os.getpid()}.part")
     try:
         with client.stream(
             "GET",
@@ -525,7 +604,7 @@ def download_template_from_github(ai_assistant: str, download_dir: Path, *, scri
                 body_sample = response.text[:400]
                 raise RuntimeError(f"Download failed with {response.status_code}\nHeaders: {response.headers}\nBody (truncated): {body_sample}")
             total_size = int(response.headers.get('content-length', 0))
-            with open(zip_path, 'wb') as f:
+            with open(temp_path, 'wb') as f:
                 if total_size == 0:
                     for chunk in response.iter_bytes(chunk_size=8192):
                         f.write(chunk)
@@ -546,25 +625,74 @@ def download_template_from_github(ai_assistant: str, download_dir: Path, *, scri
                     else:
                         for chunk in response.iter_bytes(chunk_size=8192):
                             f.write(chunk)
+        os.replace(temp_path, zip_path)
     except Exception as e:
         console.print(f"[red]Error downloading template[/red]")
         detail = str(e)
-        if zip_path.exists():
-            zip_path.unlink()
+        if temp_path.exists():
+            temp_path.unlink()
         console.print(Panel(detail, title="Download Error", border_style="red"))
         raise typer.Exit(1)
     if verbose:
         console.print(f"Downloaded: {filename}")
-    metadata = {
-        "filename": filename,
-        "size": file_size,
-        "release": release_data["tag_name"],
-        "asset_url": download_url
-    }
     return zip_path, metadata
 
 
-def download_and_extract_template(project_path: Path, ai_assistant: str, script_type: str, is_current_dir: bool = False, *, verbose: bool = True, tracker: StepTracker | None = None, client: httpx.Client = None, debug: bool = False, github_token: str = None, repo_owner: str = None, repo_name: str = None) -> Path:
+def _zip_member_parts(name: str) -> list[str]:
+    """Split a zip member name into safe path parts (drops empty, '.' and '..' parts like ZipFile.extract)."""
+    return [part for part in name.replace("\\", "/").split("/") if part not in ("", ".", "..")]
+
+
+def _merge_zip_into(zip_ref: zipfile.ZipFile, target_dir: Path, *, verbose: bool = False) -> Tuple[int, bool]:
+    """Merge archive members into target_dir in a single pass and return (files written, flattened).
+
+    A single root directory (GitHub-style archive) is stripped on the fly. Existing
+    directories are merged and existing files overwritten; each file is written to a
+    temporary sibling and renamed into place, so a target file is never left half-written.
+    """
+    members = [(info, _zip_member_parts(info.filename)) for info in zip_ref.infolist()]
+    members = [(info, parts) for info, parts in members if parts]
+
+    # Strip the root only when every member lives below one top-level directory
+    roots = {parts[0] for _, parts in members}
+    flattened = len(roots) == 1 and all(len(parts) > 1 or info.is_dir() for info, parts in members)
+
+    written = 0
+    reported = set()
+    for info, parts in members:
+        if flattened:
+            parts = parts[1:]
+            if not parts:
+                continue
+        dest_path = target_dir.joinpath(*parts)
+
+        if verbose and parts[0] not in reported:
+            reported.add(parts[0])
+            top_level = target_dir / parts[0]
+            if top_level.exists():
+                label = "Merging directory" if top_level.is_dir() else "Overwriting file"
+                console.print(f"[yellow]{label}:[/yellow] {parts[0]}")
+
+        if info.is_dir():
+            dest_path.mkdir(parents=True, exist_ok=True)
+            continue
+
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = dest_path.with_name(f".{dest_path.name}.{os.getpid()}.tmp")
+        try:
+            with zip_ref.open(info) as source, open(temp_path, "wb") as target:
+                shutil.copyfileobj(source, target)
+            os.replace(temp_path, dest_path)
+        except BaseException:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise
+        written += 1
+
+    return written, flattened
+
+
+def download_and_extract_template(project_path: Path, ai_assistant: str, script_type: str, is_current_dir: bool = False, *, verbose: bool = True, tracker: StepTracker | None = None, client: httpx.Client = None, debug: bool = False, github_token: str = None, repo_owner: str = None, repo_name: str = None, offline: bool = False) -> Path:
     """Download the latest release and extract it to create a new project.
     Returns project_path. Uses tracker if provided (with keys: fetch, download, extract, cleanup)
     """
@@ -584,12 +712,14 @@ def download_and_extract_template(project_path: Path, ai_assistant: str, script_
             debug=debug,
             github_token=github_token,
             repo_owner=repo_owner,
-            repo_name=repo_name
+            repo_name=repo_name,
+            offline=offline
         )
         if tracker:
-            tracker.complete("fetch", f"release {meta['release']} ({meta['size']:,} bytes)")
+            release_detail = "" if meta['release_source'] == "network" else f", {meta['release_source']}"
+            tracker.complete("fetch", f"release {meta['release']} ({meta['size']:,} bytes{release_detail})")
             tracker.add("download", "Download template")
-            tracker.complete("download", meta['filename'])
+            tracker.complete("download", f"{meta['filename']} (cached)" if meta['reused'] else meta['filename'])
     except Exception as e:
         if tracker:
             tracker.error("fetch", str(e))
@@ -618,52 +748,19 @@ def download_and_extract_template(project_path: Path, ai_assistant: str, script_
             elif verbose:
                 console.print(f"[cyan]ZIP contains {len(zip_contents)} items[/cyan]")
             
-            # For current directory, extract to a temp location first
+            # For current directory, stream members straight to their final paths
             if is_current_dir:
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    temp_path = Path(temp_dir)
-                    zip_ref.extractall(temp_path)
-                    
-                    # Check what was extracted
-                    extracted_items = list(temp_path.iterdir())
-                    if tracker:
-                        tracker.start("extracted-summary")
-                        tracker.complete("extracted-summary", f"temp {len(extracted_items)} items")
-                    elif verbose:
-                        console.print(f"[cyan]Extracted {len(extracted_items)} items to temp location[/cyan]")
-                    
-                    # Handle GitHub-style ZIP with a single root directory
-                    source_dir = temp_path
-                    if len(extracted_items) == 1 and extracted_items[0].is_dir():
-                        source_dir = extracted_items[0]
-                        if tracker:
-                            tracker.add("flatten", "Flatten nested directory")
-                            tracker.complete("flatten")
-                        elif verbose:
-                            console.print(f"[cyan]Found nested directory structure[/cyan]")
-                    
-                    # Copy contents to current directory
-                    for item in source_dir.iterdir():
-                        dest_path = project_path / item.name
-                        if item.is_dir():
-                            if dest_path.exists():
-                                if verbose and not tracker:
-                                    console.print(f"[yellow]Merging directory:[/yellow] {item.name}")
-                                # Recursively copy directory contents
-                                for sub_item in item.rglob('*'):
-                                    if sub_item.is_file():
-                                        rel_path = sub_item.relative_to(item)
-                                        dest_file = dest_path / rel_path
-                                        dest_file.parent.mkdir(parents=True, exist_ok=True)
-                                        shutil.copy2(sub_item, dest_file)
-                            else:
-                                shutil.copytree(item, dest_path)
-                        else:
-                            if dest_path.exists() and verbose and not tracker:
-                                console.print(f"[yellow]Overwriting file:[/yellow] {item.name}")
-                            shutil.copy2(item, dest_path)
-                    if verbose and not tracker:
-                        console.print(f"[cyan]Template files merged into current directory[/cyan]")
+                written, flattened = _merge_zip_into(zip_ref, project_path, verbose=verbose and not tracker)
+                if tracker:
+                    tracker.start("extracted-summary")
+                    tracker.complete("extracted-summary", f"{written} files merged")
+                    if flattened:
+                        tracker.add("flatten", "Flatten nested directory")
+                        tracker.complete("flatten")
+                elif verbose:
+                    if flattened:
+                        console.print(f"[cyan]Found nested directory structure[/cyan]")
+                    console.print(f"[cyan]Template files merged into current directory[/cyan]")
             else:
                 # Extract directly to project directory (original behavior)
                 zip_ref.extractall(project_path)
@@ -711,8 +808,11 @@ def download_and_extract_template(project_path: Path, ai_assistant: str, script_
     finally:
         if tracker:
             tracker.add("cleanup", "Remove temporary archive")
-        # Clean up downloaded ZIP file
-        if zip_path.exists():
+        # Clean up downloaded ZIP file (cached archives are kept for the next init)
+        if meta['cached']:
+            if tracker:
+                tracker.skip("cleanup", "archive kept in cache")
+        elif zip_path.exists():
             zip_path.unlink()
             if tracker:
                 tracker.complete("cleanup")
@@ -778,6 +878,7 @@ def init(
     debug: bool = typer.Option(False, "--debug", help="Show verbose diagnostic output for network and extraction failures"),
     github_token: str = typer.Option(None, "--github-token", help="GitHub token to use for API requests (or set GH_TOKEN or GITHUB_TOKEN environment variable)"),
     from_repo: str = typer.Option(None, "--from", help="Repository to use for templates (e.g., git+https://github.com/owner/repo.git)"),
+    offline: bool = typer.Option(False, "--offline", help="Use only cached release information and template archives (no network access)"),
 ):
     """
     Initialize a new Specify project from the latest template.
@@ -805,6 +906,10 @@ def init(
         specify init --here --ai codex
         specify init --here
         specify init --here --from git+https://github.com/Sunwindsr/spec-kit.git --ai claude
+        specify init my-project --ai claude --offline
+    
+    Release information and template archives are cached in the user cache directory
+    (override with SPECIFY_CACHE_DIR) and reused by later runs.
     """
     # Show banner first
     show_banner()
@@ -976,7 +1081,7 @@ def init(
             local_ssl_context = ssl_context if verify else False
             local_client = httpx.Client(verify=local_ssl_context)
 
-            download_and_extract_template(project_path, selected_ai, selected_script, here, verbose=False, tracker=tracker, client=local_client, debug=debug, github_token=github_token, repo_owner=repo_owner, repo_name=repo_name)
+            download_and_extract_template(project_path, selected_ai, selected_script, here, verbose=False, tracker=tracker, client=local_client, debug=debug, github_token=github_token, repo_owner=repo_owner, repo_name=repo_name, offline=offline)
 
             # Ensure scripts are executable (POSIX)
             ensure_executable_scripts(project_path, tracker=tracker)
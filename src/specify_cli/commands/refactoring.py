@@ -14,6 +14,8 @@ from rich.tree import Tree
 from typing import Optional
 
 from ..validation.refactoring_validation import RefactoringValidationSystem
+from ..validation.baseline import ViolationBaseline
+from ..validation.progressive_state import ProgressiveState, PROGRESSIVE_PHASES
 
 app = typer.Typer(
     name="refactoring",
@@ -27,7 +29,9 @@ def validate(
     project_path: str = typer.Argument(".", help="Path to the refactoring project"),
     output_file: Optional[str] = typer.Option(None, "--output", "-o", help="Output file for validation report"),
     fail_on_error: bool = typer.Option(True, "--fail-on-error", help="Fail if any validation errors occur"),
-    verbose: bool = typer.Option(False, "--verbose", "-v", help="Show detailed validation information")
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Show detailed validation information"),
+    baseline_file: Optional[str] = typer.Option(None, "--baseline", help="Violation baseline file; only violations not in the baseline are reported"),
+    update_baseline: bool = typer.Option(False, "--update-baseline", help="Rewrite the baseline file with all current violations (requires --baseline)")
 ):
     """
     Validate a refactoring project for data reality and behavior preservation.
@@ -42,9 +46,15 @@ def validate(
     Example:
         specify refactoring validate ./my-project
         specify refactoring validate ./my-project --output report.md --verbose
+        specify refactoring validate ./my-project --baseline violations-baseline.json --update-baseline
+        specify refactoring validate ./my-project --baseline violations-baseline.json
     """
     project_path = Path(project_path)
     
+    if update_baseline and not baseline_file:
+        console.print("[red]Error: --update-baseline requires --baseline[/red]")
+        raise typer.Exit(1)
+    
     if not project_path.exists():
         console.print(f"[red]Error: Project path '{project_path}' does not exist[/red]")
         raise typer.Exit(1)
@@ -57,6 +67,15 @@ def validate(
     console.print(f"Project: [bold]{project_path.absolute()}[/bold]")
     console.print()
     
+    # 加载违规基线（刷新基线时不过滤，以便收集全部违规指纹）
+    violation_baseline = None
+    if baseline_file and not update_baseline:
+        try:
+            violation_baseline = ViolationBaseline.load(Path(baseline_file))
+        except (OSError, ValueError) as e:
+            console.print(f"[red]Error loading baseline: {str(e)}[/red]")
+            raise typer.Exit(1)
+    
     # 创建验证系统
     validation_system = RefactoringValidationSystem()
     
@@ -66,9 +85,14 @@ def validate(
         # 扫描源文件
         with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console) as progress:
             task = progress.add_task("扫描源文件...", total=None)
-            validation_results = validation_system.validate_refactoring_project(project_path)
+            validation_results = validation_system.validate_refactoring_project(project_path, baseline=violation_baseline)
             progress.update(task, description=f"✅ 找到 {validation_results['total_files']} 个文件")
         
+        if update_baseline:
+            new_baseline = ViolationBaseline(validation_system.violation_fingerprints)
+            new_baseline.save(Path(baseline_file))
+            console.print(f"[green]✅ 基线已更新: {baseline_file} ({len(new_baseline)} 条指纹)[/green]")
+        
         # 检查重构宪法合规性
         constitution_template = Path.cwd() / "templates" / "constitution-refactoring-template.md"
         constitution_file = Path.cwd() / "memory" / "constitution-refactoring.md"
@@ -122,6 +146,8 @@ def validate(
     result_table.add_row("Failed Validations", str(validation_results['failed_validations']), "❌" if validation_results['failed_validations'] > 0 else "✅")
     result_table.add_row("Warnings", str(validation_results['warnings']), "⚠️" if validation_results['warnings'] > 0 else "✅")
     result_table.add_row("Errors", str(len(validation_results['errors'])), "❌" if validation_results['errors'] else "✅")
+    if violation_baseline is not None:
+        result_table.add_row("Baseline Suppressed", str(validation_results['baseline_suppressed']), "🗂️")
     
     # 显示宪法合规状态
     if 'constitution_compliance' in validation_results:
@@ -257,7 +283,9 @@ Use `specify refactoring validate --baseline {refactored_path}` to check against
 def progressive(
     phase: str = typer.Argument(..., help="Phase to execute (baseline, compatibility, component-replace, parallel-validation)"),
     component: Optional[str] = typer.Option(None, "--component", help="Component name for phase-specific operations"),
-    force: bool = typer.Option(False, "--force", help="Force execution without phase validation")
+    project_path: str = typer.Option(".", "--project", help="Path to the refactoring project (phase state is kept in .specify/state/progressive.json)"),
+    force: bool = typer.Option(False, "--force", help="Force execution without phase validation"),
+    original_path: Optional[str] = typer.Option(None, "--original", help="Path to the original implementation (compared against the project in parallel-validation)")
 ):
     """
     Execute progressive refactoring phases with validation.
@@ -268,13 +296,17 @@ def progressive(
     3. Update phase status
     4. Provide rollback capability
     
+    Phase state is shared with scripts/progressive_refactoring.py: completed phases are
+    skipped unless --force is given.
+    
     Example:
         specify refactoring progressive baseline
         specify refactoring progressive compatibility --component ViewAppFile
         specify refactoring progressive component-replace --component ViewAppFile --force
+        specify refactoring progressive parallel-validation --component ViewAppFile --original ../legacy-app
     """
     
-    valid_phases = ["baseline", "compatibility", "component-replace", "parallel-validation"]
+    valid_phases = PROGRESSIVE_PHASES
     
     if phase not in valid_phases:
         console.print(f"[red]Error: Invalid phase '{phase}'. Valid phases are: {', '.join(valid_phases)}[/red]")
@@ -311,14 +343,68 @@ def progressive(
     
     console.print(f"[cyan]📋 阶段要求: {phase_requirements[phase]}[/cyan]")
     
-    # TODO: 实现渐进式重构逻辑
-    console.print("[yellow]Progressive refactoring feature coming soon...[/yellow]")
+    # 读取持久化的阶段状态（与 progressive_refactoring.py 共用同一状态文件）
+    state = ProgressiveState(Path(project_path))
+    try:
+        components = state.load()['components']
+    except ValueError as e:
+        console.print(f"[red]Error: {str(e)}[/red]")
+        raise typer.Exit(1)
+    
+    state_table = Table(title="Progressive Refactoring State", show_header=True, header_style="bold magenta")
+    state_table.add_column("Component", style="cyan")
+    for phase_name in valid_phases:
+        state_table.add_column(phase_name, style="white")
+    
+    shown_components = [component] if component else sorted(components)
+    for component_name in shown_components:
+        entry = components.get(component_name) or state.component(component_name)
+        state_table.add_row(component_name, *[entry['phases'][phase_name]['status'] for phase_name in valid_phases])
+    
+    console.print()
+    console.print(state_table if shown_components else "[yellow]尚无组件的阶段状态记录[/yellow]")
+    
+    if not component:
+        console.print("[cyan]💡 使用 --component 指定组件以执行该阶段[/cyan]")
+        return
+    
+    entry = state.component(component)
+    if entry['phases'][phase]['status'] == "completed" and not force:
+        console.print(f"[green]⏭️ 组件 {component} 的阶段 {phase} 已完成（{entry['phases'][phase]['completed_at']}），跳过[/green]")
+        return
+    
+    if valid_phases.index(phase) > entry['current_phase'] and not force:
+        console.print(f"[red]❌ 必须先完成阶段 {valid_phases[entry['current_phase']]}[/red]")
+        raise typer.Exit(1)
+    
+    # 执行阶段（状态由脚本写回同一状态文件）
+    # 脚本位于仓库根目录的scripts/（src/specify_cli/commands/ 向上三级）
+    script_path = Path(__file__).resolve().parents[3] / "scripts" / "progressive_refactoring.py"
+    if not script_path.exists():
+        console.print(f"[red]Error: Progressive refactoring script not found: {script_path}[/red]")
+        raise typer.Exit(1)
+    
+    import subprocess
+    import sys
+    
+    cmd = [sys.executable, str(script_path), phase, "--component", component, "--project", str(project_path)]
+    if force:
+        cmd.append("--force")
+    if original_path:
+        cmd.extend(["--original", original_path])
+    
+    result = subprocess.run(cmd)
+    if result.returncode != 0:
+        raise typer.Exit(result.returncode)
 
 @app.command()
 def api_contract(
     source_path: str = typer.Argument(..., help="Source code path to extract API contracts from"),
     output_file: Optional[str] = typer.Option(None, "--output", "-o", help="Output file for API contract report"),
     json_output: Optional[str] = typer.Option(None, "--json", help="Also save JSON data to this file"),
+    ndjson_output: Optional[str] = typer.Option(None, "--ndjson", help="Stream extracted records to this NDJSON file"),
+    cache_file: Optional[str] = typer.Option(None, "--cache", help="Reuse/save the extraction result shared with extract-code-definitions.py"),
+    diff_snapshot: Optional[str] = typer.Option(None, "--diff", help="Compare against a previous contract JSON snapshot; exits with code 2 on breaking changes"),
     fail_on_extraction_error: bool = typer.Option(True, "--fail-on-error", help="Fail if API contract extraction fails")
 ):
     """
@@ -336,6 +422,10 @@ def api_contract(
     Example:
         specify refactoring api-contract ./angular-project --output api-contracts.md
         specify refactoring api-contract ./angular-project --output api-contracts.md --json data.json
+        specify refactoring api-contract ./angular-project --output api-contracts.md --ndjson data.ndjson
+        specify refactoring api-contract ./angular-project --output api-contracts.md --cache .specify/cache/extraction.json
+        specify refactoring api-contract ./react-project --diff angular-contracts.json
+        specify refactoring api-contract react-contracts.json --diff angular-contracts.json
     """
     source_path = Path(source_path)
     
@@ -346,7 +436,7 @@ def api_contract(
     console.print(f"[cyan]🔍 提取API契约: {source_path}[/cyan]")
     
     # Import and run the extraction script
-    script_path = Path(__file__).parent.parent.parent / "scripts" / "extract-api-contracts.py"
+    script_path = Path(__file__).resolve().parents[3] / "scripts" / "extract-api-contracts.py"
     
     if not script_path.exists():
         console.print(f"[red]Error: Extraction script not found: {script_path}[/red]")
@@ -365,9 +455,30 @@ def api_contract(
         if json_output:
             cmd.extend(["--json", json_output])
         
+        if ndjson_output:
+            cmd.extend(["--ndjson", ndjson_output])
+        
+        if cache_file:
+            cmd.extend(["--cache", cache_file])
+        
+        if diff_snapshot:
+            cmd.extend(["--diff", diff_snapshot])
+        
         # Run extraction
         result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8')
         
+        if diff_snapshot and result.returncode in (0, 2):
+            for line in result.stdout.split('\n'):
+                if line.strip().startswith(('📊', '-', '✅', '❌')):
+                    console.print(f"[cyan]{line}[/cyan]")
+            
+            if result.returncode == 2:
+                console.print("[red]❌ 契约快照存在破坏性变更，直接替换要求未满足[/red]")
+                raise typer.Exit(2)
+            
+            console.print("[green]✅ 契约快照一致，无破坏性变更[/green]")
+            return
+        
         if result.returncode != 0:
             console.print(f"[red]Error: API contract extraction failed[/red]")
             console.print(f"[red]{result.stderr}[/red]")
@@ -384,6 +495,9 @@ def api_contract(
         if json_output:
             console.print(f"[cyan]📊 JSON数据: {json_output}[/cyan]")
         
+        if ndjson_output:
+            console.print(f"[cyan]📊 NDJSON数据: {ndjson_output}[/cyan]")
+        
         # Show summary from output
         if result.stdout:
             lines = result.stdout.split('\n')
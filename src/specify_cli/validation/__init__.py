@@ -10,6 +10,11 @@ from .refactoring_validation import (
     ValidationResult,
     ValidationSeverity
 )
+from .baseline import ViolationBaseline
+from .progressive_state import ProgressiveState, PROGRESSIVE_PHASES
+from .component_index import ComponentIndex
+from .parallel_validation import ParallelValidator, ParallelValidationReport
+from .checkpoints import PhaseCheckpointStore
 
 __all__ = [
     'RefactoringValidationSystem',
@@ -17,5 +22,12 @@ __all__ = [
     'BehaviorPreservationValidator',
     'ProgressiveRefactoringValidator',
     'ValidationResult',
-    'ValidationSeverity'
+    'ValidationSeverity',
+    'ViolationBaseline',
+    'ProgressiveState',
+    'PROGRESSIVE_PHASES',
+    'ComponentIndex',
+    'ParallelValidator',
+    'ParallelValidationReport',
+    'PhaseCheckpointStore'
 ]
\ No newline at end of file
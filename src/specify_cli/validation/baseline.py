@@ -0,0 +1,73 @@
+"""
+违规基线 - 记录既有违规的指纹，使验证只报告新增问题
+
+遗留代码库通常带有大量既有的TODO/mock命中，每次全部输出会淹没真正的新问题。
+基线文件保存违规指纹（规则、文件、规范化代码片段的哈希），加载为哈希集合，
+判断一条违规是否已知为O(1)。
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Iterable, Optional, Set, Union
+
+
+class ViolationBaseline:
+    """违规指纹基线"""
+    
+    VERSION = 1
+    
+    def __init__(self, fingerprints: Optional[Iterable[str]] = None):
+        self.fingerprints: Set[str] = set(fingerprints or ())
+    
+    @staticmethod
+    def fingerprint(rule: str, file_path: Union[str, Path], snippet: str) -> str:
+        """计算违规指纹
+        
+        file_path应为相对于项目根目录的路径（统一为'/'分隔），使基线在不同检出位置通用；
+        代码片段折叠空白后参与哈希，缩进或空白调整不会产生新指纹。
+        """
+        normalized_path = Path(file_path).as_posix()
+        normalized_snippet = ' '.join(snippet.split())
+        key = f"{rule}\0{normalized_path}\0{normalized_snippet}"
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+    
+    def __contains__(self, fingerprint: str) -> bool:
+        return fingerprint in self.fingerprints
+    
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+    
+    def add(self, fingerprint: str):
+        """登记一条违规指纹"""
+        self.fingerprints.add(fingerprint)
+    
+    @classmethod
+    def load(cls, baseline_path: Path) -> 'ViolationBaseline':
+        """加载基线文件，文件不存在时返回空基线"""
+        baseline_path = Path(baseline_path)
+        if not baseline_path.exists():
+            return cls()
+        
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        if data.get('version') != cls.VERSION:
+            raise ValueError(f"不支持的基线版本: {data.get('version')} ({baseline_path})")
+        
+        return cls(data.get('fingerprints', []))
+    
+    def save(self, baseline_path: Path):
+        """写入基线文件（指纹排序后输出，便于版本控制比较；临时文件替换保证原子性）"""
+        baseline_path = Path(baseline_path)
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        temp_path = baseline_path.with_name(f".{baseline_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': self.VERSION,
+                'fingerprints': sorted(self.fingerprints)
+            }, f, indent=2)
+            f.write('\n')
+        os.replace(temp_path, baseline_path)
@@ -0,0 +1,216 @@
+"""
+阶段检查点 - 阶段完成时保存组件文件，回滚时恢复
+
+回滚阶段状态时，兼容层和组件替换阶段产生的文件仍留在磁盘上。本模块在每个阶段完成时
+为组件的文件集合记录检查点：
+
+- 文件内容存入内容寻址的对象库（.specify/checkpoints/objects/<sha1前2位>/<sha1>），
+  相同内容只存一份；对象由工作区文件复制而来，工作区文件被原地修改不会影响检查点。
+- 每个检查点目录（.specify/checkpoints/components/<组件>/<阶段>/files/）中的文件是对象的硬链接，
+  未变化的文件在各检查点之间共享同一对象，不占额外空间；文件系统不支持硬链接时退化为复制。
+- 清单（manifest.json）记录每个文件的sha1、大小和修改时间。记录和恢复时大小与修改时间
+  一致的文件直接复用清单中的sha1，不重新计算哈希；恢复时只写回发生变化的文件（并还原
+  修改时间），删除检查点之后新增的文件，耗时与变化的文件数成正比。
+"""
+
+import os
+import re
+import json
+import shutil
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class PhaseCheckpointStore:
+    """组件阶段检查点存储"""
+    
+    VERSION = 1
+    ROOT = Path(".specify") / "checkpoints"
+    HASH_CHUNK_SIZE = 1024 * 1024
+    
+    def __init__(self, project_path: Path):
+        self.project_path = Path(project_path)
+        self.root = self.project_path / self.ROOT
+        self.objects_path = self.root / "objects"
+    
+    def has(self, component: str, phase: str) -> bool:
+        """组件的阶段是否有检查点"""
+        return self._manifest_path(component, phase).exists()
+    
+    def record(self, component: str, phase: str, files: Iterable[Path]) -> Dict[str, Any]:
+        """记录组件文件集合的检查点，返回清单"""
+        previous = self._latest_entries(component)
+        checkpoint_path = self._checkpoint_path(component, phase)
+        files_path = checkpoint_path / "files"
+        if files_path.exists():
+            shutil.rmtree(files_path)
+        
+        entries: Dict[str, Dict[str, Any]] = {}
+        linked = copied = 0
+        
+        for file_path in sorted(Path(f) for f in files):
+            relative_path = file_path.relative_to(self.project_path).as_posix()
+            stat = file_path.stat()
+            
+            # 大小和修改时间未变化时沿用已知的sha1
+            known = previous.get(relative_path)
+            if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+                sha1 = known["sha1"]
+            else:
+                sha1 = self._hash_file(file_path)
+            
+            object_path = self._store_object(file_path, sha1)
+            if self._link_or_copy(object_path, files_path / relative_path):
+                linked += 1
+            else:
+                copied += 1
+            
+            entries[relative_path] = {"sha1": sha1, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        
+        manifest = {
+            "version": self.VERSION,
+            "component": component,
+            "phase": phase,
+            "created_at": datetime.now().isoformat(),
+            "linked": linked,
+            "copied": copied,
+            "files": entries
+        }
+        self._write_json(self._manifest_path(component, phase), manifest)
+        return manifest
+    
+    def restore(self, component: str, phase: str, current_files: Iterable[Path]) -> Tuple[List[str], List[str]]:
+        """把组件文件恢复到检查点，返回 (恢复的文件, 删除的文件)
+        
+        current_files为组件当前的文件集合，其中不在检查点中的文件（检查点之后新增）被删除。
+        """
+        manifest = self._load_manifest(component, phase)
+        if manifest is None:
+            raise FileNotFoundError(f"组件 {component} 没有阶段 {phase} 的检查点")
+        
+        entries = manifest["files"]
+        restored: List[str] = []
+        removed: List[str] = []
+        
+        for relative_path, entry in entries.items():
+            target_path = self.project_path / relative_path
+            if self._unchanged(target_path, entry):
+                continue
+            
+            object_path = self._object_path(entry["sha1"])
+            if not object_path.exists():
+                raise FileNotFoundError(f"检查点对象缺失: {object_path}（{relative_path}）")
+            
+            target_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = target_path.with_name(f".{target_path.name}.{os.getpid()}.tmp")
+            shutil.copyfile(object_path, temp_path)
+            os.utime(temp_path, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+            os.replace(temp_path, target_path)
+            restored.append(relative_path)
+        
+        for file_path in sorted(Path(f) for f in current_files):
+            relative_path = file_path.relative_to(self.project_path).as_posix()
+            if relative_path not in entries and file_path.exists():
+                file_path.unlink()
+                removed.append(relative_path)
+        
+        return restored, removed
+    
+    def discard(self, component: str, phases: Iterable[str]):
+        """删除组件指定阶段的检查点（对象库中的对象保留，供其他检查点共享）"""
+        for phase in phases:
+            checkpoint_path = self._checkpoint_path(component, phase)
+            if checkpoint_path.exists():
+                shutil.rmtree(checkpoint_path)
+    
+    def _unchanged(self, target_path: Path, entry: Dict[str, Any]) -> bool:
+        """工作区文件与检查点一致（大小和修改时间一致，或大小一致且内容哈希相同）"""
+        try:
+            stat = target_path.stat()
+        except FileNotFoundError:
+            return False
+        
+        if stat.st_size != entry["size"]:
+            return False
+        if stat.st_mtime_ns == entry["mtime_ns"]:
+            return True
+        return self._hash_file(target_path) == entry["sha1"]
+    
+    def _latest_entries(self, component: str) -> Dict[str, Dict[str, Any]]:
+        """组件最近一次检查点的文件条目（用于跳过未变化文件的哈希计算）"""
+        component_path = self.root / "components" / self._safe_name(component)
+        latest: Optional[Dict[str, Any]] = None
+        
+        if component_path.is_dir():
+            for manifest_path in component_path.glob("*/manifest.json"):
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                if latest is None or manifest["created_at"] > latest["created_at"]:
+                    latest = manifest
+        
+        return latest["files"] if latest else {}
+    
+    def _store_object(self, file_path: Path, sha1: str) -> Path:
+        """把文件内容存入对象库（已存在时直接返回；临时文件替换保证原子性）"""
+        object_path = self._object_path(sha1)
+        if not object_path.exists():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = object_path.with_name(f".{sha1}.{os.getpid()}.tmp")
+            shutil.copyfile(file_path, temp_path)
+            os.replace(temp_path, object_path)
+        return object_path
+    
+    @staticmethod
+    def _link_or_copy(source_path: Path, target_path: Path) -> bool:
+        """硬链接到目标路径，不支持时复制；返回是否为硬链接"""
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(source_path, target_path)
+            return True
+        except (OSError, AttributeError, NotImplementedError):
+            shutil.copyfile(source_path, target_path)
+            return False
+    
+    def _hash_file(self, file_path: Path) -> str:
+        digest = hashlib.sha1()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _object_path(self, sha1: str) -> Path:
+        return self.objects_path / sha1[:2] / sha1
+    
+    @staticmethod
+    def _safe_name(component: str) -> str:
+        return re.sub(r'[^\w.-]', '_', component)
+    
+    def _checkpoint_path(self, component: str, phase: str) -> Path:
+        return self.root / "components" / self._safe_name(component) / phase
+    
+    def _manifest_path(self, component: str, phase: str) -> Path:
+        return self._checkpoint_path(component, phase) / "manifest.json"
+    
+    def _load_manifest(self, component: str, phase: str) -> Optional[Dict[str, Any]]:
+        manifest_path = self._manifest_path(component, phase)
+        if not manifest_path.exists():
+            return None
+        
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        
+        if manifest.get('version') != self.VERSION:
+            raise ValueError(f"不支持的检查点版本: {manifest.get('version')} ({manifest_path})")
+        
+        return manifest
+    
+    def _write_json(self, path: Path, data: Dict[str, Any]):
+        """先写临时文件再原子替换"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        os.replace(temp_path, path)
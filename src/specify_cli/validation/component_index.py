@@ -0,0 +1,81 @@
+"""
+组件索引 - 把组件名映射到其相关文件集合
+
+渐进式重构的每个阶段只针对一个组件，却对整个项目做验证。组件索引只遍历一次目录树
+（只看文件名，不读取文件内容），把每个文件按文件名归到组件下：组件实现、模板/样式、
+测试、hooks（useXxx）和兼容层适配文件（Xxx-adapter/-interface/-validator），
+之后按组件名查询文件集合为O(1)。
+
+组件名按"去掉非字母数字字符并转小写"规范化，因此 ViewAppFile、view-app-file.component.ts、
+useViewAppFile.ts、ViewAppFile-adapter.ts 都归到同一个组件。
+"""
+
+import os
+import re
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class ComponentIndex:
+    """组件名 -> 相关文件列表"""
+    
+    # 遍历时跳过的依赖/构建产物/工具目录
+    EXCLUDED_DIRS = {'node_modules', 'bower_components', 'dist', 'build', 'out', 'coverage',
+                     '.git', '.angular', '.next', '.nuxt', '.cache', '.specify'}
+    
+    # 兼容层文件名后缀（compatibility/<Component>-adapter.ts 等）
+    COMPATIBILITY_SUFFIXES = ('-adapter', '-interface', '-validator')
+    
+    # hooks命名：useXxx（use之后必须是大写字母，避免误伤user.ts之类的文件）
+    HOOK_PATTERN = re.compile(r'^use(?=[A-Z])')
+    
+    def __init__(self, files_by_component: Dict[str, List[Path]], names: Optional[Dict[str, str]] = None):
+        self.files_by_component = files_by_component
+        # 组件键 -> 显示名（首个文件去掉扩展名、hooks前缀和兼容层后缀后的文件名）
+        self.names = names or {key: key for key in files_by_component}
+    
+    @staticmethod
+    def normalize(name: str) -> str:
+        """规范化组件名"""
+        return re.sub(r'[^0-9a-z]', '', name.lower())
+    
+    @classmethod
+    def component_name(cls, filename: str) -> str:
+        """文件名对应的组件名：去掉所有扩展名（.component.ts、.test.tsx等）、hooks前缀和兼容层后缀"""
+        base = filename.split('.', 1)[0]
+        for suffix in cls.COMPATIBILITY_SUFFIXES:
+            if base.endswith(suffix):
+                base = base[:-len(suffix)]
+                break
+        return cls.HOOK_PATTERN.sub('', base)
+    
+    @classmethod
+    def component_key(cls, filename: str) -> str:
+        """文件名对应的组件键（规范化的组件名）"""
+        return cls.normalize(cls.component_name(filename))
+    
+    @classmethod
+    def build(cls, project_path: Path) -> 'ComponentIndex':
+        """遍历一次项目目录构建索引（目录和文件名按字典序）"""
+        files_by_component: Dict[str, List[Path]] = {}
+        names: Dict[str, str] = {}
+        
+        for root, dirnames, filenames in os.walk(project_path):
+            dirnames[:] = sorted(d for d in dirnames if d not in cls.EXCLUDED_DIRS)
+            for filename in sorted(filenames):
+                name = cls.component_name(filename)
+                key = cls.normalize(name)
+                if key:
+                    files_by_component.setdefault(key, []).append(Path(root) / filename)
+                    names.setdefault(key, name)
+        
+        return cls(files_by_component, names)
+    
+    def match(self, pattern: str) -> List[str]:
+        """显示名匹配通配符模式的组件（按名称排序）"""
+        return sorted(name for name in self.names.values() if fnmatchcase(name, pattern))
+    
+    def files_for(self, component: str) -> List[Path]:
+        """组件的相关文件（未找到时为空列表）"""
+        return list(self.files_by_component.get(self.normalize(component), []))
@@ -0,0 +1,268 @@
+"""
+并行验证 - 同时验证重构前后的两套实现并比较行为
+
+渐进式重构的parallel-validation阶段需要确认重构后的实现与原实现行为一致。本模块为
+原实现和重构实现各开一个进程池，两棵目录树同时分析：每个文件提取API调用、接口定义
+和真实性规则结果，以紧凑元组回传。两侧结果按相对路径排序后在一次归并遍历中比较，
+报告行为差异（API调用/接口缺失或新增、规则结果退化或修复）以及两侧各自的耗时。
+"""
+
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .refactoring_validation import (
+    RealityValidator,
+    BehaviorPreservationValidator,
+    RefactoringValidationSystem,
+    ValidationSeverity
+)
+
+
+# API调用：fetch('/api/x')、axios.get(`/api/${id}`)、this.http.get<T>('/api/x') 等
+API_CALL_PATTERN = re.compile(
+    r"\b(fetch|axios(?:\.(?:get|post|put|delete|patch))?|(?:this\.)?http(?:Client)?\.(?:get|post|put|delete|patch))"
+    r"\s*(?:<[^>()]*>)?\s*\(\s*([`'\"])(.*?)\2"
+)
+
+# 模板字符串中的插值（变量名在重构中可能改变，比较时统一为{}）
+TEMPLATE_EXPRESSION_PATTERN = re.compile(r'\$\{[^}]*\}')
+
+# 单个文件的分析结果：(API调用, 接口定义, 规则结果)，规则结果为 (规则, 是否通过, 严重程度)
+FileAnalysis = Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[Tuple[str, bool, str], ...]]
+
+
+@dataclass
+class TreeTiming:
+    """单侧目录树的分析统计"""
+    path: str
+    files: int
+    seconds: float
+
+
+@dataclass
+class Divergence:
+    """一条行为差异"""
+    kind: str        # api_call / interface / rule
+    change: str      # missing / added / regressed / fixed
+    item: str
+    file: str
+    severity: str    # ValidationSeverity的值
+
+
+@dataclass
+class ParallelValidationReport:
+    """并行验证报告"""
+    original: TreeTiming
+    refactored: TreeTiming
+    wall_seconds: float
+    merge_seconds: float
+    divergences: List[Divergence] = field(default_factory=list)
+    
+    def count(self, severity: ValidationSeverity) -> int:
+        return sum(1 for d in self.divergences if d.severity == severity.value)
+    
+    @property
+    def passed(self) -> bool:
+        """没有错误级别的差异即通过（新增API调用/接口为警告，规则修复为信息）"""
+        return self.count(ValidationSeverity.ERROR) == 0
+    
+    def to_dict(self, include_timing: bool = True) -> Dict[str, Any]:
+        """转换为字典；include_timing=False时只保留比较结果（用于计算结果摘要）"""
+        data: Dict[str, Any] = {
+            "passed": self.passed,
+            "files": {"original": self.original.files, "refactored": self.refactored.files},
+            "errors": self.count(ValidationSeverity.ERROR),
+            "warnings": self.count(ValidationSeverity.WARNING),
+            "divergences": [asdict(d) for d in self.divergences]
+        }
+        if include_timing:
+            data["timing"] = {
+                "original": asdict(self.original),
+                "refactored": asdict(self.refactored),
+                "wall_seconds": self.wall_seconds,
+                "merge_seconds": self.merge_seconds
+            }
+        return data
+
+
+class ParallelValidator:
+    """原实现与重构实现的并行验证器"""
+    
+    MAX_CHUNK_SIZE = 256
+    
+    def __init__(self, jobs: int = 1):
+        # 每棵目录树的进程数（0表示CPU核数）
+        self.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    
+    def validate(self, original_path: Path, refactored_path: Path,
+                 original_files: Optional[Iterable[Path]] = None,
+                 refactored_files: Optional[Iterable[Path]] = None) -> ParallelValidationReport:
+        """并行分析两棵目录树并比较；未提供文件列表时扫描整棵树的源代码文件"""
+        original_path = Path(original_path)
+        refactored_path = Path(refactored_path)
+        original_list = self._relative_files(original_path, original_files)
+        refactored_list = self._relative_files(refactored_path, refactored_files)
+        
+        start = time.perf_counter()
+        original_results, original_seconds, refactored_results, refactored_seconds = self._analyze_trees(
+            original_path, original_list, refactored_path, refactored_list
+        )
+        wall_seconds = time.perf_counter() - start
+        
+        merge_start = time.perf_counter()
+        divergences = self._merge(original_list, original_results, refactored_list, refactored_results)
+        merge_seconds = time.perf_counter() - merge_start
+        
+        return ParallelValidationReport(
+            original=TreeTiming(str(original_path), len(original_list), original_seconds),
+            refactored=TreeTiming(str(refactored_path), len(refactored_list), refactored_seconds),
+            wall_seconds=wall_seconds,
+            merge_seconds=merge_seconds,
+            divergences=divergences
+        )
+    
+    def _relative_files(self, root: Path, files: Optional[Iterable[Path]]) -> List[str]:
+        """源代码文件的相对路径（'/'分隔，排序）"""
+        if files is None:
+            files = RefactoringValidationSystem()._scan_source_files(root)
+        extensions = RefactoringValidationSystem.SOURCE_EXTENSIONS
+        return sorted({
+            Path(f).relative_to(root).as_posix()
+            for f in files
+            if Path(f).suffix in extensions
+        })
+    
+    def _analyze_trees(self, original_path: Path, original_list: List[str],
+                       refactored_path: Path, refactored_list: List[str]):
+        """两棵目录树各用一个进程池同时分析，返回两侧的结果列表和各自耗时"""
+        sides = [(original_path, original_list), (refactored_path, refactored_list)]
+        executors = []
+        side_futures = []
+        side_of = {}
+        finished_at = [0.0, 0.0]
+        
+        start = time.perf_counter()
+        try:
+            for side, (root, relative_files) in enumerate(sides):
+                futures = []
+                if relative_files:
+                    executor = ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker)
+                    executors.append(executor)
+                    chunk_size = max(1, min(self.MAX_CHUNK_SIZE, len(relative_files) // (self.jobs * 4)))
+                    for i in range(0, len(relative_files), chunk_size):
+                        future = executor.submit(_analyze_chunk, str(root), relative_files[i:i + chunk_size])
+                        side_of[future] = side
+                        futures.append(future)
+                side_futures.append(futures)
+            
+            # 记录每侧最后一块完成的时间作为该侧耗时
+            for future in as_completed(side_of):
+                finished_at[side_of[future]] = time.perf_counter() - start
+            results = [[analysis for future in futures for analysis in future.result()] for futures in side_futures]
+        finally:
+            for executor in executors:
+                executor.shutdown()
+        
+        return results[0], finished_at[0], results[1], finished_at[1]
+    
+    def _merge(self, original_list: List[str], original_results: List[FileAnalysis],
+               refactored_list: List[str], refactored_results: List[FileAnalysis]) -> List[Divergence]:
+        """按相对路径归并两侧结果，一次遍历完成比较
+        
+        规则结果逐文件比较（重构侧新增的失败为退化，原侧失败在重构侧消失为修复）；
+        API调用和接口定义汇总为两侧集合后比较，文件移动或拆分不会产生误报。
+        """
+        divergences: List[Divergence] = []
+        original_items: Dict[str, Dict[str, str]] = {"api_call": {}, "interface": {}}
+        refactored_items: Dict[str, Dict[str, str]] = {"api_call": {}, "interface": {}}
+        empty: FileAnalysis = ((), (), ())
+        
+        i = j = 0
+        while i < len(original_list) or j < len(refactored_list):
+            if j == len(refactored_list) or (i < len(original_list) and original_list[i] < refactored_list[j]):
+                path, original, refactored = original_list[i], original_results[i], empty
+                i += 1
+            elif i == len(original_list) or refactored_list[j] < original_list[i]:
+                path, original, refactored = refactored_list[j], empty, refactored_results[j]
+                j += 1
+            else:
+                path, original, refactored = original_list[i], original_results[i], refactored_results[j]
+                i += 1
+                j += 1
+            
+            for items, analysis in ((original_items, original), (refactored_items, refactored)):
+                for api_call in analysis[0]:
+                    items["api_call"].setdefault(api_call, path)
+                for interface in analysis[1]:
+                    items["interface"].setdefault(interface, path)
+            
+            original_failures = {(rule, severity) for rule, passed, severity in original[2] if not passed}
+            refactored_failures = {(rule, severity) for rule, passed, severity in refactored[2] if not passed}
+            for rule, severity in sorted(refactored_failures - original_failures):
+                divergences.append(Divergence("rule", "regressed", f"{rule}:{severity}", path, ValidationSeverity.ERROR.value))
+            for rule, severity in sorted(original_failures - refactored_failures):
+                divergences.append(Divergence("rule", "fixed", f"{rule}:{severity}", path, ValidationSeverity.INFO.value))
+        
+        for kind in ("api_call", "interface"):
+            original_kind, refactored_kind = original_items[kind], refactored_items[kind]
+            for item in sorted(original_kind.keys() - refactored_kind.keys()):
+                divergences.append(Divergence(kind, "missing", item, original_kind[item], ValidationSeverity.ERROR.value))
+            for item in sorted(refactored_kind.keys() - original_kind.keys()):
+                divergences.append(Divergence(kind, "added", item, refactored_kind[item], ValidationSeverity.WARNING.value))
+        
+        return divergences
+
+
+def extract_api_calls(code: str) -> Tuple[str, ...]:
+    """提取API调用（调用方式 + 规范化URL），去重排序"""
+    calls = set()
+    for match in API_CALL_PATTERN.finditer(code):
+        callee = match.group(1)
+        if callee.startswith('this.'):
+            callee = callee[len('this.'):]
+        url = TEMPLATE_EXPRESSION_PATTERN.sub('{}', match.group(3))
+        calls.add(f"{callee} {url}")
+    return tuple(sorted(calls))
+
+
+# 进程池工作进程的验证器（由_init_worker在每个工作进程中创建一次）
+_worker_reality_validator: Optional[RealityValidator] = None
+_worker_behavior_validator: Optional[BehaviorPreservationValidator] = None
+
+def _init_worker():
+    """进程池初始化：创建工作进程的验证器"""
+    global _worker_reality_validator, _worker_behavior_validator
+    _worker_reality_validator = RealityValidator()
+    _worker_behavior_validator = BehaviorPreservationValidator()
+
+def _analyze_chunk(root: str, relative_files: List[str]) -> List[FileAnalysis]:
+    """工作进程：分析一批文件，按输入顺序返回 (API调用, 接口定义, 规则结果)"""
+    results = []
+    
+    for relative_file in relative_files:
+        try:
+            with open(os.path.join(root, relative_file), 'r', encoding='utf-8') as f:
+                code = f.read()
+        except Exception:
+            results.append(((), (), (("read", False, ValidationSeverity.ERROR.value),)))
+            continue
+        
+        # 接口名折叠空白并去掉赋值号，使格式调整不产生差异
+        interfaces = tuple(sorted({
+            re.sub(r'\s*=$', '', ' '.join(name.split()))
+            for name in _worker_behavior_validator._extract_interfaces(code)
+        }))
+        reality = _worker_reality_validator.validate_data_reality(code, relative_file)
+        logic = _worker_reality_validator.validate_business_logic(code, relative_file)
+        rules = (
+            ("data_reality", reality.passed, reality.severity.value),
+            ("business_logic", logic.passed, logic.severity.value)
+        )
+        results.append((extract_api_calls(code), interfaces, rules))
+    
+    return results
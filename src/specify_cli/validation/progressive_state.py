@@ -0,0 +1,145 @@
+"""
+渐进式重构状态 - 持久化每个组件的阶段状态
+
+progressive_refactoring.py 每次调用都是新进程，阶段状态若只保存在内存中，每次都要从
+基线阶段重新开始。本模块把每个组件的阶段状态、时间戳和验证结果摘要保存在
+.specify/state/progressive.json 中：写入时持有文件锁，读-改-写在锁内完成，
+新内容先写临时文件再原子替换，并发调用不会丢失更新或读到半写入的文件。
+`specify refactoring progressive` 命令读取同一份状态。
+"""
+
+import os
+import json
+import hashlib
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+
+# 渐进式重构阶段（按执行顺序）
+PROGRESSIVE_PHASES = ["baseline", "compatibility", "component-replace", "parallel-validation"]
+
+
+class ProgressiveState:
+    """渐进式重构状态存储"""
+    
+    VERSION = 1
+    STATE_FILE = Path(".specify") / "state" / "progressive.json"
+    
+    def __init__(self, project_path: Path):
+        self.project_path = Path(project_path)
+        self.state_path = self.project_path / self.STATE_FILE
+        self.lock_path = self.state_path.with_name(self.state_path.name + ".lock")
+    
+    @staticmethod
+    def digest(results: Dict[str, Any]) -> str:
+        """验证结果摘要（键排序后的JSON的sha1），用于判断两次验证结果是否一致"""
+        payload = json.dumps(results, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    
+    def load(self) -> Dict[str, Any]:
+        """读取全部状态（文件由原子替换写入，读取无需加锁）"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return self._empty()
+        
+        if data.get('version') != self.VERSION:
+            raise ValueError(f"不支持的状态文件版本: {data.get('version')} ({self.state_path})")
+        
+        return data
+    
+    def component(self, component: str) -> Dict[str, Any]:
+        """单个组件的状态（未记录过的组件返回初始状态）"""
+        return self.load()['components'].get(component) or self._new_component()
+    
+    def record_phase(self, component: str, phase: str, status: str,
+                     validation_digest: Optional[str] = None) -> Dict[str, Any]:
+        """记录阶段结果；阶段完成时当前阶段推进到下一阶段"""
+        def apply(entry: Dict[str, Any]):
+            phase_entry = entry['phases'][phase]
+            phase_entry['status'] = status
+            phase_entry['updated_at'] = datetime.now().isoformat()
+            if status == "completed":
+                phase_entry['completed_at'] = phase_entry['updated_at']
+                entry['current_phase'] = max(entry['current_phase'], PROGRESSIVE_PHASES.index(phase) + 1)
+            if validation_digest is not None:
+                phase_entry['validation_digest'] = validation_digest
+        
+        return self._update_component(component, apply)
+    
+    def rollback(self, component: str, phase: str) -> Dict[str, Any]:
+        """回滚到指定阶段：保留该阶段的结果，其后的阶段全部重置为pending"""
+        phase_index = PROGRESSIVE_PHASES.index(phase)
+        
+        def apply(entry: Dict[str, Any]):
+            for later_phase in PROGRESSIVE_PHASES[phase_index + 1:]:
+                entry['phases'][later_phase] = self._new_phase()
+            completed = entry['phases'][phase]['status'] == "completed"
+            entry['current_phase'] = phase_index + 1 if completed else phase_index
+        
+        return self._update_component(component, apply)
+    
+    def _update_component(self, component: str, apply: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+        """在文件锁内读取、修改并原子写回单个组件的状态"""
+        with self._locked():
+            data = self.load()
+            entry = data['components'].setdefault(component, self._new_component())
+            apply(entry)
+            entry['updated_at'] = datetime.now().isoformat()
+            self._write(data)
+        return entry
+    
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """独占锁（锁文件与状态文件同目录；平台不支持时退化为无锁）"""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, 'a+') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            elif msvcrt is not None:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                elif msvcrt is not None:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+    
+    def _write(self, data: Dict[str, Any]):
+        """先写临时文件再原子替换"""
+        temp_path = self.state_path.with_name(f".{self.state_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        os.replace(temp_path, self.state_path)
+    
+    def _empty(self) -> Dict[str, Any]:
+        return {'version': self.VERSION, 'components': {}}
+    
+    @staticmethod
+    def _new_phase() -> Dict[str, Any]:
+        return {'status': "pending", 'updated_at': None, 'completed_at': None, 'validation_digest': None}
+    
+    @classmethod
+    def _new_component(cls) -> Dict[str, Any]:
+        return {
+            'current_phase': 0,
+            'phases': {phase: cls._new_phase() for phase in PROGRESSIVE_PHASES},
+            'updated_at': None
+        }
@@ -9,10 +9,12 @@ import re
 import ast
 import json
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Iterable, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from .baseline import ViolationBaseline
+
 class ValidationSeverity(Enum):
     """验证严重程度"""
     ERROR = "error"
@@ -53,7 +55,7 @@ class RealityValidator:
             r'placeholder|占位符',
             r'not implemented|未实现',
         ]
-
+    
     def validate_data_reality(self, code: str, file_path: str) -> ValidationResult:
         """验证数据真实性"""
         mock_matches = []
@@ -106,7 +108,7 @@ class RealityValidator:
                 "file": file_path
             }
         )
-
+    
     def validate_business_logic(self, code: str, file_path: str) -> ValidationResult:
         """验证业务逻辑真实性"""
         placeholder_matches = []
@@ -327,19 +329,33 @@ class ProgressiveRefactoringValidator:
 class RefactoringValidationSystem:
     """重构验证系统"""
     
+    # 支持的文件扩展名
+    SOURCE_EXTENSIONS = {'.tsx', '.ts', '.jsx', '.js', '.py', '.java', '.cs', '.cpp', '.c'}
+    
     def __init__(self):
         self.reality_validator = RealityValidator()
         self.behavior_validator = BehaviorPreservationValidator()
         self.spec_validator = SpecSourceValidator()
         self.progressive_validator = ProgressiveRefactoringValidator()
         self.validation_results: List[ValidationResult] = []
+        self.violation_fingerprints: set = set()
     
-    def validate_refactoring_project(self, project_path: Path) -> Dict[str, Any]:
-        """验证重构项目"""
+    def validate_refactoring_project(self, project_path: Path,
+                                     baseline: Optional[ViolationBaseline] = None,
+                                     files: Optional[Iterable[Path]] = None) -> Dict[str, Any]:
+        """验证重构项目
+        
+        提供baseline时，指纹已在基线中的失败结果不再记录和计数（计入baseline_suppressed）；
+        本次全部失败结果的指纹保存在self.violation_fingerprints，用于刷新基线。
+        提供files时只验证其中的源代码文件（如ComponentIndex给出的单个组件的文件集合）。
+        """
         project_path = Path(project_path)
         
         # 扫描项目文件
-        source_files = self._scan_source_files(project_path)
+        if files is None:
+            source_files = self._scan_source_files(project_path)
+        else:
+            source_files = [Path(f) for f in files if Path(f).suffix in self.SOURCE_EXTENSIONS]
         
         # 验证结果统计
         stats = {
@@ -347,8 +363,10 @@ class RefactoringValidationSystem:
             "passed_validations": 0,
             "failed_validations": 0,
             "warnings": 0,
+            "baseline_suppressed": 0,
             "errors": []
         }
+        self.violation_fingerprints = set()
         
         # 对每个文件进行验证
         for file_path in source_files:
@@ -358,29 +376,13 @@ class RefactoringValidationSystem:
                 
                 # 数据真实性验证
                 reality_result = self.reality_validator.validate_data_reality(code, str(file_path))
-                self.validation_results.append(reality_result)
-                
-                if reality_result.passed:
-                    stats["passed_validations"] += 1
-                else:
-                    stats["failed_validations"] += 1
-                    if reality_result.severity == ValidationSeverity.ERROR:
-                        stats["errors"].append(reality_result.message)
-                    else:
-                        stats["warnings"] += 1
+                self._record_result("data_reality", reality_result, file_path, project_path, baseline, stats,
+                                    code, self.reality_validator.mock_patterns)
                 
                 # 业务逻辑验证
                 logic_result = self.reality_validator.validate_business_logic(code, str(file_path))
-                self.validation_results.append(logic_result)
-                
-                if logic_result.passed:
-                    stats["passed_validations"] += 1
-                else:
-                    stats["failed_validations"] += 1
-                    if logic_result.severity == ValidationSeverity.ERROR:
-                        stats["errors"].append(logic_result.message)
-                    else:
-                        stats["warnings"] += 1
+                self._record_result("business_logic", logic_result, file_path, project_path, baseline, stats,
+                                    code, self.reality_validator.placeholder_patterns)
                 
             except Exception as e:
                 error_result = ValidationResult(
@@ -395,14 +397,66 @@ class RefactoringValidationSystem:
         
         return stats
     
+    def _record_result(self, rule: str, result: ValidationResult, file_path: Path, project_path: Path,
+                       baseline: Optional[ViolationBaseline], stats: Dict[str, Any],
+                       code: str = "", patterns: Iterable[str] = ()):
+        """记录单项验证结果并更新统计，基线中已知的失败结果只计入baseline_suppressed
+        
+        失败结果的每处违规都有各自的指纹，全部在基线中时才视为已知；
+        否则结果照常记录，details["new_occurrences"]列出基线之外的违规代码行。
+        """
+        if result.passed:
+            self.validation_results.append(result)
+            stats["passed_validations"] += 1
+            return
+        
+        fingerprints = self._result_fingerprints(rule, result, file_path.relative_to(project_path), code, patterns)
+        self.violation_fingerprints.update(fingerprints)
+        if baseline is not None:
+            new_occurrences = [snippet for fingerprint, snippet in fingerprints.items() if fingerprint not in baseline]
+            if not new_occurrences:
+                stats["baseline_suppressed"] += 1
+                return
+            if result.details is not None and result.severity == ValidationSeverity.ERROR:
+                result.details["new_occurrences"] = new_occurrences
+        
+        self.validation_results.append(result)
+        stats["failed_validations"] += 1
+        if result.severity == ValidationSeverity.ERROR:
+            stats["errors"].append(result.message)
+        else:
+            stats["warnings"] += 1
+    
+    def _result_fingerprints(self, rule: str, result: ValidationResult, relative_path: Path,
+                             code: str, patterns: Iterable[str]) -> Dict[str, str]:
+        """失败结果的违规指纹 -> 违规代码行
+        
+        错误结果由命中的模式（Mock数据、占位符）引起，每处命中单独计算指纹：规则与模式、
+        相对路径和命中所在代码行（与reality_check.py的违规指纹一致）。同一行内容重复出现时
+        第n处的片段附加序号，基线因此记录每个指纹的出现次数，多出的一处仍会报告。
+        警告结果是整个文件缺少真实API调用或业务逻辑，按规则与级别、相对路径计算一个指纹。
+        """
+        fingerprints: Dict[str, str] = {}
+        occurrences: Dict[Tuple[str, str], int] = {}
+        for pattern in (patterns if result.severity == ValidationSeverity.ERROR else ()):
+            for match in re.finditer(pattern, code, re.IGNORECASE):
+                line_start = code.rfind('\n', 0, match.start()) + 1
+                line_end = code.find('\n', match.end())
+                snippet = code[line_start:line_end if line_end >= 0 else len(code)].strip()
+                
+                count = occurrences[pattern, snippet] = occurrences.get((pattern, snippet), 0) + 1
+                key = snippet if count == 1 else f"{snippet}\0{count}"
+                fingerprints[ViolationBaseline.fingerprint(f"{rule}:{pattern}", relative_path, key)] = snippet
+        
+        if not fingerprints:
+            fingerprints[ViolationBaseline.fingerprint(f"{rule}:{result.severity.value}", relative_path, "")] = ""
+        return fingerprints
+    
     def _scan_source_files(self, project_path: Path) -> List[Path]:
         """扫描源代码文件"""
         source_files = []
         
-        # 支持的文件扩展名
-        extensions = {'.tsx', '.ts', '.jsx', '.js', '.py', '.java', '.cs', '.cpp', '.c'}
-        
-        for ext in extensions:
+        for ext in self.SOURCE_EXTENSIONS:
             source_files.extend(project_path.rglob(f'*{ext}'))
         
         return source_files